@@ -1,36 +1,39 @@
-import os
-import streamlit as st
-from openai import OpenAI
-from urllib.parse import urlparse
-from dotenv import load_dotenv
-import feedparser
+import importlib.util
+import threading
+import time
 from datetime import datetime
-from urllib.parse import quote
-import sqlite3
-from pathlib import Path
-import re
-from apscheduler.schedulers.background import BackgroundScheduler
-from apscheduler.triggers.cron import CronTrigger
-import pytz
 
-# Notion 클라이언트 (선택적으로 로드)
-try:
-    from notion_client import Client
-    NOTION_AVAILABLE = True
-except ImportError:
-    NOTION_AVAILABLE = False
-    Client = None
+# 스크립트 한 번 실행(rerun)에 걸린 시간 측정 시작
+rerun_started = time.perf_counter()
 
-# Playwright는 선택적으로 로드 (Streamlit Cloud 호환성)
-try:
-    from playwright.sync_api import sync_playwright
-    PLAYWRIGHT_AVAILABLE = True
-except ImportError:
-    PLAYWRIGHT_AVAILABLE = False
-    sync_playwright = None
+import pandas as pd
+import streamlit as st
+from urllib.parse import urlparse
 
-# 환경변수 로드
-load_dotenv()
+import chat_context
+import collector
+import feeds
+import intent
+import jobs
+import metrics
+import news_pipeline
+import news_search
+import notion_sync
+import query_cache
+import query_parser
+import storage
+import summarizer
+from crawler import PLAYWRIGHT_AVAILABLE
+from settings import DEFAULT_OPENAI_BASE_URL, get_settings
+
+# Notion 클라이언트 (선택적으로 로드, 설치 여부만 확인하고 import는 첫 화면을 그린 뒤)
+NOTION_AVAILABLE = importlib.util.find_spec("notion_client") is not None
+
+# 첫 화면을 그린 뒤 백그라운드에서 미리 import할 모듈 (첫 GPT 호출이 import를 기다리지 않도록)
+WARM_UP_MODULES = ("openai",)
+
+# 설정 로드 (Secrets → 환경변수 → .env, 파일이 바뀌면 자동으로 다시 읽음)
+settings = get_settings()
 
 # 페이지 설정
 st.set_page_config(
@@ -41,206 +44,135 @@ st.set_page_config(
 
 # ==================== NOTION 클라이언트 초기화 ====================
 @st.cache_resource
-def get_notion_client():
-    """Notion 클라이언트 초기화"""
-    if not NOTION_AVAILABLE:
-        return None
-    
-    # Notion API Key 가져오기 (Streamlit Secrets 우선)
-    notion_key = None
-    try:
-        if hasattr(st, "secrets"):
-            notion_key = st.secrets.get("NOTION_API_KEY", None)
-    except Exception:
-        # Secrets 파일이 없거나 오류가 발생한 경우 무시
-        pass
-    
-    # 환경변수에서 가져오기
-    if not notion_key:
-        notion_key = os.getenv("NOTION_API_KEY")
-    
-    if not notion_key:
+def get_notion_client(notion_key):
+    """Notion 클라이언트 초기화 (API Key별로 한 번만 생성)"""
+    if not NOTION_AVAILABLE or not notion_key:
         return None  # API Key가 없으면 Notion 기능 비활성화
     
     try:
+        from notion_client import Client
         return Client(auth=notion_key)
     except Exception as e:
         st.warning(f"⚠️ Notion 클라이언트 초기화 실패: {str(e)}")
         return None
 
-# Notion 클라이언트 전역 변수
-notion_client = get_notion_client() if NOTION_AVAILABLE else None
+@st.cache_resource
+def start_notion_worker(notion_key, database_id):
+    """Notion 전송 스레드 시작 (API Key/Database ID 조합별로 한 번, 이전 실행에서 남은 대기열도 이어서 전송)"""
+    notion_client = get_notion_client(notion_key)
+    if notion_client is None:
+        return None
+    return notion_sync.start_worker(notion_client, database_id)
 
 # ==================== DATABASE 초기화 ====================
-DB_PATH = Path("articles.db")
+@st.cache_resource
+def init_storage():
+    """데이터베이스 초기화 (프로세스당 한 번, 커넥션 풀/WAL 설정은 storage 모듈에서 관리)"""
+    storage.init_database()
+    # 구간별 누적 통계는 DB에 더함 (Prometheus 카운터가 기록 파일 교체와 관계없이 증가)
+    metrics.recorder.totals_store = storage
+    return True
 
-def init_database():
-    """데이터베이스 초기화"""
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    
-    # 기사 저장 테이블
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS articles (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            title TEXT NOT NULL,
-            link TEXT UNIQUE NOT NULL,
-            keyword TEXT,
-            published TEXT,
-            summary TEXT,
-            saved_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
+init_storage()
+
+def get_notion_save_status():
+    """Notion 저장 활성화 여부 확인 (전송은 백그라운드 스레드가 대기열에서 처리)"""
+    return NOTION_AVAILABLE and get_settings().notion_configured
+
+# 저장된 기사 목록의 페이지 크기 선택지, 페이지 조회 결과 캐시 크기
+ARTICLE_PAGE_SIZES = [10, 20, 50, 100]
+ARTICLE_PAGE_CACHE_SIZE = 64
+
+@st.cache_data(max_entries=ARTICLE_PAGE_CACHE_SIZE, show_spinner=False)
+def load_articles_page(limit, before, version):
+    """
+    최신순 기사 한 페이지 조회 (같은 페이지는 캐시, version이 바뀌면 다시 조회)
     
-    # 검색 히스토리 테이블
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS search_history (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            keyword TEXT NOT NULL,
-            article_count INTEGER,
-            searched_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
+    Args:
+        limit: 페이지 크기
+        before: 페이지 시작 위치 (saved_at, id), None이면 첫 페이지
+        version: 기사 테이블 변경 번호 (캐시 키, 쓰기가 있으면 바뀜)
     
-    conn.commit()
-    conn.close()
+    Returns:
+        tuple: (기사 목록, 다음 페이지 시작 위치 또는 None)
+    """
+    rows = storage.get_saved_articles(limit=limit + 1, before=before)
+    next_cursor = (rows[limit - 1][4], rows[limit - 1][5]) if len(rows) > limit else None
+    return rows[:limit], next_cursor
 
-# 데이터베이스 초기화
-init_database()
+@st.cache_data(max_entries=ARTICLE_PAGE_CACHE_SIZE, show_spinner=False)
+def load_search_page(query, limit, offset, version):
+    """
+    저장된 기사 제목/요약 전문 검색 한 페이지 (관련도순, 캐시는 load_articles_page와 동일)
+    
+    Returns:
+        tuple: (기사 목록, 다음 페이지 존재 여부)
+    """
+    rows = storage.search_saved_articles(query, limit=limit + 1, offset=offset)
+    return rows[:limit], len(rows) > limit
 
-def save_article(title, link, keyword, published, summary=""):
-    """기사를 데이터베이스에 저장"""
+def get_articles_page(limit, before=None):
+    """저장된 기사 한 페이지 조회 (오류 시 빈 페이지)"""
     try:
-        conn = sqlite3.connect(DB_PATH)
-        c = conn.cursor()
-        
-        c.execute('''
-            INSERT OR IGNORE INTO articles 
-            (title, link, keyword, published, summary) 
-            VALUES (?, ?, ?, ?, ?)
-        ''', (title, link, keyword, published, summary))
-        
-        conn.commit()
-        conn.close()
-        return True
+        return load_articles_page(limit, before, storage.articles_version())
     except Exception as e:
-        st.error(f"기사 저장 중 오류: {str(e)}")
-        return False
+        st.error(f"기사 조회 중 오류: {str(e)}")
+        return [], None
 
-def save_article_to_notion(title, link, keyword, published, summary=""):
-    """기사를 Notion 데이터베이스에 저장"""
-    if not notion_client or not NOTION_AVAILABLE:
-        return False
-    
+def search_saved_articles(query, limit=20, offset=0):
+    """저장된 기사 제목/요약 전문 검색 한 페이지 (관련도순, 오류 시 빈 페이지)"""
     try:
-        # Notion Database ID 가져오기
-        notion_db_id = None
-        try:
-            if hasattr(st, "secrets"):
-                notion_db_id = st.secrets.get("NOTION_DATABASE_ID", None)
-        except Exception:
-            pass
-        
-        if not notion_db_id:
-            notion_db_id = os.getenv("NOTION_DATABASE_ID")
-        
-        if not notion_db_id:
-            return False  # Database ID가 없으면 저장 불가
-        
-        # 기사 정보를 Notion 페이지로 생성
-        notion_client.pages.create(
-            parent={"database_id": notion_db_id},
-            properties={
-                "제목": {"title": [{"text": {"content": title[:100]}}]},  # Notion 제한으로 100자 제한
-                "링크": {"url": link},
-                "키워드": {"select": {"name": keyword}},
-                "발행일": {"date": {"start": published if published and published != "날짜 정보 없음" else datetime.now().isoformat()}},
-                "요약": {"rich_text": [{"text": {"content": summary[:1000]}}]},  # 요약 1000자 제한
-            }
-        )
-        return True
+        return load_search_page(query, limit, offset, storage.articles_version())
     except Exception as e:
-        # Notion 저장 오류는 조용히 처리 (SQLite는 정상 작동)
-        return False
+        st.error(f"기사 검색 중 오류: {str(e)}")
+        return [], False
 
-def get_notion_save_status():
-    """Notion 저장 활성화 여부 확인"""
-    if not NOTION_AVAILABLE or not notion_client:
-        return False
-    
-    notion_db_id = None
-    try:
-        if hasattr(st, "secrets"):
-            notion_db_id = st.secrets.get("NOTION_DATABASE_ID", None)
-    except Exception:
-        pass
+# 사이드바 통계 조회 결과 캐시 크기
+SIDEBAR_STATS_CACHE_SIZE = 8
+
+@st.cache_data(max_entries=SIDEBAR_STATS_CACHE_SIZE, show_spinner=False)
+def load_sidebar_stats(versions):
+    """
+    사이드바 통계 조회 (요약 테이블/최근 기록만 읽음, versions가 바뀌면 다시 조회)
     
-    if not notion_db_id:
-        notion_db_id = os.getenv("NOTION_DATABASE_ID")
+    Args:
+        versions: storage.table_versions() 결과 (캐시 키, 기사/검색/수집/Notion 쓰기가 있으면 바뀜)
     
-    return bool(notion_db_id)
-
-def get_saved_articles(keyword=None, limit=10):
-    """저장된 기사 조회"""
+    Returns:
+        dict: history, stats, last_run, notion(전송 현황)
+    """
+    return {
+        'history': storage.get_search_history(limit=5),
+        'stats': storage.get_article_stats(),
+        'last_run': storage.get_last_collection_run(),
+        'notion': storage.notion_outbox_stats(),
+    }
+
+def get_sidebar_stats():
+    """사이드바 통계 조회 (오류 시 None)"""
     try:
-        conn = sqlite3.connect(DB_PATH)
-        c = conn.cursor()
-        
-        if keyword:
-            c.execute('''
-                SELECT title, link, keyword, published, saved_at 
-                FROM articles 
-                WHERE keyword = ? 
-                ORDER BY saved_at DESC 
-                LIMIT ?
-            ''', (keyword, limit))
-        else:
-            c.execute('''
-                SELECT title, link, keyword, published, saved_at 
-                FROM articles 
-                ORDER BY saved_at DESC 
-                LIMIT ?
-            ''', (limit,))
-        
-        articles = c.fetchall()
-        conn.close()
-        return articles
+        return load_sidebar_stats(storage.table_versions())
     except Exception as e:
-        st.error(f"기사 조회 중 오류: {str(e)}")
-        return []
+        return None
+
+@st.cache_data(max_entries=SIDEBAR_STATS_CACHE_SIZE, show_spinner=False)
+def load_log_tail(count, mtime_ns, size):
+    """수집 로그의 최근 count줄 (로그 파일의 수정 시각/크기가 바뀌면 다시 읽음)"""
+    return collector.read_log_tail(count)
 
-def get_search_history(limit=5):
-    """검색 히스토리 조회"""
+def get_log_tail(count=5):
+    """수집 로그의 최근 count줄 (로그 파일이 없으면 빈 리스트)"""
     try:
-        conn = sqlite3.connect(DB_PATH)
-        c = conn.cursor()
-        
-        c.execute('''
-            SELECT keyword, article_count, searched_at 
-            FROM search_history 
-            ORDER BY searched_at DESC 
-            LIMIT ?
-        ''', (limit,))
-        
-        history = c.fetchall()
-        conn.close()
-        return history
-    except Exception as e:
+        stat = collector.COLLECTION_LOG_PATH.stat()
+    except OSError:
         return []
+    return load_log_tail(count, stat.st_mtime_ns, stat.st_size)
 
+@metrics.timed("save_search_history")
 def save_search_history(keyword, article_count):
     """검색 히스토리 저장"""
     try:
-        conn = sqlite3.connect(DB_PATH)
-        c = conn.cursor()
-        
-        c.execute('''
-            INSERT INTO search_history (keyword, article_count) 
-            VALUES (?, ?)
-        ''', (keyword, article_count))
-        
-        conn.commit()
-        conn.close()
+        storage.save_search_history(keyword, article_count)
         return True
     except Exception as e:
         return False
@@ -248,13 +180,7 @@ def save_search_history(keyword, article_count):
 def delete_article(link):
     """기사 삭제"""
     try:
-        conn = sqlite3.connect(DB_PATH)
-        c = conn.cursor()
-        
-        c.execute('DELETE FROM articles WHERE link = ?', (link,))
-        
-        conn.commit()
-        conn.close()
+        storage.delete_article(link)
         return True
     except Exception as e:
         return False
@@ -262,152 +188,61 @@ def delete_article(link):
 def clear_all_articles():
     """모든 기사 삭제"""
     try:
-        conn = sqlite3.connect(DB_PATH)
-        c = conn.cursor()
-        
-        c.execute('DELETE FROM articles')
-        c.execute('DELETE FROM search_history')
-        
-        conn.commit()
-        conn.close()
+        storage.clear_all_articles()
         return True
     except Exception as e:
         return False
 
-# ==================== 정시 기사 수집 스케줄러 ====================
-
-# 전역 스케줄러 초기화
-scheduler = None
+# ==================== 구간별 지연 시간 ====================
+# 대화 한 턴 전체를 감싸는 가장 바깥 구간 이름
+CHAT_TURN_SPAN = "chat_turn"
 
-def auto_collect_news():
-    """자동 기사 수집 함수"""
-    try:
-        # 기본 검색 키워드 목록
-        default_keywords = ['AI', '기술', '경제', '정치', '스포츠']
-        
-        for keyword in default_keywords:
-            articles = fetch_google_news(keyword, max_results=3)
-            if articles:
-                for article in articles:
-                    # SQLite에 저장
-                    save_article(
-                        title=article['title'],
-                        link=article['link'],
-                        keyword=keyword,
-                        published=article['published'],
-                        summary=article.get('summary', '')
-                    )
-                    
-                    # Notion에도 저장 (활성화된 경우)
-                    if get_notion_save_status():
-                        save_article_to_notion(
-                            title=article['title'],
-                            link=article['link'],
-                            keyword=keyword,
-                            published=article['published'],
-                            summary=article.get('summary', '')
-                        )
-        
-        # 수집 완료 로그
-        with open("collection_log.txt", "a", encoding="utf-8") as f:
-            f.write(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] 자동 기사 수집 완료\n")
-        
-        return True
-    except Exception as e:
-        with open("collection_log.txt", "a", encoding="utf-8") as f:
-            f.write(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] 오류: {str(e)}\n")
-        return False
-
-def init_scheduler():
-    """스케줄러 초기화"""
-    global scheduler
-    
-    # 이미 실행 중인 스케줄러가 있으면 중지
-    if scheduler and scheduler.running:
-        return scheduler
-    
-    # 새로운 스케줄러 생성
-    scheduler = BackgroundScheduler(daemon=True, timezone=pytz.timezone('Asia/Seoul'))
-    
-    # 매일 오전 9시, 오후 3시, 오후 9시에 기사 수집
-    scheduler.add_job(
-        auto_collect_news,
-        CronTrigger(hour='9,15,21', minute=0, second=0),
-        id='auto_collect_news',
-        name='자동 기사 수집',
-        replace_existing=True
-    )
+@st.cache_data(max_entries=SIDEBAR_STATS_CACHE_SIZE, show_spinner=False)
+def load_metrics_summary(stamp):
+    """
+    구간별 지연 시간 통계와 가장 최근 대화 턴의 구간 목록 (stamp가 바뀌면 다시 읽음)
     
-    # 스케줄러 시작
-    scheduler.start()
+    Args:
+        stamp: 기록 파일의 (수정 시각, 크기) (캐시 키)
     
-    return scheduler
+    Returns:
+        tuple: ({구간 이름: 통계}, 최근 대화 턴의 구간 기록 리스트)
+    """
+    entries = metrics.recorder.read()
+    return metrics.summarize_spans(entries), metrics.latest_trace(entries, CHAT_TURN_SPAN)
 
-# 페이지 시작 시 스케줄러 초기화
-try:
-    init_scheduler()
-except Exception as e:
-    pass  # 이미 초기화된 경우 무시
+def get_metrics_summary():
+    """구간별 지연 시간 통계 (이 프로세스의 버퍼를 먼저 파일에 기록)"""
+    metrics.recorder.flush()
+    return load_metrics_summary(metrics.recorder.stamp())
 
-# ==================== GMS 클라이언트 초기화 ====================
 @st.cache_resource
-def get_openai_client():
-    # 1) API 키 가져오기 (Streamlit Secrets 우선 → 환경변수)
-    api_key = None
+def start_metrics_server(port):
+    """Prometheus 텍스트 형식 엔드포인트 실행 (포트별로 한 번, 이미 사용 중이면 None)"""
     try:
-        if hasattr(st, "secrets"):
-            api_key = st.secrets.get("OPENAI_API_KEY", None)
-    except Exception:
-        # Secrets 파일이 없거나 오류가 발생한 경우 무시
-        pass
-    
-    if not api_key:
-        api_key = os.getenv("OPENAI_API_KEY")
-    
-    if not api_key:
-        st.error("❌ API Key를 찾을 수 없습니다. Secrets 또는 .env 파일을 확인하세요.")
-        st.stop()
+        return metrics.start_server(port)
+    except OSError:
+        return None
 
-    # 2) Base URL 구성 (GMS 기본값 사용, Secrets/Env로 커스텀 가능)
-    # GMS 엔드포인트: https://gms.ssafy.io/gmsapi/api.openai.com/v1
-    default_base = "https://gms.ssafy.io/gmsapi/api.openai.com/v1"
-    base_url = None
-    
-    # Streamlit Secrets에서 가져오기
-    try:
-        if hasattr(st, "secrets"):
-            base_url = st.secrets.get("OPENAI_BASE_URL", None)
-    except Exception:
-        pass
-    
-    # 환경변수에서 가져오기
-    if not base_url:
-        base_url = os.getenv("OPENAI_BASE_URL", None)
-    # SSAFY GMS 사용 시 예: https://gms.ssafy.io/gmsapi/v1
-    # 기본값은 OpenAI 공식 엔드포인트
-    if not base_url:
-        base_url = default_base
+metrics_server = start_metrics_server(settings.metrics_port) if settings.metrics_port else None
 
-    # 3) URL 형식 보정
-    # http/https로 시작하지 않거나 공백/잘못된 값이면 기본으로 교체
-    try:
-        if not isinstance(base_url, str) or not base_url.strip().lower().startswith(("http://", "https://")):
-            base_url = default_base
-        base_url = base_url.strip()
-        # 흔한 오타: .../api.openai.com/v1 → 게이트웨이에서는 /v1 만 필요
-        # 사용자가 잘못 입력한 경우 자동 보정은 어렵지만, 실패 시 기본으로 폴백
-    except Exception:
-        base_url = default_base
+# ==================== GMS 클라이언트 초기화 ====================
+@st.cache_resource
+def get_openai_client(api_key, base_url):
+    """OpenAI 호환 클라이언트 초기화 (API Key/Base URL 조합별로 한 번만 생성)"""
+    # openai 패키지는 import가 느리므로 첫 GPT 호출 때 로드 (보통 warm_up_imports()가 미리 로드)
+    from openai import OpenAI
 
-    # 4) 클라이언트 생성 + 폴백 로직
+    # 클라이언트 생성 + 폴백 로직
+    # (Base URL 형식 보정은 설정 로드 시 처리, 기본값은 GMS 엔드포인트)
     try:
         return OpenAI(base_url=base_url, api_key=api_key)
     except Exception as e:
-        # 게이트웨이 URL 문제 가능성이 높으므로 기본 OpenAI로 폴백 시도
-        if base_url != default_base:
+        # 게이트웨이 URL 문제 가능성이 높으므로 기본 엔드포인트로 폴백 시도
+        if base_url != DEFAULT_OPENAI_BASE_URL:
             try:
                 st.warning("⚠️ 커스텀 Base URL로 초기화 실패. 기본 OpenAI 엔드포인트로 재시도합니다.")
-                return OpenAI(base_url=default_base, api_key=api_key)
+                return OpenAI(base_url=DEFAULT_OPENAI_BASE_URL, api_key=api_key)
             except Exception as e2:
                 st.error(f"❌ OpenAI 클라이언트 초기화 실패: {e2}")
                 st.stop()
@@ -415,13 +250,33 @@ def get_openai_client():
             st.error(f"❌ OpenAI 클라이언트 초기화 실패: {e}")
             st.stop()
 
-client = get_openai_client()
+def get_client():
+    """현재 설정의 GMS 클라이언트 (첫 호출 때 생성)"""
+    return get_openai_client(settings.openai_api_key, settings.openai_base_url)
+
+if not settings.openai_api_key:
+    st.error("❌ API Key를 찾을 수 없습니다. Secrets 또는 .env 파일을 확인하세요.")
+    st.stop()
+
+@st.cache_resource
+def warm_up_imports(modules=WARM_UP_MODULES):
+    """느린 모듈을 백그라운드 스레드에서 미리 import (프로세스당 한 번)"""
+    def run():
+        for name in modules:
+            try:
+                importlib.import_module(name)
+            except ImportError:
+                pass
+    thread = threading.Thread(target=run, name="warm-up-imports", daemon=True)
+    thread.start()
+    return thread
 
 # 세션 상태 초기화 (대화 히스토리 저장용)
 if "messages" not in st.session_state:
     st.session_state.messages = []
 
 # 기사 검색 의도 판단 함수
+@metrics.timed("intent")
 def check_news_search_intent(user_input):
     """
     사용자 입력이 기사 검색 요청인지 판단하는 함수
@@ -432,377 +287,275 @@ def check_news_search_intent(user_input):
     Returns:
         bool: True(기사 검색 요청) / False(일반 대화)
     """
-    # 키워드 기반 간단 판단
-    news_keywords = ['뉴스', '기사', '소식', '보도', '언론', '신문', '최신', '최근']
+    # 뉴스 관련 단어 매칭 (+ 모델 파일이 있으면 n-gram 점수), 같은 입력은 캐시
+    is_search, reason = intent.classifier.classify(user_input)
     
-    user_lower = user_input.lower()
-    
-    # 뉴스 관련 키워드가 포함되어 있으면 기사 검색으로 판단
-    for keyword in news_keywords:
-        if keyword in user_lower:
-            if "intent_log" not in st.session_state:
-                st.session_state.intent_log = []
-            st.session_state.intent_log.append({
-                "input": user_input,
-                "result": "YES (키워드 매칭)",
-                "is_search": True
-            })
-            return True
-    
-    # 키워드가 없으면 일반 대화
+    # 판단 로그는 최근 기록만 유지
     if "intent_log" not in st.session_state:
-        st.session_state.intent_log = []
-    st.session_state.intent_log.append({
-        "input": user_input,
-        "result": "NO (키워드 없음)",
-        "is_search": False
-    })
-    return False
-
-# 검색 키워드 추출 함수
-def extract_search_keyword(user_input):
-    """
-    사용자 입력에서 검색 키워드를 추출하는 함수
-    
-    Args:
-        user_input: 사용자 입력 텍스트
-        
-    Returns:
-        str: 추출된 검색 키워드
-    """
-    # 불필요한 단어/조사/종결어 제거
-    remove_words = [
-        # 동사/조동사
-        '알려줘', '알려주세요', '찾아줘', '검색해줘', '보여줘', '해줄래', '해주세요',
-        # 명사 (뉴스 관련)
-        '기사', '뉴스', '소식', '보도', '속보', '긴급',
-        # 조사
-        '을', '를', '이', '가', '은', '는', '에', '서', '에게', '께', '로', '에서', '로부터', '에 대한', '의',
-        # 한국어 종결어미 및 의존명사
-        '거', '거지', '거가', '거네', '거라', '거야', '것', '네', '네요', '네길',
-        '고', '곤', '고야', '고말', '고들', '고곤', '일', '해', '해요',
-        # 시간 표현
-        '오늘', '어제', '요즘', '지금', '현재', '최신', '최근',
-        # 형용사
-        '많은', '인기', '인기있는', '인기많은',
-        # 인사말
-        '안녕', '안녕하세요', '반가워', '반갑습니다', '만나서',
-        # 기타
-        '아', '어', '음', '어떻게', '어떤', '뭔지', '뭐야', '뭐지', '뭘', '뭐냐',
-        '서치', '조회', '검색', '찾기', '말해줘', '설명해줘', '안내', '정보',
-        '나', '날', '너', '우리', '우리가'
-    ]
-    
-    # 1단계: 텍스트 정규화
-    keyword = user_input.strip()
-    
-    # 2단계: 불필요한 단어 제거 (가장 긴 단어부터 처리)
-    for word in sorted(remove_words, key=len, reverse=True):
-        keyword = re.sub(rf'\b{re.escape(word)}\b', ' ', keyword, flags=re.IGNORECASE)
-    
-    # 3단계: 특수문자 제거 (한글, 영문, 숫자만 유지)
-    keyword = re.sub(r'[^가-힣a-zA-Z0-9\s]', '', keyword)
-    
-    # 4단계: 연속된 공백 정리
-    keyword = ' '.join(keyword.split()).strip()
-    
-    # 5단계: 최종 검증
-    if len(keyword) < 2:
-        # 키워드가 너무 짧으면 원본 중 가장 긴 단어 찾기
-        original_words = user_input.split()
-        filtered_words = [w for w in original_words if len(w) >= 2 and w not in remove_words]
-        if filtered_words:
-            keyword = filtered_words[0]  # 가장 먼저 나온 주요 단어 선택
-        else:
-            keyword = user_input
-    
-    return keyword
+        st.session_state.intent_log = intent.new_intent_log()
+    st.session_state.intent_log.append((user_input, is_search, reason))
+    return is_search
 
-# Google News RSS 기사 수집 함수
-def fetch_google_news(keyword, max_results=5):
+# 일반 챗봇 응답 생성 함수
+def generate_chat_response(client, messages, context):
     """
-    Google News RSS를 통해 기사를 수집하는 함수
+    일반 대화 응답을 생성하는 함수
     
-    Args:
-        keyword: 검색 키워드
-        max_results: 최대 수집 기사 수
-        
-    Returns:
-        list: 기사 정보 리스트
-    """
-    try:
-        # Google News RSS URL 생성
-        encoded_keyword = quote(keyword)
-        rss_url = f"https://news.google.com/rss/search?q={encoded_keyword}&hl=ko&gl=KR&ceid=KR:ko"
-        
-        # RSS 파싱
-        feed = feedparser.parse(rss_url)
-        
-        articles = []
-        for entry in feed.entries[:max_results]:
-            article = {
-                'title': entry.title,
-                'link': entry.link,
-                'published': entry.published if 'published' in entry else '날짜 정보 없음',
-                'summary': entry.summary if 'summary' in entry else ''
-            }
-            articles.append(article)
-        
-        return articles
-        
-    except Exception as e:
-        st.error(f"기사 수집 중 오류 발생: {str(e)}")
-        return []
-
-# Playwright를 사용한 크롤링 함수
-def fetch_articles_with_playwright(keyword, max_results=5):
-    """
-    Playwright를 사용하여 동적 웹사이트에서 기사를 크롤링하는 함수
+    대화 전체 대신 토큰 예산 안의 최근 대화와 이전 대화 요약만 전송합니다.
     
     Args:
-        keyword: 검색 키워드
-        max_results: 최대 수집 기사 수
+        client: GMS 클라이언트 (스크립트 스레드에서 만든 것)
+        messages: 대화 히스토리
+        context: 세션의 chat_context.ChatContext
         
     Returns:
-        list: 기사 정보 리스트
+        str: GPT 응답 텍스트
     """
-    # Playwright를 사용할 수 없으면 빈 리스트 반환
-    if not PLAYWRIGHT_AVAILABLE or sync_playwright is None:
-        return []
-    
     try:
-        articles = []
-        
-        with sync_playwright() as p:
-            # Chrome 브라우저 실행
-            browser = p.chromium.launch(headless=True)
-            page = browser.new_page()
-            
-            # 네이버 뉴스 검색
-            search_url = f"https://search.naver.com/search.naver?where=news&sm=tab_jum&query={quote(keyword)}"
-            page.goto(search_url, wait_until="load")
-            
-            # 뉴스 항목 수집
-            news_items = page.query_selector_all("div.news_area")
-            
-            for item in news_items[:max_results]:
-                try:
-                    # 제목과 링크 추출
-                    title_elem = item.query_selector("a.news_tit")
-                    if not title_elem:
-                        continue
-                    
-                    title = title_elem.get_attribute("title")
-                    link = title_elem.get_attribute("href")
-                    
-                    # 요약 및 날짜 추출
-                    text_elem = item.query_selector("div.news_dsc")
-                    summary = text_elem.inner_text() if text_elem else ""
-                    
-                    date_elem = item.query_selector("span.info")
-                    published = date_elem.inner_text() if date_elem else "날짜 정보 없음"
-                    
-                    if title and link:
-                        articles.append({
-                            'title': title,
-                            'link': link,
-                            'published': published,
-                            'summary': summary,
-                            'source': 'Playwright (Naver News)'
-                        })
-                
-                except Exception as e:
-                    continue
-            
-            browser.close()
-        
-        return articles
-        
+        with metrics.span("chat_context"):
+            history = context.build(
+                messages,
+                summarize=lambda summary, dropped: summarize_chat_history(client, summary, dropped)
+            )
+        jobs.progress(stage="💬 답변 작성 중...")
+        with jobs.llm_slot(), metrics.span("gpt_chat", model=settings.model):
+            response = client.chat.completions.create(
+                model=settings.model,
+                messages=[
+                    {
+                        "role": "system", 
+                        "content": """당신은 친절하고 도움이 되는 AI 어시스턴트입니다. 
+사용자의 질문에 자세하고 정확하게 답변해주세요. 
+필요하면 여러 가지 예시도 제공하고, 여러 문단으로 깊이 있게 설명해주세요.
+최소 3-5 문단 이상으로 자세한 설명을 제공하세요.
+사용자가 간단한 인사말을 하면, 친근하게 인사하면서 대화를 시작하세요.
+"""
+                    },
+                    *history
+                ],
+                max_completion_tokens=4096
+            )
+        return response.choices[0].message.content
+    except jobs.JobCancelled:
+        raise
     except Exception as e:
-        # Playwright 오류는 조용히 처리
-        return []
+        return f"❌ 응답 생성 중 오류가 발생했습니다: {str(e)}"
 
-# 기사 요약 함수
-def summarize_articles(articles, user_query):
+# 이전 대화 요약 함수
+@metrics.timed("gpt_chat_summary")
+def summarize_chat_history(client, previous_summary, dropped_messages):
     """
-    수집된 기사들을 GPT로 요약하는 함수
+    토큰 예산 밖으로 밀려난 대화를 누적 요약에 합치는 함수
     
     Args:
-        articles: 기사 리스트
-        user_query: 사용자 원본 질문
+        client: GMS 클라이언트
+        previous_summary: 지금까지의 요약 (없으면 빈 문자열)
+        dropped_messages: 새로 밀려난 메시지 목록
         
     Returns:
-        str: 요약된 기사 정보
+        str: 갱신된 요약
     """
-    if not articles:
-        return "❌ 검색 결과가 없습니다. 다른 키워드로 시도해주세요."
-    
-    # 기사를 데이터베이스에 저장
-    keyword = extract_search_keyword(user_query)
-    for article in articles:
-        # SQLite에 저장
-        save_article(
-            title=article['title'],
-            link=article['link'],
-            keyword=keyword,
-            published=article['published'],
-            summary=article.get('summary', '')
-        )
-        
-        # Notion에도 저장 (활성화된 경우)
-        if get_notion_save_status():
-            save_article_to_notion(
-                title=article['title'],
-                link=article['link'],
-                keyword=keyword,
-                published=article['published'],
-                summary=article.get('summary', '')
-            )
-    
-    # 검색 히스토리 저장
-    save_search_history(keyword, len(articles))
-    
-    # 기사 정보를 텍스트로 변환
-    articles_text = ""
-    for idx, article in enumerate(articles, 1):
-        articles_text += f"\n\n[기사 {idx}]\n"
-        articles_text += f"제목: {article['title']}\n"
-        articles_text += f"링크: {article['link']}\n"
-        articles_text += f"발행: {article['published']}\n"
-    
-    try:
-        # GPT에게 요약 요청
+    with jobs.llm_slot():
         response = client.chat.completions.create(
-            model='gpt-5-nano',
+            model=settings.model,
             messages=[
                 {
                     "role": "system",
-                    "content": """당신은 뉴스 기사를 요약하고 분석하는 전문가입니다.
-사용자가 요청한 주제에 대한 기사들을 읽기 쉽고 자세하게 요약해주세요.
-
-요약 시 다음 형식을 따르세요:
-1. 전체 트렌드 및 시황 요약 (여러 줄)
-2. 각 기사별 핵심 내용 (제목과 함께 자세히)
-3. 기사 링크 제공
-4. 주요 포인트 및 통찰
-
-자세하고 정보 전달에 집중해주세요. 불릿 포인트를 활용해주세요."""
+                    "content": "이전 요약과 이어진 대화를 합쳐, 이후 대화에 필요한 사실과 사용자 요청 위주로 10문장 이내로 요약해주세요."
                 },
                 {
                     "role": "user",
-                    "content": f"사용자 질문: {user_query}\n\n수집된 기사 정보:\n{articles_text}\n\n위 기사들을 자세하고 읽기 쉽게 요약해주세요."
+                    "content": chat_context.format_for_summary(previous_summary, dropped_messages)
                 }
             ],
-            max_completion_tokens=4096
-        )
-        
-        summary = response.choices[0].message.content
-        return summary
-        
-    except Exception as e:
-        # GPT 요약 실패 시 기본 포맷으로 표시
-        result = f"📰 **'{user_query}' 관련 기사 {len(articles)}건**\n\n"
-        
-        for idx, article in enumerate(articles, 1):
-            result += f"**[{idx}] {article['title']}**\n"
-            result += f"🔗 {article['link']}\n"
-            result += f"📅 {article['published']}\n\n"
-        
-        result += f"\n⚠️ AI 요약 생성 실패: {str(e)}\n위 기사 링크를 클릭하여 자세한 내용을 확인하세요."
-        
-        return result
-
-# 일반 챗봇 응답 생성 함수
-def generate_chat_response(messages):
-    """
-    일반 대화 응답을 생성하는 함수
-    
-    Args:
-        messages: 대화 히스토리
-        
-    Returns:
-        str: GPT 응답 텍스트
-    """
-    try:
-        response = client.chat.completions.create(
-            model='gpt-5-nano',
-            messages=[
-                {
-                    "role": "system", 
-                    "content": """당신은 친절하고 도움이 되는 AI 어시스턴트입니다. 
-사용자의 질문에 자세하고 정확하게 답변해주세요. 
-필요하면 여러 가지 예시도 제공하고, 여러 문단으로 깊이 있게 설명해주세요.
-최소 3-5 문단 이상으로 자세한 설명을 제공하세요.
-사용자가 간단한 인사말을 하면, 친근하게 인사하면서 대화를 시작하세요.
-"""
-                },
-                *messages
-            ],
-            max_completion_tokens=4096
+            max_completion_tokens=chat_context.SUMMARY_MAX_TOKENS
         )
-        return response.choices[0].message.content
-    except Exception as e:
-        return f"❌ 응답 생성 중 오류가 발생했습니다: {str(e)}"
+    return response.choices[0].message.content or previous_summary
 
 # 기사 검색 처리 함수 (Phase 3 완성)
-def search_news(user_input):
+@metrics.timed("search_news")
+def search_news(client, user_input, on_delta=None):
     """
     기사 검색을 처리하는 함수
     
+    같은 키워드의 검색 결과는 세션 사이에 잠시 공유하고, 같은 키워드를 검색 중인 곳이 있으면
+    새로 검색하지 않고 그 결과를 기다립니다. (기다리는 동안 그쪽의 요약 스트리밍을 함께 표시)
+    
     Args:
+        client: GMS 클라이언트 (스크립트 스레드에서 만든 것)
         user_input: 사용자 입력 텍스트
+        on_delta: 요약 스트리밍 중 지금까지 받은 텍스트를 받는 콜백
         
     Returns:
         str: 기사 검색 결과
     """
     # 1단계: 검색 키워드 추출
-    keyword = extract_search_keyword(user_input)
-    
-    # 2단계: Google News에서 기사 수집
-    articles = fetch_google_news(keyword, max_results=5)
+    with metrics.span("extract_search_keyword"):
+        keyword = query_parser.extract_search_keyword(user_input)
+    jobs.progress(stage=f"🔎 '{keyword}' 기사 검색 중...")
+    
+    def compute(report):
+        def stream(text):
+            report(text)
+            if on_delta is not None:
+                on_delta(text)
+        return run_news_search(client, keyword, user_input, on_delta=stream)
+    
+    def wait(partial):
+        # 작업이 취소되면 여기서 JobCancelled가 발생하여 기다리기를 중단
+        jobs.progress(stage=f"🔁 같은 검색('{keyword}')의 결과를 기다리는 중...")
+        if partial and on_delta is not None:
+            on_delta(partial)
+    
+    # 2~4단계: 기사 수집, 저장, 요약 (공유 결과가 있으면 생략, 실패한 결과는 공유하지 않음)
+    result = query_cache.query_cache.get_or_compute(
+        query_cache.query_key(settings.model, keyword), compute,
+        on_wait=wait, cacheable=lambda result: result['ok']
+    )
     
-    # 3단계: RSS 결과가 없으면 Playwright로 크롤링 시도
-    if not articles:
-        with st.spinner("⏳ 다른 소스에서 기사를 검색 중..."):
-            articles = fetch_articles_with_playwright(keyword, max_results=5)
+    # 검색 히스토리는 공유 결과를 받은 경우에도 요청마다 저장
+    if result['article_count']:
+        save_search_history(keyword, result['article_count'])
+    return result['text']
+
+def run_news_search(client, keyword, user_input, on_delta=None):
+    """
+    기사 수집 → 저장/Notion 대기열 → GPT 요약 (검색 결과 공유 캐시에 없을 때만 실행)
     
-    # 4단계: 여전히 기사가 없으면 다른 키워드로 시도
-    if not articles and len(keyword) > 2:
-        # 원본 입력에서 뉴스 관련 키워드만 추출해서 다시 시도
-        alternative_keywords = user_input.split()
-        for alt_keyword in alternative_keywords:
-            if len(alt_keyword) >= 2:
-                articles = fetch_google_news(alt_keyword, max_results=5)
-                if articles:
-                    keyword = alt_keyword
-                    break
+    Returns:
+        dict: text(응답), article_count(수집한 기사 수), ok(공유해도 되는 결과인지 여부)
+    """
+    # 2단계: Google News RSS, Playwright, 대체 키워드 RSS를 동시에 검색
+    # (소스별 제한 시간 적용, 우선순위가 높은 소스의 결과가 오면 나머지는 취소)
+    articles, used_keyword = news_search.gather_articles(keyword, user_input, max_results=5)
     
-    # 5단계: 여전히 기사가 없으면 안내 메시지
+    # 3단계: 기사가 없으면 안내 메시지
     if not articles:
         # GPT에게 관련 정보 제공 요청
         try:
-            response = client.chat.completions.create(
-                model='gpt-5-nano',
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "사용자가 찾는 주제에 대해 현재 알고 있는 정보를 제공해주세요. 최근 뉴스나 트렌드 정보가 있다면 공유해주세요."
-                    },
-                    {
-                        "role": "user",
-                        "content": f"'{keyword}' 관련 최근 뉴스나 정보를 알려줄 수 있나요? 구글 뉴스에서 찾을 수 없어서 현재 알고 있는 정보를 공유해주세요."
-                    }
-                ],
-                max_completion_tokens=2048
-            )
-            return response.choices[0].message.content
+            jobs.progress(stage=f"💬 '{used_keyword}' 기사가 없어 알고 있는 정보로 답변 중...")
+            with jobs.llm_slot(), metrics.span("gpt_fallback", model=settings.model):
+                response = client.chat.completions.create(
+                    model=settings.model,
+                    messages=[
+                        {
+                            "role": "system",
+                            "content": "사용자가 찾는 주제에 대해 현재 알고 있는 정보를 제공해주세요. 최근 뉴스나 트렌드 정보가 있다면 공유해주세요."
+                        },
+                        {
+                            "role": "user",
+                            "content": f"'{used_keyword}' 관련 최근 뉴스나 정보를 알려줄 수 있나요? 구글 뉴스에서 찾을 수 없어서 현재 알고 있는 정보를 공유해주세요."
+                        }
+                    ],
+                    max_completion_tokens=2048
+                )
+            text = response.choices[0].message.content
+            return {'text': text, 'article_count': 0, 'ok': bool(text)}
+        except jobs.JobCancelled:
+            raise
         except Exception as e:
-            return f"❌ '{keyword}' 관련 기사를 찾을 수 없습니다.\\n\\n💡 다른 키워드로 다시 시도하거나, 일반 질문으로 물어봐주세요."
+            text = f"❌ '{used_keyword}' 관련 기사를 찾을 수 없습니다.\\n\\n💡 다른 키워드로 다시 시도하거나, 일반 질문으로 물어봐주세요."
+            return {'text': text, 'article_count': 0, 'ok': False}
+    
+    # 4단계: GPT로 기사 요약
+    jobs.progress(stage=f"📰 기사 {len(articles)}건 수집")
+    summary, ok = news_pipeline.summarize_articles(
+        client, articles, user_input, keyword=keyword, notion_enabled=get_notion_save_status(),
+        on_delta=on_delta, model=settings.model
+    )
+    # 빈 요약(추론에 토큰 한도를 모두 쓴 경우 등)은 공유하지 않음
+    return {'text': summary, 'article_count': len(articles), 'ok': ok and bool(summary.strip())}
+
+# ==================== 대화 턴 작업 ====================
+# 진행 상황 갱신 간격(초), 스크립트 한 번 실행에서 작업을 기다리는 최대 시간(초)
+# (기다리는 동안 새 입력이 오면 Streamlit이 바로 스크립트를 다시 실행)
+JOB_POLL_INTERVAL = 0.1
+JOB_POLL_WINDOW = 2.0
+
+def run_chat_turn(job, client, prompt, is_news_search, messages, context):
+    """
+    대화 한 턴의 응답 생성 (작업 스레드에서 실행, Streamlit API는 사용하지 않음)
+    
+    Args:
+        job: 실행 중인 jobs.Job
+        client: GMS 클라이언트 (get_client()는 st.cache_resource/st.stop을 쓰므로 스크립트 스레드에서 생성)
+        prompt: 사용자 입력
+        is_news_search: 의도 판단 결과
+        messages: 이번 입력까지의 대화 히스토리 (복사본)
+        context: 세션의 chat_context.ChatContext
+        
+    Returns:
+        str: 응답 텍스트
+    """
+    with metrics.span(CHAT_TURN_SPAN, kind="search" if is_news_search else "chat"):
+        if is_news_search:
+            # 기사 요약은 도착한 텍스트를 작업에 기록 (화면은 rerun마다 읽어서 표시)
+            return search_news(client, prompt, on_delta=lambda text: job.progress(text=text))
+        return generate_chat_response(client, messages, context)
+
+def submit_chat_turn(prompt):
+    """새 입력의 응답 생성을 작업으로 실행 (진행 중인 이전 응답은 취소)"""
+    cancel_chat_turn()
+    # 클라이언트 생성 실패 시의 안내(st.error/st.stop)는 스크립트 스레드에서만 가능
+    client = get_client()
+    is_news_search = check_news_search_intent(prompt)
+    if "chat_context" not in st.session_state:
+        st.session_state.chat_context = chat_context.ChatContext()
     
-    # 6단계: GPT로 기사 요약
-    summary = summarize_articles(articles, user_input)
+    st.session_state.messages.append({"role": "user", "content": prompt})
+    job = jobs.manager.submit(
+        run_chat_turn, client, prompt, is_news_search,
+        list(st.session_state.messages), st.session_state.chat_context,
+        kind="search" if is_news_search else "chat"
+    )
+    st.session_state.active_job = job.id
+
+def finish_chat_turn(job):
+    """작업 결과를 대화 내역에 추가 (끝나지 않았거나 취소된 작업은 받은 부분까지)"""
+    st.session_state.active_job = None
+    if job.status == jobs.DONE:
+        content = job.result
+    elif job.status == jobs.FAILED:
+        content = f"⚠️ 처리 중 오류가 발생했습니다: {job.error}"
+    else:
+        content = (job.text + "\n\n" if job.text else "") + "⏹️ 새 요청으로 응답을 중단했습니다."
+    if job.notices:
+        content = (content or "") + "\n\n" + "\n".join(f"⚠️ {notice}" for notice in job.notices)
+    if content:
+        st.session_state.messages.append({"role": "assistant", "content": content})
+
+def cancel_chat_turn():
+    """진행 중인 작업 취소 (받은 부분까지는 대화 내역에 남김)"""
+    job = jobs.manager.cancel(st.session_state.get("active_job"))
+    if job is not None:
+        finish_chat_turn(job)
+
+def render_chat_turn(job, stage_placeholder, text_placeholder):
+    """작업의 진행 단계와 지금까지 받은 응답 표시"""
+    stage_placeholder.caption(f"⏳ {job.stage or '처리 중...'}")
+    if job.text:
+        text_placeholder.markdown(job.text + "▌")
+
+def wait_for_chat_turn(job, stage_placeholder, text_placeholder, window=JOB_POLL_WINDOW):
+    """
+    작업 진행 상황을 잠시 갱신하다가 스크립트를 다시 실행
     
-    return summary
+    작업이 끝나면 다음 실행에서 결과가 대화 내역으로 옮겨집니다.
+    스크립트는 최대 window초만 기다리므로 작업 시간 동안 세션이 멈추지 않습니다.
+    """
+    deadline = time.monotonic() + window
+    while not job.done and time.monotonic() < deadline:
+        time.sleep(JOB_POLL_INTERVAL)
+        render_chat_turn(job, stage_placeholder, text_placeholder)
+    st.rerun()
+
+# 끝난 작업의 결과를 대화 내역으로 옮김 (보관 기간이 지나 없어진 작업은 잊음)
+active_job = jobs.manager.get(st.session_state.get("active_job"))
+if active_job is None:
+    st.session_state.active_job = None
+elif active_job.done:
+    finish_chat_turn(active_job)
+    active_job = None
 
 # 제목
 st.title("🤖 뉴스 검색 챗봇")
@@ -811,11 +564,17 @@ st.caption("일반 대화와 기사 검색이 가능한 AI 챗봇입니다.")
 # 사이드바 (옵션)
 with st.sidebar:
     st.header("⚙️ 설정")
-    st.write("**모델:** gpt-5-nano")
+    st.write(f"**모델:** {settings.model}")
     st.write("**기능:** 일반 대화 + 기사 검색")
     
     # 대화 개수 표시
     st.write(f"**대화 개수:** {len(st.session_state.messages)}개")
+    job_stats = jobs.manager.stats()
+    st.caption(f"🧵 응답 작업: 실행 {job_stats[jobs.RUNNING]} · 대기 {job_stats[jobs.PENDING]}"
+               f" · GPT 호출 {jobs.llm_limiter.active}/{settings.llm_max_concurrency}")
+    if "chat_context" in st.session_state:
+        context = st.session_state.chat_context
+        st.caption(f"🧾 전송 문맥: 최근 대화 약 {context.window_tokens():,}토큰 · 이전 대화 요약 {context.summaries}회")
     
     # 기능 상태 표시
     st.divider()
@@ -841,33 +600,32 @@ with st.sidebar:
     if "intent_log" in st.session_state and len(st.session_state.intent_log) > 0:
         st.divider()
         st.write("**🔍 의도 판단 로그 (최근 5개):**")
-        for log in st.session_state.intent_log[-5:]:
-            icon = "📰" if log["is_search"] else "💬"
-            result_text = "기사검색" if log["is_search"] else "일반대화"
-            st.text(f"{icon} '{log['input'][:25]}...'")
+        for log_input, is_search, reason in list(st.session_state.intent_log)[-5:]:
+            icon = "📰" if is_search else "💬"
+            result_text = "기사검색" if is_search else "일반대화"
+            st.text(f"{icon} '{log_input[:25]}...'")
             st.caption(f"→ {result_text}")
     
     # ==================== 저장된 기사 관리 ====================
     st.divider()
     st.write("**📚 저장된 기사 관리:**")
     
+    # 사이드바 통계 (쓰기가 없으면 캐시에서 읽음)
+    sidebar_stats = get_sidebar_stats()
+    
     # 검색 히스토리
-    history = get_search_history(limit=5)
-    if history:
+    if sidebar_stats and sidebar_stats['history']:
         st.write("**검색 히스토리:**")
-        for keyword, count, timestamp in history:
+        for keyword, count, timestamp in sidebar_stats['history']:
             st.caption(f"🔎 {keyword} ({count}건) - {timestamp[:10]}")
     
     # 저장된 기사 통계
-    try:
-        conn = sqlite3.connect(DB_PATH)
-        c = conn.cursor()
-        c.execute('SELECT COUNT(*) FROM articles')
-        total_articles = c.fetchone()[0]
-        conn.close()
-        st.metric("💾 저장된 기사", f"{total_articles}건")
-    except:
-        pass
+    if sidebar_stats:
+        article_stats = sidebar_stats['stats']
+        st.metric("💾 저장된 기사", f"{article_stats['articles_total']}건")
+        if article_stats['keywords']:
+            st.caption("🏷️ " + " · ".join(f"{keyword or '(없음)'} {count}건"
+                                           for keyword, count in article_stats['keywords']))
     
     # DB 관리 버튼
     col1, col2 = st.columns(2)
@@ -879,8 +637,9 @@ with st.sidebar:
         if st.button("🗑️ 초기화"):
             if st.button("정말 삭제할까요?", key="confirm_delete"):
                 clear_all_articles()
+                cancel_chat_turn()
                 st.session_state.messages = []
-                st.session_state.intent_log = []
+                st.session_state.intent_log = intent.new_intent_log()
                 st.success("✅ 모든 데이터가 초기화되었습니다!")
                 st.rerun()
     
@@ -888,25 +647,37 @@ with st.sidebar:
     st.divider()
     st.write("**⏰ 정시 기사 수집 설정:**")
     
-    # 스케줄러 상태 표시
-    if scheduler and scheduler.running:
-        st.success("✅ 자동 기사 수집 중 (매일 9시, 15시, 21시)")
+    # 수집기 상태 표시 (수집은 별도 프로세스 `python -m collector`에서 실행)
+    collector_owner = collector.collector_status()
+    if collector_owner:
+        st.success(f"✅ 자동 기사 수집 중 ({collector.schedule_description()})")
+        st.caption(f"수집기: {collector_owner}")
     else:
         st.warning("⚠️ 자동 기사 수집 비활성화")
+        st.caption("`python -m collector`로 수집기를 실행하세요.")
+    
+    # 최근 수집 실행의 키워드별 결과
+    last_run = sidebar_stats['last_run'] if sidebar_stats else []
+    if last_run:
+        finished_at = datetime.fromtimestamp(sidebar_stats['stats']['last_collection_at'])
+        st.write(f"**최근 수집 결과** ({finished_at.strftime('%m-%d %H:%M')}):")
+        for _, _, keyword, fetched, skipped, new_count, duplicate_count, error in last_run:
+            if error:
+                st.caption(f"{keyword}: 실패 ({error.split(':')[0]})")
+            else:
+                st.caption(f"{keyword}: 신규 {new_count}건, 중복 {skipped + duplicate_count}건 (읽은 기사 {fetched}건)")
     
-    # 수집 로그 표시
-    if Path("collection_log.txt").exists():
-        with open("collection_log.txt", "r", encoding="utf-8") as f:
-            logs = f.readlines()[-5:]  # 최근 5개
-        if logs:
-            st.write("**최근 수집 로그:**")
-            for log in logs:
-                st.caption(log.strip())
+    # 수집 로그 표시 (파일 끝에서 최근 5줄만 읽음)
+    logs = get_log_tail(5)
+    if logs:
+        st.write("**최근 수집 로그:**")
+        for log in logs:
+            st.caption(log.strip())
     
     # 수동 수집 버튼
     if st.button("🔄 지금 바로 수집"):
         with st.spinner("기사 수집 중..."):
-            if auto_collect_news():
+            if collector.collect_news():
                 st.success("✅ 기사 수집 완료!")
                 st.rerun()
             else:
@@ -914,12 +685,19 @@ with st.sidebar:
     
     # 기본 수집 키워드 설정
     st.write("**기본 수집 키워드:**")
-    st.caption("매일 정시에 수집할 뉴스 키워드: AI, 기술, 경제, 정치, 스포츠")
+    st.caption(f"매일 정시에 수집할 뉴스 키워드: {', '.join(settings.collect_keywords)}")
     
     # ==================== Playwright 크롤링 설정 ====================
     st.divider()
     st.write("**🌐 기사 검색 소스:**")
     st.caption("✅ Google News RSS (기본 - 빠름)")
+    cache_stats = feeds.feed_cache.stats()
+    st.caption(f"📡 RSS 캐시: 적중 {cache_stats['hits']} · 재검증 {cache_stats['revalidated']} · 미스 {cache_stats['misses']}")
+    summary_stats = summarizer.summary_cache.stats()
+    st.caption(f"🧠 요약 캐시: 적중 {summary_stats['hits']} · 미스 {summary_stats['misses']}")
+    query_stats = query_cache.query_cache.stats()
+    st.caption(f"🔁 검색 결과 공유: 적중 {query_stats['hits']} · 진행 중 검색 합류 {query_stats['waits']}"
+               f" · 미스 {query_stats['misses']}")
     if PLAYWRIGHT_AVAILABLE:
         st.caption("✅ Playwright 크롤링 (옵션 - 네이버 뉴스)")
     else:
@@ -932,6 +710,9 @@ with st.sidebar:
     if NOTION_AVAILABLE and get_notion_save_status():
         st.success("✅ Notion 저장 활성화됨")
         st.caption("수집된 기사가 자동으로 Notion에 저장됩니다.")
+        if sidebar_stats:
+            pending, failed, synced = sidebar_stats['notion']
+            st.caption(f"📤 전송 대기 {pending}건 · 완료 {synced}건 · 실패 {failed}건")
     elif NOTION_AVAILABLE:
         st.warning("⚠️ Notion API Key 또는 Database ID가 설정되지 않음")
         st.caption("**.env 파일 또는 Secrets에 다음을 추가하세요:**")
@@ -941,10 +722,38 @@ with st.sidebar:
         st.warning("⚠️ notion-client 패키지가 설치되지 않음")
         st.caption("설치 명령: `pip install notion-client`")
     
+    # ==================== 구간별 지연 시간 ====================
+    st.divider()
+    st.write("**⏱️ 구간별 지연 시간:**")
+    if not settings.metrics_enabled:
+        st.caption("기록 꺼짐 (`METRICS_ENABLED=0`)")
+    elif st.checkbox("통계 보기", key="show_metrics"):
+        metrics_summary, last_turn = get_metrics_summary()
+        if metrics_summary:
+            st.dataframe(
+                pd.DataFrame([
+                    {"구간": name, "횟수": stats["count"], "p50(ms)": stats["p50"],
+                     "p95(ms)": stats["p95"], "p99(ms)": stats["p99"], "오류": stats["errors"],
+                     "취소": stats["cancelled"]}
+                    for name, stats in metrics_summary.items()
+                ]),
+                hide_index=True,
+                column_config={f"p{pct}(ms)": st.column_config.NumberColumn(format="%.1f")
+                               for pct in metrics.QUANTILES},
+            )
+            if last_turn:
+                st.caption("최근 대화 턴: " + " → ".join(f"{entry['name']} {entry['ms']:.0f}ms"
+                                                    for entry in last_turn))
+        else:
+            st.caption("아직 기록된 구간이 없습니다.")
+    if metrics_server is not None:
+        st.caption(f"📈 Prometheus: http://127.0.0.1:{settings.metrics_port}/metrics")
+    
     st.divider()
     if st.button("🗑️ 대화 내역만 초기화"):
+        cancel_chat_turn()
         st.session_state.messages = []
-        st.session_state.intent_log = []
+        st.session_state.intent_log = intent.new_intent_log()
         st.success("✅ 대화 내역이 초기화되었습니다!")
         st.rerun()
 
@@ -957,90 +766,114 @@ for message in st.session_state.messages:
     with st.chat_message(message["role"]):
         st.markdown(message["content"])
 
+# 진행 중인 응답 (스크립트 끝에서 작업 진행 상황으로 계속 갱신)
+if active_job is not None:
+    with st.chat_message("assistant"):
+        job_stage = st.empty()
+        job_text = st.empty()
+        render_chat_turn(active_job, job_stage, job_text)
+
 # ==================== 저장된 기사 표시 ====================
+def render_article_table(articles, key):
+    """
+    기사 목록을 표 하나로 표시하고 체크한 기사를 삭제
+    
+    기사마다 컨테이너/버튼을 만들지 않으므로 페이지 크기가 커져도 위젯 수가 일정합니다.
+    (표는 보이는 행만 그림)
+    """
+    table = pd.DataFrame([
+        {"삭제": False, "제목": title, "링크": link, "키워드": keyword,
+         "발행": published, "저장": (saved_at or "")[:10]}
+        for title, link, keyword, published, saved_at, *_ in articles
+    ])
+    edited = st.data_editor(
+        table,
+        key=key,
+        hide_index=True,
+        use_container_width=True,
+        disabled=["제목", "링크", "키워드", "발행", "저장"],
+        column_config={
+            "삭제": st.column_config.CheckboxColumn("삭제", width="small"),
+            "링크": st.column_config.LinkColumn("링크"),
+        },
+    )
+    
+    selected = edited.loc[edited["삭제"], "링크"].tolist()
+    if selected and st.button(f"❌ 선택한 기사 {len(selected)}건 삭제", key=f"{key}_delete"):
+        for link in selected:
+            delete_article(link)
+        st.success("삭제되었습니다!")
+        st.rerun()
+
 if st.session_state.get("show_saved_articles", False):
     st.divider()
     st.header("📚 저장된 기사 조회")
     
+    # 페이지 크기 (바뀌면 첫 페이지로)
+    page_size = st.selectbox("페이지당 기사 수", ARTICLE_PAGE_SIZES, index=1, key="article_page_size")
+    if st.session_state.get("article_page_cursors_size") != page_size:
+        st.session_state.article_page_cursors = [None]
+        st.session_state.article_page_cursors_size = page_size
+    
     # 탭: 전체 기사 / 키워드별 검색
     tab1, tab2 = st.tabs(["전체 기사", "키워드 검색"])
     
     with tab1:
-        articles = get_saved_articles(limit=50)
+        # 지나온 페이지의 시작 위치를 쌓아 두고 이전/다음 이동 (OFFSET 없이 어느 페이지든 같은 비용)
+        cursors = st.session_state.article_page_cursors
+        articles, next_cursor = get_articles_page(page_size, cursors[-1])
         if articles:
-            st.success(f"✅ 저장된 기사: {len(articles)}건")
+            st.success(f"✅ 저장된 기사 {len(cursors)}페이지: {len(articles)}건")
+            render_article_table(articles, key="saved_articles_table")
             
-            # 테이블 형식으로 표시
-            for idx, (title, link, keyword, published, saved_at) in enumerate(articles, 1):
-                with st.container(border=True):
-                    col1, col2 = st.columns([0.9, 0.1])
-                    
-                    with col1:
-                        st.markdown(f"**[{title}]({link})**")
-                        st.caption(f"🔑 키워드: {keyword} | 📅 발행: {published} | 💾 저장: {saved_at[:10]}")
-                    
-                    with col2:
-                        if st.button("❌", key=f"delete_{idx}_{link}", help="삭제"):
-                            delete_article(link)
-                            st.success("삭제되었습니다!")
-                            st.rerun()
+            col_prev, col_page, col_next = st.columns([1, 2, 1])
+            with col_prev:
+                if st.button("◀ 이전", key="articles_prev", disabled=len(cursors) == 1):
+                    cursors.pop()
+                    st.rerun()
+            with col_next:
+                if st.button("다음 ▶", key="articles_next", disabled=next_cursor is None):
+                    cursors.append(next_cursor)
+                    st.rerun()
+        elif len(cursors) > 1:
+            # 삭제로 현재 페이지가 비었으면 이전 페이지로
+            cursors.pop()
+            st.rerun()
         else:
             st.info("💡 저장된 기사가 없습니다. 기사를 검색해서 저장해보세요!")
     
     with tab2:
         keyword_search = st.text_input("검색할 키워드를 입력하세요:", placeholder="예: 삼성, AI, 정치")
         if keyword_search:
-            articles = get_saved_articles(keyword=keyword_search, limit=50)
+            # 검색어/페이지 크기가 바뀌면 첫 페이지로
+            if st.session_state.get("search_page_key") != (keyword_search, page_size):
+                st.session_state.search_page_key = (keyword_search, page_size)
+                st.session_state.search_page = 0
+            page = st.session_state.search_page
+            
+            # 제목/요약 전문 검색 (관련도순)
+            articles, has_next = search_saved_articles(keyword_search, limit=page_size, offset=page * page_size)
             if articles:
-                st.success(f"✅ '{keyword_search}' 관련 기사: {len(articles)}건")
+                st.success(f"✅ '{keyword_search}' 관련 기사 {page + 1}페이지: {len(articles)}건")
+                render_article_table(articles, key="search_articles_table")
                 
-                for idx, (title, link, keyword, published, saved_at) in enumerate(articles, 1):
-                    with st.container(border=True):
-                        col1, col2 = st.columns([0.9, 0.1])
-                        
-                        with col1:
-                            st.markdown(f"**[{title}]({link})**")
-                            st.caption(f"🔑 키워드: {keyword} | 📅 발행: {published} | 💾 저장: {saved_at[:10]}")
-                        
-                        with col2:
-                            if st.button("❌", key=f"delete_keyword_{idx}_{link}", help="삭제"):
-                                delete_article(link)
-                                st.success("삭제되었습니다!")
-                                st.rerun()
+                col_prev, col_page, col_next = st.columns([1, 2, 1])
+                with col_prev:
+                    if st.button("◀ 이전", key="search_prev", disabled=page == 0):
+                        st.session_state.search_page -= 1
+                        st.rerun()
+                with col_next:
+                    if st.button("다음 ▶", key="search_next", disabled=not has_next):
+                        st.session_state.search_page += 1
+                        st.rerun()
             else:
                 st.warning(f"❌ '{keyword_search}' 관련 저장된 기사가 없습니다.")
 
 # 사용자 입력 받기
 if prompt := st.chat_input("메시지를 입력하세요..."):
-    # 사용자 메시지 추가
-    st.session_state.messages.append({"role": "user", "content": prompt})
-    
-    # 응답 생성을 위한 임시 변수
-    assistant_message = None
-    
     try:
-        # 1단계: 의도 판단
-        is_news_search = check_news_search_intent(prompt)
-        
-        # 2단계: 응답 생성
-        with st.spinner("처리 중..."):
-            if is_news_search:
-                # 기사 검색 처리
-                assistant_message = search_news(prompt)
-            else:
-                # 일반 대화 처리
-                assistant_message = generate_chat_response(st.session_state.messages)
-        
-        # 3단계: 응답 저장
-        if assistant_message:
-            st.session_state.messages.append({
-                "role": "assistant",
-                "content": assistant_message
-            })
-        
-        # 4단계: 화면 새로고침
-        st.rerun()
-            
+        # 응답 생성은 작업 스레드에서 실행 (진행 상황은 다음 실행부터 표시)
+        submit_chat_turn(prompt)
     except Exception as e:
         st.error(f"❌ 오류 발생: {str(e)}")
         
@@ -1050,8 +883,23 @@ if prompt := st.chat_input("메시지를 입력하세요..."):
             "role": "assistant",
             "content": error_message
         })
-        st.rerun()
+    st.rerun()
 
 # 하단 안내
 st.divider()
-st.caption("💡 팁: 대화 내역은 자동으로 저장되며, 사이드바에서 초기화할 수 있습니다.")
\ No newline at end of file
+st.caption("💡 팁: 대화 내역은 자동으로 저장되며, 사이드바에서 초기화할 수 있습니다.")
+
+# ==================== 첫 화면 이후 초기화 ====================
+# 화면을 모두 그린 뒤에 실행하여 첫 화면이 느린 import/클라이언트 생성을 기다리지 않도록 함
+warm_up_imports()
+
+# Notion 전송 스레드 시작 (프로세스당 하나)
+if get_notion_save_status():
+    start_notion_worker(settings.notion_api_key, settings.notion_database_id)
+
+# 이번 실행(rerun)에 걸린 시간 기록 (입력 처리의 st.rerun()으로 중단된 실행과 작업 대기 시간은 제외)
+metrics.record("app_rerun", time.perf_counter() - rerun_started)
+
+# 진행 중인 응답이 있으면 잠시 진행 상황을 갱신한 뒤 다시 실행
+if active_job is not None:
+    wait_for_chat_turn(active_job, job_stage, job_text)
\ No newline at end of file
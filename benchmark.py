@@ -0,0 +1,1791 @@
+"""
+성능 측정 스크립트
+
+외부 서비스 없이 로컬에서 실행되는 시나리오만 포함합니다.
+
+사용법:
+    python benchmark.py storage [--reruns 200] [--seed-rows 5000]
+    python benchmark.py ingest [--keywords 5] [--per-keyword 20]
+    python benchmark.py search [--rows 1000000]
+    python benchmark.py parse [--fixture feed.xml] [--max-results 5]
+    python benchmark.py plans
+    python benchmark.py summary [--tokens 300] [--token-delay 0.005]
+    python benchmark.py notion [--articles 3] [--retry-after 0.5] [--lease 1.0]
+    python benchmark.py keywords [--repeat 2000]
+    python benchmark.py intent [--samples labeled.tsv] [--folds 5]
+    python benchmark.py context [--turns 500] [--budget 8000]
+    python benchmark.py dedup [--stories 2000] [--outlets 4]
+    python benchmark.py pages [--rows 100000] [--page-size 20]
+    python benchmark.py sidebar [--rows 200000]
+    python benchmark.py spans [--calls 100000]
+    python benchmark.py startup [--reruns 20]
+    python benchmark.py querycache [--users 50] [--keywords 2]
+    python benchmark.py record [--keywords AI,경제,삼성전자]
+    python benchmark.py suite [--scales 1000,100000,1000000] [--output results.json]
+    python benchmark.py compare base.json results.json [--threshold 0.2]
+"""
+import argparse
+import random
+import re
+import sqlite3
+import statistics
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import storage
+
+
+# ==================== 공통 유틸 ====================
+def percentile(values, pct):
+    """정렬된 값 목록에서 백분위 값 계산"""
+    if not values:
+        return 0.0
+    values = sorted(values)
+    index = min(len(values) - 1, max(0, round(pct / 100 * len(values)) - 1))
+    return values[index]
+
+
+def format_ms(seconds):
+    return f"{seconds * 1000:8.2f} ms"
+
+
+def sample_article(i, keyword="AI"):
+    return {
+        'title': f"{keyword} 관련 기사 제목 {i}",
+        'link': f"https://example.com/{keyword}/{i}",
+        'published': "Mon, 06 Jan 2025 09:00:00 GMT",
+        'summary': f"{keyword} 기사 요약 {i} " * 5,
+    }
+
+
+# ==================== storage: 커넥션 풀 vs 호출마다 connect ====================
+class LegacyStorage:
+    """기존 app.py 방식 (호출마다 sqlite3.connect, 기본 저널 모드)"""
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self.connects = 0
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        with self._lock:
+            self.connects += 1
+        return sqlite3.connect(self.db_path)
+
+    def save_article(self, title, link, keyword, published, summary=""):
+        conn = self._connect()
+        conn.execute('''
+            INSERT OR IGNORE INTO articles
+            (title, link, keyword, published, summary)
+            VALUES (?, ?, ?, ?, ?)
+        ''', (title, link, keyword, published, summary))
+        conn.commit()
+        conn.close()
+
+    def save_search_history(self, keyword, article_count):
+        conn = self._connect()
+        conn.execute('INSERT INTO search_history (keyword, article_count) VALUES (?, ?)',
+                     (keyword, article_count))
+        conn.commit()
+        conn.close()
+
+    def get_search_history(self, limit=5):
+        conn = self._connect()
+        rows = conn.execute('''
+            SELECT keyword, article_count, searched_at FROM search_history
+            ORDER BY searched_at DESC LIMIT ?
+        ''', (limit,)).fetchall()
+        conn.close()
+        return rows
+
+    def count_articles(self):
+        conn = self._connect()
+        count = conn.execute('SELECT COUNT(*) FROM articles').fetchone()[0]
+        conn.close()
+        return count
+
+    def get_saved_articles(self, keyword=None, limit=10):
+        conn = self._connect()
+        rows = conn.execute('''
+            SELECT title, link, keyword, published, saved_at FROM articles
+            ORDER BY saved_at DESC LIMIT ?
+        ''', (limit,)).fetchall()
+        conn.close()
+        return rows
+
+
+class PooledStorage:
+    """storage 모듈 래퍼 (connects 값은 풀 통계에서 읽음)"""
+
+    save_article = staticmethod(storage.save_article)
+    save_search_history = staticmethod(storage.save_search_history)
+    get_search_history = staticmethod(storage.get_search_history)
+    count_articles = staticmethod(storage.count_articles)
+    get_saved_articles = staticmethod(storage.get_saved_articles)
+
+    @property
+    def connects(self):
+        return storage.get_pool().connects
+
+
+def run_storage_scenario(backend, reruns, scheduler_batches):
+    """
+    UI rerun과 스케줄러 수집을 동시에 실행
+
+    Returns:
+        dict: rerun당 connect 수, 쓰기 지연, 잠금 오류 수
+    """
+    write_latencies = []
+    errors = []
+    latency_lock = threading.Lock()
+
+    def timed_write(func, *args):
+        start = time.perf_counter()
+        try:
+            func(*args)
+        except sqlite3.OperationalError as e:
+            errors.append(str(e))
+            return
+        with latency_lock:
+            write_latencies.append(time.perf_counter() - start)
+
+    def scheduler_job():
+        # auto_collect_news: 키워드 5개 x 기사 3건
+        for batch in range(scheduler_batches):
+            for k, keyword in enumerate(['AI', '기술', '경제', '정치', '스포츠']):
+                for i in range(3):
+                    article = sample_article(f"{batch}-{k}-{i}", keyword)
+                    timed_write(backend.save_article, article['title'], article['link'],
+                                keyword, article['published'], article['summary'])
+
+    scheduler_thread = threading.Thread(target=scheduler_job)
+    connects_before = backend.connects
+    scheduler_thread.start()
+
+    rerun_connects = []
+    for i in range(reruns):
+        before = backend.connects
+        # 사이드바 + 기사 조회 화면에서 rerun마다 일어나는 조회
+        backend.get_search_history(5)
+        backend.count_articles()
+        backend.get_saved_articles(limit=50)
+        # 검색 요청 rerun (10번 중 1번)
+        if i % 10 == 0:
+            timed_write(backend.save_search_history, "AI", 5)
+        rerun_connects.append(backend.connects - before)
+
+    scheduler_thread.join()
+
+    return {
+        'connects_total': backend.connects - connects_before,
+        'connects_per_rerun': statistics.mean(rerun_connects),
+        'writes': len(write_latencies),
+        'write_p50': percentile(write_latencies, 50),
+        'write_p99': percentile(write_latencies, 99),
+        'lock_errors': len(errors),
+    }
+
+
+def bench_storage(args):
+    with tempfile.TemporaryDirectory() as tmp:
+        results = {}
+        for name in ('legacy', 'pooled'):
+            db_path = Path(tmp) / f"{name}.db"
+            storage.configure(db_path)
+            storage.init_database()
+            if name == 'legacy':
+                # 기존 방식과 동일하게 롤백 저널 모드로 되돌림
+                storage.get_pool().close()
+                conn = sqlite3.connect(db_path)
+                conn.execute("PRAGMA journal_mode=DELETE")
+                conn.close()
+                backend = LegacyStorage(db_path)
+            else:
+                backend = PooledStorage()
+
+            for i in range(args.seed_rows):
+                article = sample_article(f"seed-{i}")
+                backend.save_article(article['title'], article['link'], 'AI',
+                                     article['published'], article['summary'])
+
+            results[name] = run_storage_scenario(backend, args.reruns, args.scheduler_batches)
+
+        storage.get_pool().close()
+
+    print(f"{'':<10}{'connect/rerun':>15}{'writes':>8}{'p50 write':>14}{'p99 write':>14}{'locked':>8}")
+    for name, r in results.items():
+        print(f"{name:<10}{r['connects_per_rerun']:>15.2f}{r['writes']:>8}"
+              f"{format_ms(r['write_p50']):>14}{format_ms(r['write_p99']):>14}{r['lock_errors']:>8}")
+
+
+# ==================== ingest: 기사 단건 저장 vs 배치 저장 ====================
+def bench_ingest(args):
+    keywords = [f"키워드{k}" for k in range(args.keywords)]
+    with tempfile.TemporaryDirectory() as tmp:
+        results = {}
+        for name in ('per-article', 'batched'):
+            storage.configure(Path(tmp) / f"{name}.db")
+            storage.init_database()
+
+            start = time.perf_counter()
+            for run in range(args.runs):
+                for keyword in keywords:
+                    # 실행마다 절반은 새 기사, 절반은 이전 실행과 중복
+                    articles = [sample_article(run * args.per_keyword // 2 + i, keyword)
+                                for i in range(args.per_keyword)]
+                    if name == 'batched':
+                        storage.save_articles(articles, keyword)
+                    else:
+                        for article in articles:
+                            storage.save_article(article['title'], article['link'], keyword,
+                                                 article['published'], article['summary'])
+            results[name] = (time.perf_counter() - start) / args.runs
+
+        storage.get_pool().close()
+
+    print(f"키워드 {args.keywords}개 x 기사 {args.per_keyword}건, 실행 {args.runs}회 평균")
+    for name, elapsed in results.items():
+        print(f"{name:<12}{format_ms(elapsed)}")
+    print(f"speedup     {results['per-article'] / results['batched']:8.1f}x")
+
+
+# ==================== search: 전문 검색 지연 ====================
+SEARCH_VOCABULARY = [
+    '삼성전자', '반도체', '인공지능', '경제', '정치', '스포츠', '기술', '증시', '환율', '금리',
+    '부동산', '수출', '배터리', '전기차', '국회', '대통령', '선거', '야구', '축구', '올림픽',
+    '스타트업', '투자', '클라우드', '보안', '데이터', '로봇', '우주', '기후', '에너지', '물가',
+]
+SEARCH_PARTICLES = ['', '가', '는', '를', '의', '에서', '와']
+SEARCH_QUERIES = ['삼성', '삼성전자 반도체', '인공지능', '금리 인상', 'AI', '전기차 배터리', '야구']
+
+
+def synthetic_articles(count, seed=0):
+    """검색 벤치마크용 한국어 기사 생성 (조사가 붙은 단어 포함)"""
+    rng = random.Random(seed)
+    for i in range(count):
+        words = [rng.choice(SEARCH_VOCABULARY) + rng.choice(SEARCH_PARTICLES) for _ in range(6)]
+        yield {
+            'title': ' '.join(words[:4]) + f" AI {i}",
+            'link': f"https://example.com/search/{i}",
+            'published': "Mon, 06 Jan 2025 09:00:00 GMT",
+            'summary': ' '.join(words) + ' 관련 소식입니다.',
+        }
+
+
+def bench_search(args):
+    with tempfile.TemporaryDirectory() as tmp:
+        storage.configure(Path(tmp) / "search.db")
+        storage.init_database()
+
+        start = time.perf_counter()
+        batch = []
+        for article in synthetic_articles(args.rows):
+            batch.append(article)
+            if len(batch) == 10000:
+                storage.save_articles(batch, "AI")
+                batch = []
+        storage.save_articles(batch, "AI")
+        print(f"{args.rows:,}건 색인: {time.perf_counter() - start:.1f}s")
+
+        print(f"{'query':<20}{'results':>8}{'p50':>14}{'p99':>14}")
+        for query in SEARCH_QUERIES:
+            timings = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                results = storage.search_saved_articles(query, limit=args.limit)
+                timings.append(time.perf_counter() - start)
+            print(f"{query:<20}{len(results):>8}{format_ms(percentile(timings, 50)):>14}"
+                  f"{format_ms(percentile(timings, 99)):>14}")
+
+        storage.get_pool().close()
+
+
+# ==================== pages: 저장된 기사 페이지 이동 ====================
+OFFSET_ARTICLES_SQL = '''
+    SELECT title, link, keyword, published, saved_at, id
+    FROM articles
+    ORDER BY saved_at DESC, id DESC
+    LIMIT ? OFFSET ?
+'''
+
+
+def bench_pages(args):
+    """페이지 위치별 조회 지연 (OFFSET vs (saved_at, id) 키셋)"""
+    with tempfile.TemporaryDirectory() as tmp:
+        storage.configure(Path(tmp) / "pages.db")
+        storage.init_database()
+
+        # 저장 경로(중복 판별 포함)를 거치지 않고 바로 채움 (조회 비용만 측정)
+        with storage.get_pool().transaction() as conn:
+            conn.executemany(
+                "INSERT INTO articles (title, link, keyword, published, saved_at) VALUES (?, ?, 'AI', '', ?)",
+                ((f"기사 {i}", f"https://example.com/pages/{i}",
+                  time.strftime(storage.TIMESTAMP_FORMAT, time.gmtime(1_700_000_000 + i // 7)))
+                 for i in range(args.rows))
+            )
+
+        pages = args.rows // args.page_size
+        targets = sorted({0, 10, 100, 1000, pages // 2, pages - 1} & set(range(pages)))
+        cursors = {}
+        before = None
+        for page in range(pages):
+            if page in targets:
+                cursors[page] = before
+            rows = storage.get_saved_articles(limit=args.page_size, before=before)
+            before = (rows[-1][4], rows[-1][5])
+
+        print(f"{args.rows:,}건, 페이지당 {args.page_size}건")
+        print(f"{'page':>8}{'offset p50':>14}{'keyset p50':>14}")
+        for page in targets:
+            offset_timings, keyset_timings = [], []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                with storage.get_pool().connection() as conn:
+                    conn.execute(OFFSET_ARTICLES_SQL, (args.page_size, page * args.page_size)).fetchall()
+                offset_timings.append(time.perf_counter() - start)
+
+                start = time.perf_counter()
+                storage.get_saved_articles(limit=args.page_size, before=cursors[page])
+                keyset_timings.append(time.perf_counter() - start)
+            print(f"{page + 1:>8}{format_ms(percentile(offset_timings, 50)):>14}"
+                  f"{format_ms(percentile(keyset_timings, 50)):>14}")
+
+        storage.get_pool().close()
+
+
+# ==================== sidebar: 사이드바 통계 조회 ====================
+# 기존 사이드바가 rerun마다 실행하던 조회
+LEGACY_SIDEBAR_SQL = [
+    ('SELECT COUNT(*) FROM articles', ()),
+    (storage.SELECT_SEARCH_HISTORY_SQL, (5,)),
+    (storage.SELECT_LAST_COLLECTION_RUN_SQL, ()),
+    ('''SELECT
+        (SELECT COUNT(*) FROM notion_outbox WHERE next_attempt_at IS NOT NULL),
+        (SELECT COUNT(*) FROM notion_outbox WHERE next_attempt_at IS NULL),
+        (SELECT COUNT(*) FROM notion_synced)''', ()),
+]
+
+
+def bench_sidebar(args):
+    """테이블/로그 크기별 사이드바 rerun 비용 (전체 COUNT + 로그 전체 읽기 vs 요약 테이블 + 끝에서 읽기)"""
+    from collector import tail_lines
+
+    with tempfile.TemporaryDirectory() as tmp:
+        storage.configure(Path(tmp) / "sidebar.db")
+        storage.init_database()
+        log_path = Path(tmp) / "collection_log.txt"
+
+        print(f"{'rows':>10}{'log lines':>11}{'legacy p50':>13}{'miss p50':>11}{'hit p50':>10}")
+        rows = 0
+        for target in sorted({args.rows // 100, args.rows // 10, args.rows}):
+            # 저장 경로를 거치지 않고 바로 채움 (트리거로 요약 테이블은 함께 갱신됨)
+            with storage.get_pool().transaction() as conn:
+                conn.executemany(
+                    "INSERT INTO articles (title, link, keyword, published) VALUES (?, ?, ?, '')",
+                    ((f"기사 {i}", f"https://example.com/sidebar/{i}", f"키워드{i % 50}")
+                     for i in range(rows, target))
+                )
+                conn.executemany(
+                    "INSERT INTO notion_synced (link, page_id, synced_at) VALUES (?, 'p', 0)",
+                    ((f"https://example.com/sidebar/{i}",) for i in range(rows, target, 2))
+                )
+            storage.record_collection_run(time.time(), time.time(), [("AI", 20, 0, 20, 0, None)])
+            log_lines = target // 10
+            with open(log_path, "w", encoding="utf-8") as f:
+                f.writelines(f"[2025-01-01 09:00:00] 자동 기사 수집 완료: 신규 {i}건, 중복 0건\n"
+                             for i in range(log_lines))
+            rows = target
+
+            legacy, miss, hit = [], [], []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                with storage.get_pool().connection() as conn:
+                    for sql, params in LEGACY_SIDEBAR_SQL:
+                        conn.execute(sql, params).fetchall()
+                with open(log_path, "r", encoding="utf-8") as f:
+                    f.readlines()[-5:]
+                legacy.append(time.perf_counter() - start)
+
+                # 캐시 미스: 변경 번호 확인 후 요약 테이블/최근 기록 조회
+                start = time.perf_counter()
+                storage.table_versions()
+                storage.get_search_history(limit=5)
+                storage.get_article_stats()
+                storage.get_last_collection_run()
+                storage.notion_outbox_stats()
+                log_path.stat()
+                tail_lines(log_path, 5)
+                miss.append(time.perf_counter() - start)
+
+                # 캐시 적중: 변경 번호와 로그 파일 상태만 확인
+                start = time.perf_counter()
+                storage.table_versions()
+                log_path.stat()
+                hit.append(time.perf_counter() - start)
+
+            print(f"{rows:>10,}{log_lines:>11,}{format_ms(percentile(legacy, 50)):>13}"
+                  f"{format_ms(percentile(miss, 50)):>11}{format_ms(percentile(hit, 50)):>10}")
+
+        storage.get_pool().close()
+
+
+# ==================== spans: 구간 측정 비용 ====================
+def bench_spans(args):
+    """구간 측정 호출당 비용 (측정 없음 / 비활성화 / 활성화, 바깥 구간 안에서 호출)"""
+    import metrics
+
+    def plain():
+        pass
+
+    decorated = metrics.timed("bench")(plain)
+
+    def with_span():
+        with metrics.span("bench"):
+            pass
+
+    with tempfile.TemporaryDirectory() as tmp:
+        metrics.recorder.path = Path(tmp) / "metrics.jsonl"
+        print(f"{'case':<28}{'per call':>12}")
+        for enabled in (False, True):
+            metrics.recorder.enabled = enabled
+            cases = [("timed", decorated), ("span", with_span)] if enabled else \
+                [("plain", plain), ("timed", decorated), ("span", with_span)]
+            for name, func in cases:
+                with metrics.span("outer"):
+                    start = time.perf_counter()
+                    for _ in range(args.calls):
+                        func()
+                    elapsed = time.perf_counter() - start
+                label = name if name == "plain" else f"{name} ({'on' if enabled else 'off'})"
+                print(f"{label:<28}{elapsed / args.calls * 1e6:>10.2f} us")
+        metrics.recorder.flush()
+        metrics.recorder.path = metrics.METRICS_PATH
+
+
+# ==================== startup: 앱 콜드 스타트/rerun 비용 ====================
+# 첫 화면에서 import하지 않도록 옮긴 느린 모듈 (설치된 것만 측정)
+DEFERRED_MODULES = ("openai", "notion_client", "feedparser", "apscheduler.schedulers.background",
+                    "playwright.sync_api", "http.server")
+
+# Streamlit 실행 환경이 이미 import한 상태에서 측정 (앱 스크립트가 추가로 import하는 비용만 계산)
+STARTUP_BASELINE_IMPORTS = "import streamlit, pandas"
+
+STARTUP_RUN_SCRIPT = """
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file(sys.argv[1], default_timeout=120)
+start = time.perf_counter()
+at.run()
+first = time.perf_counter() - start
+reruns = []
+for _ in range(int(sys.argv[2])):
+    start = time.perf_counter()
+    at.run()
+    reruns.append(time.perf_counter() - start)
+print(json.dumps({"first": first, "reruns": reruns, "errors": len(at.exception) + len(at.error)}))
+"""
+
+
+def app_imports(app_path):
+    """앱 스크립트 최상위의 import 모듈 이름 (스크립트와 같은 순서)"""
+    import ast
+    modules = []
+    for node in ast.parse(Path(app_path).read_text(encoding="utf-8")).body:
+        if isinstance(node, ast.Import):
+            modules.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            modules.append(node.module)
+    return list(dict.fromkeys(modules))
+
+
+def import_times(modules, cwd, env):
+    """
+    기준 모듈(streamlit, pandas)을 import한 뒤 modules를 import하는 데 걸린 시간 (-X importtime)
+
+    Returns:
+        tuple: ({모듈: 누적 시간(초)}, 추가로 import된 모듈별 (이름, 자체 시간(초)) 리스트)
+    """
+    import subprocess
+    import sys
+    code = STARTUP_BASELINE_IMPORTS + "\n" + "\n".join(f"import {name}" for name in modules)
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=cwd, env=env,
+                            capture_output=True, text=True, check=True)
+    lines = [line for line in result.stderr.splitlines() if line.startswith("import time:")]
+    # 기준 모듈의 import가 끝난 줄 이후가 측정 대상 (자식 모듈이 부모보다 먼저 출력됨)
+    baseline_end = max(i for i, line in enumerate(lines)
+                       if line.rsplit("|", 1)[1].strip() in ("streamlit", "pandas"))
+    cumulative, nested = {}, []
+    for line in lines[baseline_end + 1:]:
+        own, total, name = line[len("import time:"):].split("|")
+        name = name.strip()
+        nested.append((name, int(own) / 1e6))
+        if name in modules:
+            cumulative[name] = int(total) / 1e6
+    return cumulative, nested
+
+
+def bench_startup(args):
+    """앱 스크립트의 import 비용(-X importtime), 첫 실행 시간과 rerun 시간 (AppTest)"""
+    import importlib.util
+    import json
+    import os
+    import subprocess
+    import sys
+
+    repo = Path(__file__).resolve().parent
+    app_path = repo / "app.py"
+    env = dict(os.environ, PYTHONPATH=str(repo))
+    env.setdefault("OPENAI_API_KEY", "benchmark")
+    env.pop("METRICS_PORT", None)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        modules = [name for name in app_imports(app_path) if name not in ("streamlit", "pandas")]
+        cumulative, nested = import_times(modules, tmp, env)
+        print(f"app.py imports (after {STARTUP_BASELINE_IMPORTS}): "
+              f"{sum(seconds for _, seconds in nested) * 1000:.1f} ms")
+        for name, seconds in sorted(nested, key=lambda item: item[1], reverse=True)[:args.top]:
+            print(f"  {name:<40}{format_ms(seconds)}")
+
+        print("\ndeferred modules (first use / background warm-up):")
+        for name in DEFERRED_MODULES:
+            if importlib.util.find_spec(name.split(".")[0]) is None:
+                print(f"  {name:<40}{'not installed':>11}")
+                continue
+            seconds = import_times([name], tmp, env)[0].get(name)
+            loaded = "" if seconds is not None else " (loaded by baseline)"
+            print(f"  {name:<40}{format_ms(seconds or 0)}{loaded}")
+
+        result = subprocess.run([sys.executable, "-c", STARTUP_RUN_SCRIPT, str(app_path), str(args.reruns)],
+                                cwd=tmp, env=env, capture_output=True, text=True, check=True)
+        runs = json.loads(result.stdout.strip().splitlines()[-1])
+
+    print(f"\nfirst run (cold process):  {format_ms(runs['first'])}")
+    if runs["reruns"]:
+        print(f"rerun p50 / p95:           {format_ms(percentile(runs['reruns'], 50))}"
+              f" / {format_ms(percentile(runs['reruns'], 95))}")
+    if runs["errors"]:
+        print(f"⚠️ app rendered {runs['errors']} error(s)")
+
+
+# ==================== querycache: 같은 검색 동시 요청 ====================
+def bench_querycache(args):
+    """같은 키워드를 동시에 검색할 때 상위 소스 호출 수와 응답 시간 (캐시 없음 vs 공유 캐시)"""
+    import query_cache
+    from concurrent.futures import ThreadPoolExecutor
+
+    def upstream(report=None):
+        # RSS 수집 + GPT 요약을 대신하는 고정 지연
+        calls.append(1)
+        time.sleep(args.latency)
+        return {'text': "요약", 'ok': True}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        storage.configure(Path(tmp) / "querycache.db")
+        storage.init_database()
+
+        print(f"{'case':<22}{'upstream calls':>16}{'p50':>12}{'p95':>12}")
+        for name, shared in (("no cache", None), ("memory", False), ("sqlite shared", True)):
+            calls = []
+            cache = query_cache.QueryCache(ttl=args.latency * 10, shared=bool(shared))
+
+            def request(i):
+                start = time.perf_counter()
+                if shared is None:
+                    upstream()
+                else:
+                    cache.get_or_compute(query_cache.query_key("model", f"키워드{i % args.keywords}"), upstream)
+                return time.perf_counter() - start
+
+            with ThreadPoolExecutor(max_workers=args.users) as executor:
+                latencies = list(executor.map(request, range(args.users)))
+            print(f"{name:<22}{len(calls):>16}{format_ms(percentile(latencies, 50)):>12}"
+                  f"{format_ms(percentile(latencies, 95)):>12}")
+
+        storage.get_pool().close()
+
+
+# ==================== parse: feedparser 전체 파싱 vs 스트리밍 파싱 ====================
+def synthetic_google_news_feed(keyword="AI", items=100):
+    """Google News RSS와 같은 구조의 피드 생성 (기사 100건, description에 HTML 포함)"""
+    from xml.sax.saxutils import escape
+    body = []
+    for i in range(items):
+        title = f"{keyword} 관련 기사 제목 {i} - 언론사{i % 7}"
+        link = f"https://news.google.com/rss/articles/CBMi{i:06d}AQAB?oc=5"
+        description = (f'<a href="{link}" target="_blank">{title}</a>'
+                       f'&nbsp;&nbsp;<font color="#6f6f6f">언론사{i % 7}</font>')
+        body.append(
+            f"<item><title>{escape(title)}</title><link>{link}</link>"
+            f'<guid isPermaLink="false">CBMi{i:06d}</guid>'
+            f"<pubDate>Mon, 06 Jan 2025 {i % 24:02d}:00:00 GMT</pubDate>"
+            f"<description>{escape(description)}</description>"
+            f'<source url="https://press{i % 7}.example.com">언론사{i % 7}</source></item>'
+        )
+    return (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<rss version="2.0" xmlns:media="http://search.yahoo.com/mrss/"><channel>'
+        f'<generator>NFE/5.0</generator><title>"{keyword}" - Google 뉴스</title>'
+        '<link>https://news.google.com/search?q=AI&amp;hl=ko&amp;gl=KR&amp;ceid=KR:ko</link>'
+        '<language>ko</language>'
+        + ''.join(body) +
+        '</channel></rss>'
+    ).encode('utf-8')
+
+
+def measure_parse(func, repeat):
+    """CPU 시간(호출당 평균)과 최대 메모리 사용량 측정"""
+    import tracemalloc
+    start = time.process_time()
+    for _ in range(repeat):
+        func()
+    cpu = (time.process_time() - start) / repeat
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return cpu, peak
+
+
+def bench_parse(args):
+    import io
+    import feeds
+
+    fixtures = {Path(path).name: Path(path).read_bytes() for path in args.fixture}
+    if not fixtures:
+        fixtures = {"synthetic-100": synthetic_google_news_feed()}
+
+    print(f"{'fixture':<20}{'path':<12}{'cpu/call':>14}{'peak mem':>12}")
+    for name, content in fixtures.items():
+        paths = {
+            'feedparser': lambda: feeds.parse_entries(content)[:args.max_results],
+            'streaming': lambda: feeds.stream_entries(io.BytesIO(content), args.max_results),
+        }
+        for path, func in paths.items():
+            cpu, peak = measure_parse(func, args.repeat)
+            print(f"{name:<20}{path:<12}{format_ms(cpu):>14}{peak / 1024:>9.0f} KB")
+
+
+# ==================== summary: 요약 스트리밍/캐시 ====================
+def start_fake_openai_server(tokens, token_delay, get_routes=None):
+    """
+    로컬 OpenAI 호환 서버 (Chat Completions, stream=True만 지원)
+
+    토큰 하나마다 token_delay초씩 기다리며 SSE 청크를 보냅니다.
+
+    Args:
+        tokens: 응답 토큰 수
+        token_delay: 토큰 사이 대기 시간(초)
+        get_routes: {경로: handler(쿼리 dict) -> (Content-Type, 본문 bytes)} (GET 고정 응답, 피드/HTML용)
+
+    Returns:
+        tuple: (서버, base_url, 요청 횟수를 담은 리스트)
+    """
+    import json
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    from urllib.parse import parse_qs, urlsplit
+
+    calls = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            parts = urlsplit(self.path)
+            route = (get_routes or {}).get(parts.path)
+            if route is None:
+                self.send_error(404)
+                return
+            content_type, body = route({k: v[0] for k, v in parse_qs(parts.query).items()})
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+            calls.append(body)
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.end_headers()
+            for i in range(tokens):
+                time.sleep(token_delay)
+                chunk = {
+                    "id": "bench", "object": "chat.completion.chunk", "created": 0, "model": body["model"],
+                    "choices": [{"index": 0, "delta": {"content": f" 토큰{i}"}, "finish_reason": None}],
+                }
+                self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+                self.wfile.flush()
+            self.wfile.write(b"data: [DONE]\n\n")
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/v1", calls
+
+
+def bench_summary(args):
+    from openai import OpenAI
+    import summarizer
+
+    server, base_url, calls = start_fake_openai_server(args.tokens, args.token_delay)
+    client = OpenAI(api_key="bench", base_url=base_url)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        storage.configure(Path(tmp) / "summary.db")
+        storage.init_database()
+        cache = summarizer.SummaryCache()
+
+        first_token, total, hit = [], [], []
+        for run in range(args.repeat):
+            articles = [sample_article(run * 5 + i) for i in range(5)]
+
+            start = time.perf_counter()
+            seen = []
+            summarizer.summarize(client, articles, "AI 뉴스", cache=cache,
+                                 on_delta=lambda text: seen.append(time.perf_counter() - start))
+            total.append(time.perf_counter() - start)
+            first_token.append(seen[0])
+
+            # 같은 기사 묶음 (순서만 다름)
+            start = time.perf_counter()
+            summarizer.summarize(client, list(reversed(articles)), "인공지능 기사", cache=cache)
+            hit.append(time.perf_counter() - start)
+
+        storage.get_pool().close()
+    server.shutdown()
+
+    print(f"토큰 {args.tokens}개 x {args.token_delay * 1000:.1f}ms, {args.repeat}회 (GPT 요청 {len(calls)}회)")
+    print(f"{'':<26}{'p50':>12}{'p95':>12}")
+    for name, values in (("첫 화면 표시 (스트리밍)", first_token),
+                         ("전체 응답 (기존 대기 시간)", total),
+                         ("캐시 적중", hit)):
+        print(f"{name:<26}{format_ms(percentile(values, 50)):>12}{format_ms(percentile(values, 95)):>12}")
+
+
+# ==================== notion: Notion 전송 재시도/대기열 ====================
+# 기사 링크의 시나리오별 응답 순서 (요청 횟수가 목록보다 많으면 마지막 응답 반복)
+NOTION_SCENARIOS = {
+    'ok': [200],
+    'rate_limited': [429, 200],
+    'server_error': [503, 500, 200],
+    'invalid': [400],
+    'lease_expired': [200],
+}
+
+# 오류 응답의 Notion 오류 코드
+NOTION_ERROR_CODES = {400: "validation_error", 429: "rate_limited", 500: "internal_server_error",
+                      503: "service_unavailable"}
+
+
+def notion_scenario(link):
+    """기사 링크(https://example.com/<시나리오>/<번호>)의 시나리오 이름"""
+    from urllib.parse import urlsplit
+    return urlsplit(link).path.split('/')[1]
+
+
+def start_fake_notion_server(scenarios, retry_after):
+    """
+    로컬 Notion API 서버 (POST /v1/pages만 지원)
+
+    기사 링크의 시나리오에 따라 정해진 순서로 응답합니다. (429 응답에는 Retry-After 헤더 포함)
+
+    Args:
+        scenarios: {시나리오 이름: 응답 상태 코드 목록}
+        retry_after: 429 응답의 Retry-After 값(초)
+
+    Returns:
+        tuple: (서버, base_url, {링크: 요청 시각(perf_counter) 리스트})
+    """
+    import json
+    from collections import defaultdict
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    requests = defaultdict(list)
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+            link = body['properties']['링크']['url']
+            with lock:
+                requests[link].append(time.perf_counter())
+                count = len(requests[link])
+            statuses = scenarios[notion_scenario(link)]
+            status = statuses[min(count, len(statuses)) - 1]
+            if status == 200:
+                payload = {"object": "page", "id": f"page-{count}-{link.rsplit('/', 1)[-1]}"}
+            else:
+                payload = {"object": "error", "status": status, "code": NOTION_ERROR_CODES[status],
+                           "message": f"bench {status}"}
+            data = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            if status == 429:
+                self.send_header("Retry-After", str(retry_after))
+            self.end_headers()
+            self.wfile.write(data)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}", requests
+
+
+def bench_notion(args):
+    """
+    NotionSyncWorker의 재시도/대기열 처리 확인 (로컬 가짜 Notion 서버, 기대와 다르면 종료 코드 1)
+
+    - 429: Retry-After만큼 기다린 뒤 재시도
+    - 5xx: 지수 백오프(RETRY_BASE_DELAY, 2배씩)로 재시도 후 전송
+    - 4xx: 재시도하지 않고 재시도 포기(next_attempt_at NULL)로 남김
+    - 다른 작업자가 예약만 하고 멈춘 항목: 예약 시간(lease)이 지나면 다시 전송
+    """
+    import metrics
+    import notion_sync
+
+    try:
+        from notion_client import Client
+    except ImportError:
+        print("notion-client 미설치: 건너뜀 (pip install notion-client)")
+        return
+
+    server, base_url, requests = start_fake_notion_server(NOTION_SCENARIOS, args.retry_after)
+    client = Client(auth="bench", base_url=base_url)
+
+    original_delay = notion_sync.RETRY_BASE_DELAY
+    original_lease = notion_sync.SYNC_LEASE_SECONDS
+    original_metrics_path = metrics.recorder.path
+    with tempfile.TemporaryDirectory() as tmp:
+        metrics.recorder.path = Path(tmp) / "metrics.jsonl"
+        storage.configure(Path(tmp) / "notion.db")
+        storage.init_database()
+        notion_sync.RETRY_BASE_DELAY = args.base_delay
+        notion_sync.SYNC_LEASE_SECONDS = args.lease
+        worker = None
+        try:
+            # 멈춘 작업자: lease_expired 항목을 먼저 넣고 예약만 한 뒤 전송하지 않음
+            started = time.perf_counter()
+            now = time.time()
+            storage.enqueue_notion([sample_article(i, 'lease_expired') for i in range(args.articles)],
+                                   'lease_expired', now - 1)
+            storage.claim_notion_batch(now, args.articles, args.lease)
+            for scenario in NOTION_SCENARIOS:
+                if scenario != 'lease_expired':
+                    storage.enqueue_notion([sample_article(i, scenario) for i in range(args.articles)],
+                                           scenario, now)
+
+            worker = notion_sync.NotionSyncWorker(client, "bench-database", rate=args.rate)
+            worker.start()
+            deadline = time.perf_counter() + args.timeout
+            while storage.notion_outbox_stats()[0] and time.perf_counter() < deadline:
+                time.sleep(0.05)
+            elapsed = time.perf_counter() - started
+
+            with storage.get_pool().connection() as conn:
+                synced = {row[0] for row in conn.execute("SELECT link FROM notion_synced")}
+                outbox = {row[0]: row[1:] for row in conn.execute(
+                    "SELECT link, attempts, next_attempt_at, last_error FROM notion_outbox")}
+        finally:
+            if worker is not None:
+                worker.stop()
+                worker.join(timeout=5)
+            storage.get_pool().close()
+            notion_sync.RETRY_BASE_DELAY = original_delay
+            notion_sync.SYNC_LEASE_SECONDS = original_lease
+            metrics.recorder.path = original_metrics_path
+            server.shutdown()
+
+    def gaps(link):
+        times = requests.get(link, [])
+        return [later - earlier for earlier, later in zip(times, times[1:])]
+
+    # 시나리오별 기대: (요청 수, 결과, 확인 함수, 기대 설명)
+    expectations = {
+        'ok': (1, 'synced', lambda link: True, "1회 전송"),
+        'rate_limited': (2, 'synced', lambda link: gaps(link)[0] >= args.retry_after * 0.9,
+                         f"Retry-After {args.retry_after}s 후 재시도"),
+        'server_error': (3, 'synced', lambda link: gaps(link)[0] >= args.base_delay * 0.9
+                         and gaps(link)[1] >= args.base_delay * 2 * 0.9,
+                         f"백오프 {args.base_delay}s, {args.base_delay * 2}s 후 재시도"),
+        'invalid': (1, 'dead', lambda link: '400' in (outbox[link][2] or ''), "재시도 없이 포기"),
+        'lease_expired': (1, 'synced', lambda link: requests[link][0] - started >= args.lease * 0.9,
+                          f"lease {args.lease}s 만료 후 전송"),
+    }
+
+    print(f"기사 {args.articles}건 x 시나리오 {len(NOTION_SCENARIOS)}개, 전체 처리 {elapsed:.2f}s "
+          f"(요청 {sum(len(times) for times in requests.values())}회, 속도 제한 초당 {args.rate})")
+    print(f"{'scenario':<16}{'requests':>9}{'result':>9}{'retry gaps':>22}  expected")
+    failed = False
+    for scenario, (expected_requests, expected_result, check, description) in expectations.items():
+        links = sorted(link for link in set(requests) | synced | set(outbox) if notion_scenario(link) == scenario)
+        problems = []
+        for link in links:
+            if link in synced:
+                result = 'synced'
+            elif link in outbox and outbox[link][1] is None:
+                result = 'dead'
+            else:
+                result = 'pending'
+            if len(requests.get(link, [])) != expected_requests or result != expected_result or not check(link):
+                problems.append(link)
+        if len(links) != args.articles:
+            problems.append(f"{len(links)}/{args.articles}건")
+        failed = failed or bool(problems)
+        sample = links[0] if links else None
+        gap_text = ", ".join(f"{gap * 1000:.0f}" for gap in gaps(sample)) + " ms" if sample and gaps(sample) else "-"
+        status = "FAIL" if problems else "ok"
+        print(f"{scenario:<16}{len(requests.get(sample, [])):>9}{expected_result:>9}{gap_text:>22}  "
+              f"[{status:>4}] {description}")
+        for problem in problems:
+            print(f"{'':<16}  기대와 다름: {problem}")
+
+    if failed:
+        raise SystemExit(1)
+
+
+# ==================== keywords: 검색 키워드 추출 ====================
+# 조사가 붙은 표현은 조사 제거 시 결과가 달라지는 것이 의도된 동작
+KEYWORD_QUERIES = [
+    '최신 AI 뉴스 알려줘', '삼성전자 기사', '오늘 뉴스 알려줘', '요즘 반도체 소식 알려주세요',
+    '최근 금리 인상 관련 보도', '테슬라 주가 뉴스 보여줘', '안녕하세요 오늘 날씨 뉴스',
+    '현재 인기 있는 뉴스', '우리 동네 소식 검색해줘', '파이썬 3.12 최신 기사',
+    '애플 WWDC 발표 뉴스 찾아줘', '손흥민 속보', '긴급 속보 알려줘', '뉴스',
+    '경제 정책에 대한 기사', 'K-POP 관련 최신 뉴스!', '정치 뉴스 뭐야?', '오늘의 증시 소식',
+    '삼성전자를 알려줘', '뉴스를 보여줘', 'AI를 검색해줘', '한국은행은 금리를 올렸나 뉴스',
+    '서울에서 열린 행사 소식', '애플에게 무슨 일이 있었나', '엔비디아는 요즘 어때', '최근 부산으로 이전한 기업 기사',
+    'OpenAI GPT-5 뉴스', '야구 뉴스 말해줘', '전기차 배터리 화재 기사 찾아줘', '비트코인 ETF 승인 소식',
+]
+
+
+def legacy_extract_search_keyword(user_input):
+    """기존 app.py의 키워드 추출 (단어마다 정규식 치환)"""
+    remove_words = [
+        '알려줘', '알려주세요', '찾아줘', '검색해줘', '보여줘', '해줄래', '해주세요',
+        '기사', '뉴스', '소식', '보도', '속보', '긴급',
+        '을', '를', '이', '가', '은', '는', '에', '서', '에게', '께', '로', '에서', '로부터', '에 대한', '의',
+        '거', '거지', '거가', '거네', '거라', '거야', '것', '네', '네요', '네길',
+        '고', '곤', '고야', '고말', '고들', '고곤', '일', '해', '해요',
+        '오늘', '어제', '요즘', '지금', '현재', '최신', '최근',
+        '많은', '인기', '인기있는', '인기많은',
+        '안녕', '안녕하세요', '반가워', '반갑습니다', '만나서',
+        '아', '어', '음', '어떻게', '어떤', '뭔지', '뭐야', '뭐지', '뭘', '뭐냐',
+        '서치', '조회', '검색', '찾기', '말해줘', '설명해줘', '안내', '정보',
+        '나', '날', '너', '우리', '우리가'
+    ]
+
+    keyword = user_input.strip()
+    for word in sorted(remove_words, key=len, reverse=True):
+        keyword = re.sub(rf'\b{re.escape(word)}\b', ' ', keyword, flags=re.IGNORECASE)
+    keyword = re.sub(r'[^가-힣a-zA-Z0-9\s]', '', keyword)
+    keyword = ' '.join(keyword.split()).strip()
+
+    if len(keyword) < 2:
+        original_words = user_input.split()
+        filtered_words = [w for w in original_words if len(w) >= 2 and w not in remove_words]
+        if filtered_words:
+            keyword = filtered_words[0]
+        else:
+            keyword = user_input
+
+    return keyword
+
+
+def bench_keywords(args):
+    """기존 방식과 결과가 같은지 확인하고 호출당 지연 비교 (결과가 다르면 종료 코드 1)"""
+    import query_parser
+
+    extract = query_parser.extract_search_keyword
+    mismatches = [(q, legacy_extract_search_keyword(q), extract(q, strip_particles=False))
+                  for q in KEYWORD_QUERIES
+                  if legacy_extract_search_keyword(q) != extract(q, strip_particles=False)]
+
+    def per_call(func):
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            for query in KEYWORD_QUERIES:
+                func(query)
+        return (time.perf_counter() - start) / (args.repeat * len(KEYWORD_QUERIES))
+
+    def uncached(query):
+        extract.cache_clear()
+        return extract(query)
+
+    results = {
+        'legacy': per_call(legacy_extract_search_keyword),
+        'compiled': per_call(uncached),
+        'cached': per_call(extract),
+    }
+
+    print(f"샘플 질문 {len(KEYWORD_QUERIES)}개 x {args.repeat}회")
+    for name, elapsed in results.items():
+        print(f"{name:<10}{elapsed * 1e6:>10.2f} us/call")
+    print(f"speedup   {results['legacy'] / results['compiled']:>10.1f}x (캐시 미사용)")
+
+    print("\n조사 제거로 달라지는 결과:")
+    for query in KEYWORD_QUERIES:
+        before, after = legacy_extract_search_keyword(query), extract(query)
+        if before != after:
+            print(f"  {query!r}: {before!r} -> {after!r}")
+
+    if mismatches:
+        print("\n기존 방식과 다른 결과 (strip_particles=False):")
+        for query, expected, actual in mismatches:
+            print(f"  {query!r}: {expected!r} != {actual!r}")
+        raise SystemExit(1)
+    print(f"\n기존 방식과 일치 (strip_particles=False): {len(KEYWORD_QUERIES)}/{len(KEYWORD_QUERIES)}")
+
+
+# ==================== intent: 기사 검색 의도 판단 ====================
+# (질문, 레이블) - 1: 기사 검색, 0: 일반 대화
+INTENT_SAMPLES = [
+    ('최신 AI 뉴스 알려줘', 1), ('삼성전자 기사', 1), ('오늘 뉴스 알려줘', 1), ('요즘 반도체 소식', 1),
+    ('최근 금리 인상 관련 보도', 1), ('테슬라 주가 뉴스', 1), ('언론에서 뭐래?', 1), ('신문 1면 내용', 1),
+    ('삼성전자 주가 어때', 1), ('코스피 오늘 어떻게 됐어', 1), ('환율 동향 정리해줘', 1),
+    ('엔비디아 실적 발표 결과', 1), ('대통령 기자회견 내용', 1), ('손흥민 경기 결과', 1),
+    ('비트코인 시세 어때', 1), ('부동산 정책 발표', 1), ('미국 대선 결과', 1), ('애플 신제품 발표했어?', 1),
+    ('오늘 증시 마감 상황', 1), ('전기차 배터리 화재 사고', 1), ('태풍 피해 상황', 1),
+    ('금리 동결 발표', 1), ('야구 한국시리즈 결과', 1), ('유가 급등 이유', 1),
+    ('안녕하세요', 0), ('파이썬 설명해줘', 0), ('오늘 날씨 어때?', 0), ('고마워', 0),
+    ('리스트 컴프리헨션 예시', 0), ('점심 메뉴 추천해줘', 0), ('너는 누구야', 0), ('재미있는 농담 해줘', 0),
+    ('영어 문장 번역해줘', 0), ('운동 루틴 짜줘', 0), ('SQL 조인 설명', 0), ('시 한 편 써줘', 0),
+    ('자기소개서 첨삭해줘', 0), ('파스타 레시피 알려줘', 0), ('여행 일정 추천', 0), ('반가워', 0),
+    ('주식 투자 기초 설명해줘', 0), ('금리가 뭐야', 0), ('비트코인 원리 설명', 0), ('경제 공부 방법', 0),
+    ('최신 노트북 추천해줘', 0), ('최근에 본 영화 추천', 0), ('기사 쓰는 법 알려줘', 0), ('뉴스레터 이름 지어줘', 0),
+]
+
+
+def legacy_check_news_search_intent(user_input):
+    """기존 app.py의 의도 판단 (세션 로그 기록 제외)"""
+    news_keywords = ['뉴스', '기사', '소식', '보도', '언론', '신문', '최신', '최근']
+    user_lower = user_input.lower()
+    for keyword in news_keywords:
+        if keyword in user_lower:
+            return True
+    return False
+
+
+def bench_intent(args):
+    """의도 판단 처리량과 레이블 데이터 정확도 (키워드만 / 키워드 + n-gram 모델 교차 검증)"""
+    import intent
+
+    samples = INTENT_SAMPLES
+    if args.samples:
+        samples = intent._read_samples(args.samples)
+    queries = [text for text, _ in samples]
+
+    def throughput(func):
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            for query in queries:
+                func(query)
+        return args.repeat * len(queries) / (time.perf_counter() - start)
+
+    keyword_only = intent.IntentClassifier()
+    scorer = intent.NgramScorer.train(samples)
+    with_model = intent.IntentClassifier(scorer)
+    results = {
+        'legacy': throughput(legacy_check_news_search_intent),
+        'regex': throughput(keyword_only._classify),
+        'regex+cache': throughput(keyword_only.classify),
+        'regex+model': throughput(with_model._classify),
+    }
+    print(f"질문 {len(queries)}개 x {args.repeat}회")
+    for name, per_second in results.items():
+        print(f"{name:<14}{per_second:>14,.0f} calls/s")
+
+    # 기존 방식과 키워드 판단 결과가 같아야 함
+    mismatches = [q for q in queries if legacy_check_news_search_intent(q) != keyword_only.classify(q)[0]]
+
+    # k-겹 교차 검증: 학습에 쓰지 않은 질문으로 모델 정확도 측정
+    rng = random.Random(0)
+    shuffled = samples[:]
+    rng.shuffle(shuffled)
+    keyword_correct = model_correct = 0
+    for fold in range(args.folds):
+        test = shuffled[fold::args.folds]
+        train = [sample for i, sample in enumerate(shuffled) if i % args.folds != fold]
+        classifier = intent.IntentClassifier(intent.NgramScorer.train(train))
+        for text, label in test:
+            keyword_correct += keyword_only.classify(text)[0] == bool(label)
+            model_correct += classifier.classify(text)[0] == bool(label)
+
+    print(f"\n정확도 ({args.folds}-겹 교차 검증, {len(samples)}개)")
+    print(f"{'키워드만':<14}{keyword_correct / len(samples):>10.1%}")
+    print(f"{'키워드+모델':<14}{model_correct / len(samples):>10.1%}")
+    print(f"모델 크기: n-gram {len(scorer.weights)}개")
+
+    if mismatches:
+        print(f"\n기존 방식과 다른 키워드 판단: {mismatches}")
+        raise SystemExit(1)
+
+
+# ==================== context: 대화 문맥 크기 ====================
+def bench_context(args):
+    """세션이 길어질 때 요청마다 보내는 대화 기록 크기와 준비 시간 (전체 전송 vs 토큰 예산)"""
+    import chat_context
+
+    rng = random.Random(0)
+    summary_calls = []
+
+    def summarize(previous_summary, dropped):
+        # GPT 대신 고정 길이 요약 (호출 횟수와 요약 요청 크기만 기록)
+        summary_calls.append(len(chat_context.format_for_summary(previous_summary, dropped)))
+        return "요약 " * 200
+
+    def payload_size(history):
+        return sum(len(m["content"].encode('utf-8')) for m in history)
+
+    context = chat_context.ChatContext(budget=args.budget)
+    messages = []
+    checkpoints = sorted({10, 50, 100, 200, args.turns} & set(range(1, args.turns + 1)))
+    print(f"토큰 예산 {args.budget}, 토큰 계산: {'tiktoken' if chat_context.TIKTOKEN_AVAILABLE else 'UTF-8 추정'}")
+    print(f"{'turns':>6}{'full KB':>10}{'full prep':>12}{'budget KB':>11}{'budget prep':>13}{'summaries':>11}"
+          f"{'last input':>12}")
+    for turn in range(1, args.turns + 1):
+        messages.append({"role": "user", "content": SEARCH_VOCABULARY[turn % len(SEARCH_VOCABULARY)] * rng.randint(3, 20)})
+
+        # 기존 방식: 매번 전체 기록 전송 (메시지 목록 복사 비용만 측정)
+        start = time.perf_counter()
+        full = [*messages]
+        full_prep = time.perf_counter() - start
+
+        # 앱과 같이 턴마다 세션 목록의 복사본을 전달 (대화 턴 작업의 인자)
+        start = time.perf_counter()
+        history = context.build(list(messages), summarize=summarize)
+        budget_prep = time.perf_counter() - start
+
+        messages.append({"role": "assistant", "content": "답변 내용입니다. " * rng.randint(20, 120)})
+        if turn in checkpoints:
+            print(f"{turn:>6}{payload_size(full) / 1024:>10.1f}{format_ms(full_prep):>12}"
+                  f"{payload_size(history) / 1024:>11.1f}{format_ms(budget_prep):>13}{len(summary_calls):>11}"
+                  f"{(summary_calls[-1] if summary_calls else 0):>12,}")
+
+
+# ==================== dedup: URL 정규화/비슷한 기사 클러스터 ====================
+DEDUP_OUTLETS = ['연합뉴스', '한국경제', '매일경제', '조선일보', '중앙일보', '동아일보', 'KBS', 'SBS']
+
+
+def syndicated_articles(stories, outlets, seed=0):
+    """
+    같은 소식을 여러 언론사가 조금씩 다른 표기로 낸 기사와 추적 파라미터가 붙은 재수집 링크 생성
+
+    Yields:
+        tuple: (소식 번호, 기사 dict)
+    """
+    rng = random.Random(seed)
+    for story in range(stories):
+        words = [rng.choice(SEARCH_VOCABULARY) for _ in range(5)] + [f"{rng.randint(1, 99)}%"]
+        for outlet in rng.sample(DEDUP_OUTLETS, outlets):
+            # 언론사마다 구두점/띄어쓰기만 다른 제목
+            title = rng.choice([' ', ', ', '…', ' · ']).join(words)
+            link = f"https://{outlet.lower()}.example.com/news/{story}"
+            yield story, {'title': f"{title} - {outlet}", 'link': link,
+                          'published': "Mon, 06 Jan 2025 09:00:00 GMT", 'summary': ''}
+            # 같은 기사를 추적 파라미터가 붙은 링크로 다시 수집
+            if rng.random() < 0.3:
+                yield story, {'title': f"{title} - {outlet}", 'link': f"{link}?utm_source=rss&fbclid={rng.random()}",
+                              'published': "Mon, 06 Jan 2025 09:00:00 GMT", 'summary': ''}
+
+
+def bench_dedup(args):
+    """저장 시 정규화 URL 중복 제거와 SimHash 클러스터 정확도, 저장 비용"""
+    import dedup
+
+    items = list(syndicated_articles(args.stories, args.outlets))
+    story_of = {article['link']: story for story, article in items}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        storage.configure(Path(tmp) / "dedup.db")
+        storage.init_database()
+
+        start = time.perf_counter()
+        inserted = 0
+        for i in range(0, len(items), 50):
+            inserted += storage.save_articles([article for _, article in items[i:i + 50]], "AI")[0]
+        elapsed = time.perf_counter() - start
+
+        with storage.get_pool().connection() as conn:
+            rows = conn.execute('SELECT id, link, COALESCE(cluster_id, id) FROM articles').fetchall()
+        storage.get_pool().close()
+
+    clusters = {}
+    for article_id, link, cluster_id in rows:
+        clusters.setdefault(cluster_id, set()).add(story_of[link])
+    mixed = sum(1 for stories in clusters.values() if len(stories) > 1)
+
+    print(f"소식 {args.stories}개 x 언론사 {args.outlets}곳, 수집 기사 {len(items)}건")
+    print(f"저장 {inserted}건 (정규화 URL 중복 {len(items) - inserted}건 제외), 저장 {format_ms(elapsed / len(items))}/건")
+    print(f"클러스터 {len(clusters)}개 (이상적: {args.stories}개), 서로 다른 소식이 섞인 클러스터 {mixed}개")
+
+    # 검색 결과 10건 중 GPT에 보낼 대표 기사 수
+    sample = [article for _, article in items[:10]]
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        representatives = dedup.pick_representatives(sample)
+    per_call = (time.perf_counter() - start) / args.repeat
+    print(f"검색 결과 {len(sample)}건 → 요약 대상 {len(representatives)}건 "
+          f"(소식 {len({story_of[a['link']] for a in sample})}개), {format_ms(per_call)}/회")
+
+
+# ==================== suite: 고정 응답으로 전체 파이프라인 측정 ====================
+# 녹화한 피드/HTML 위치 (rss/<키워드>.xml, naver/<키워드>.html, 파일 이름은 URL 인코딩된 키워드)
+FIXTURES_DIR = Path(__file__).resolve().parent / "benchmark_fixtures"
+
+SUITE_KEYWORDS = ['AI', '경제', '삼성전자']
+SUITE_QUERIES = ['최신 AI 뉴스 알려줘', '오늘 경제 기사', '삼성전자 반도체 소식 알려주세요']
+
+# 고정 응답 서버의 경로
+STUB_RSS_PATH = "/rss/search"
+STUB_NAVER_PATH = "/naver/search"
+
+
+def synthetic_naver_html(keyword="AI", items=10):
+    """네이버 뉴스 검색 결과와 같은 구조(div.news_area)의 HTML 생성"""
+    from html import escape
+    body = []
+    for i in range(items):
+        title = escape(f"{keyword} 관련 네이버 기사 {i}")
+        body.append(
+            f'<div class="news_area"><a class="news_tit" href="https://n.news.naver.com/mnews/article/00{i % 9}/{i:010d}"'
+            f' title="{title}">{title}</a><div class="news_dsc">{escape(keyword)} 기사 요약 {i}</div>'
+            f'<span class="info">{i + 1}시간 전</span></div>'
+        )
+    return f'<html><head><meta charset="utf-8"></head><body>{"".join(body)}</body></html>'.encode('utf-8')
+
+
+def load_fixtures(directory):
+    """
+    녹화한 피드/HTML 읽기
+
+    Returns:
+        dict: {'rss': {키워드: bytes}, 'naver': {키워드: bytes}} (녹화가 없으면 빈 dict)
+    """
+    from urllib.parse import unquote
+    fixtures = {'rss': {}, 'naver': {}}
+    for kind, suffix in (('rss', '.xml'), ('naver', '.html')):
+        for path in sorted((Path(directory) / kind).glob(f"*{suffix}")):
+            fixtures[kind][unquote(path.stem)] = path.read_bytes()
+    return fixtures
+
+
+def fixture_routes(fixtures):
+    """고정 응답 서버의 GET 경로 (녹화가 없는 키워드는 녹화 중 하나, 녹화가 없으면 합성 응답)"""
+    def pick(kind, keyword, synthesize):
+        recorded = fixtures[kind]
+        if keyword in recorded:
+            return recorded[keyword]
+        if recorded:
+            return recorded[sorted(recorded)[hash(keyword) % len(recorded)]]
+        return synthesize(keyword)
+
+    return {
+        STUB_RSS_PATH: lambda query: (
+            "application/rss+xml; charset=utf-8",
+            pick('rss', query.get('q', ''), synthetic_google_news_feed),
+        ),
+        STUB_NAVER_PATH: lambda query: (
+            "text/html; charset=utf-8",
+            pick('naver', query.get('query', ''), synthetic_naver_html),
+        ),
+    }
+
+
+def check_fixtures(fixtures, naver_url_template):
+    """
+    녹화한 피드/HTML에서 기사를 읽을 수 있는지 확인 (스트리밍 파서, 네이버 스크래퍼)
+
+    실제 응답의 구조가 바뀌어 기사를 하나도 읽지 못하면 측정값이 의미 없으므로 중단합니다.
+    (네이버 HTML은 Playwright가 설치된 경우에만 확인)
+    """
+    import io
+
+    import crawler
+    import feeds
+
+    failures = []
+    for keyword, content in fixtures['rss'].items():
+        articles, _ = feeds.stream_entries(io.BytesIO(content), 5)
+        print(f"{'rss':<6}{keyword:<12}기사 {len(articles)}건")
+        if not any(article['title'] and article['link'] for article in articles):
+            failures.append(f"rss/{keyword}")
+    if crawler.PLAYWRIGHT_AVAILABLE:
+        for keyword in fixtures['naver']:
+            articles = crawler.fetch_naver_news(keyword, max_results=5, url_template=naver_url_template)
+            print(f"{'naver':<6}{keyword:<12}기사 {len(articles)}건")
+            if not articles:
+                failures.append(f"naver/{keyword}")
+    if failures:
+        print(f"녹화한 응답에서 기사를 읽지 못함: {', '.join(failures)}")
+        raise SystemExit(1)
+
+
+def bench_record(args):
+    """실제 Google News RSS와 네이버 뉴스 검색 결과를 고정 응답으로 저장"""
+    import feeds
+    import crawler
+    from urllib.parse import quote
+
+    directory = Path(args.fixtures)
+    for kind in ('rss', 'naver'):
+        (directory / kind).mkdir(parents=True, exist_ok=True)
+
+    for keyword in args.keywords.split(','):
+        keyword = keyword.strip()
+        name = quote(keyword, safe='')
+        targets = (('rss', '.xml', feeds.build_rss_url(keyword)),
+                   ('naver', '.html', crawler.NAVER_NEWS_SEARCH_URL.format(query=quote(keyword))))
+        for kind, suffix, url in targets:
+            try:
+                with feeds.open_url(url, timeout=args.timeout) as response:
+                    content = response.read()
+            except Exception as e:
+                print(f"{kind:<6}{keyword:<12}실패: {type(e).__name__}: {e}")
+                continue
+            (directory / kind / f"{name}{suffix}").write_bytes(content)
+            print(f"{kind:<6}{keyword:<12}{len(content) / 1024:8.1f} KB")
+
+
+def timing_result(name, timings, scale=None, **extra):
+    """측정값 목록을 결과 항목으로 변환 (단위: ms)"""
+    return {
+        'name': name,
+        'scale': scale,
+        'n': len(timings),
+        'p50_ms': round(percentile(timings, 50) * 1000, 4),
+        'p95_ms': round(percentile(timings, 95) * 1000, 4),
+        'mean_ms': round(statistics.mean(timings) * 1000, 4),
+        **extra,
+    }
+
+
+def time_calls(func, repeat, setup=None):
+    """func()를 repeat번 호출한 각 지연 시간(초) (setup()은 호출마다 측정 전에 실행)"""
+    timings = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def seed_suite_articles(start, stop):
+    """기사 테이블을 stop건까지 채움 (저장 경로의 중복 판별은 거치지 않고 색인/통계 트리거만 실행)"""
+    rows = []
+    base_time = 1_700_000_000
+    for i, article in enumerate(synthetic_articles(stop - start, seed=start), start):
+        rows.append((
+            article['title'], f"https://example.com/suite/{i}", SUITE_KEYWORDS[i % len(SUITE_KEYWORDS)],
+            article['published'], storage.normalize_published(article['published']), article['summary'],
+            storage.to_search_text(article['title']), storage.to_search_text(article['summary']),
+            f"https://example.com/suite/{i}",
+            time.strftime(storage.TIMESTAMP_FORMAT, time.gmtime(base_time + i)),
+        ))
+        if len(rows) == 10000 or i == stop - 1:
+            with storage.get_pool().transaction() as conn:
+                conn.executemany(
+                    "INSERT INTO articles (title, link, keyword, published, published_at, summary, "
+                    "search_title, search_summary, canonical_link, saved_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    rows
+                )
+            rows = []
+
+
+def run_storage_suite(scale, repeat):
+    """기사 scale건 규모에서 SQLite 조회/저장 함수 측정"""
+    with storage.get_pool().connection() as conn:
+        middle = conn.execute(
+            "SELECT saved_at, id FROM articles ORDER BY saved_at DESC, id DESC LIMIT 1 OFFSET ?", (scale // 2,)
+        ).fetchone()
+
+    batches = iter(range(10 ** 9))
+
+    def save_batch():
+        batch = next(batches)
+        storage.save_articles([sample_article(f"suite-{scale}-{batch}-{i}") for i in range(20)], "AI")
+
+    cases = [
+        ("storage.get_saved_articles(first)", lambda: storage.get_saved_articles(limit=20)),
+        ("storage.get_saved_articles(keyword)", lambda: storage.get_saved_articles(keyword="AI", limit=20)),
+        ("storage.get_saved_articles(middle)", lambda: storage.get_saved_articles(limit=20, before=tuple(middle))),
+        ("storage.search_saved_articles", lambda: storage.search_saved_articles("삼성전자 반도체", limit=20)),
+        ("storage.count_articles", storage.count_articles),
+        ("storage.get_article_stats", storage.get_article_stats),
+        ("storage.get_search_history", lambda: storage.get_search_history(limit=5)),
+        ("storage.table_versions", storage.table_versions),
+        ("storage.save_articles(20)", save_batch),
+    ]
+    return [timing_result(name, time_calls(func, repeat), scale=scale) for name, func in cases]
+
+
+def git_revision():
+    """이 스크립트가 있는 저장소의 현재 커밋 (git 저장소가 아니면 None)과 수정 사항 여부"""
+    import subprocess
+    repo = Path(__file__).resolve().parent
+    try:
+        revision = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                                  check=True, cwd=repo).stdout.strip()
+        dirty = bool(subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"],
+                                    capture_output=True, text=True, check=True, cwd=repo).stdout.strip())
+        return revision, dirty
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+
+
+def bench_suite(args):
+    """
+    외부 서비스 없이 전체 파이프라인 측정 후 JSON으로 저장
+
+    Google News/네이버/GMS 대신 로컬 고정 응답 서버를 사용하므로 커밋별 결과를 비교할 수 있습니다.
+    피드/검색 결과는 benchmark_fixtures/의 응답(저장소에는 AI 키워드 하나, 다른 키워드도 이 응답을 사용)으로,
+    GPT 응답은 고정 토큰으로 측정하며, 측정 전에 응답에서 기사를 읽을 수 있는지 확인합니다. (check_fixtures)
+    사용한 응답의 키워드는 결과 JSON의 meta.fixtures에 기록되므로, 응답이 다른 결과(합성 응답 포함)끼리는 비교하지 마세요.
+    """
+    import json
+    import platform
+
+    from openai import OpenAI
+
+    import collector
+    import crawler
+    import feeds
+    import intent
+    import metrics
+    import news_pipeline
+    import news_search
+    import query_parser
+    import summarizer
+
+    fixtures = load_fixtures(args.fixtures)
+    server, base_url, calls = start_fake_openai_server(args.tokens, args.token_delay,
+                                                       get_routes=fixture_routes(fixtures))
+    stub_root = base_url[:-len("/v1")]
+    try:
+        check_fixtures(fixtures, stub_root + STUB_NAVER_PATH + "?query={query}")
+    except SystemExit:
+        server.shutdown()
+        raise
+    client = OpenAI(api_key="bench", base_url=base_url)
+    scales = sorted(int(scale) for scale in args.scales.split(','))
+
+    original_rss_url = feeds.GOOGLE_NEWS_RSS_URL
+    original_log_path = collector.COLLECTION_LOG_PATH
+    original_metrics_path = metrics.recorder.path
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        feeds.GOOGLE_NEWS_RSS_URL = stub_root + STUB_RSS_PATH + "?q={query}"
+        collector.COLLECTION_LOG_PATH = Path(tmp) / "collection_log.txt"
+        metrics.recorder.path = Path(tmp) / "metrics.jsonl"
+        storage.configure(Path(tmp) / "suite.db")
+        storage.init_database()
+        try:
+            # 입력 처리 (CPU만 사용, 결과 캐시를 거치지 않은 값)
+            queries = SUITE_QUERIES + [text for text, _ in INTENT_SAMPLES]
+            results.append(timing_result(
+                "query_parser.extract_search_keyword",
+                [t for q in queries for t in time_calls(lambda: query_parser.extract_search_keyword.__wrapped__(q), 1)]
+            ))
+            classifier = intent.IntentClassifier()
+            results.append(timing_result(
+                "check_news_search_intent",
+                [t for q in queries for t in time_calls(lambda: classifier._classify(q), 1)]
+            ))
+
+            # 기사 수집 (고정 응답 서버)
+            keyword = SUITE_KEYWORDS[0]
+
+            def clear_feed_cache():
+                with storage.get_pool().transaction() as conn:
+                    conn.execute("DELETE FROM feed_cache")
+
+            results.append(timing_result(
+                "feeds.fetch_feed(network)",
+                time_calls(lambda: feeds.fetch_feed(keyword, max_results=5, use_cache=False), args.repeat)
+            ))
+            feeds.fetch_feed(keyword, max_results=5)
+            results.append(timing_result(
+                "feeds.fetch_feed(cached)", time_calls(lambda: feeds.fetch_feed(keyword, max_results=5), args.repeat)
+            ))
+            results.append(timing_result("news_search.gather_articles", time_calls(
+                lambda: news_search.gather_articles(keyword, SUITE_QUERIES[0], max_results=5),
+                args.repeat, setup=clear_feed_cache
+            )))
+            if crawler.PLAYWRIGHT_AVAILABLE:
+                results.append(timing_result("crawler.fetch_naver_news", time_calls(
+                    lambda: crawler.fetch_naver_news(
+                        keyword, max_results=5, url_template=stub_root + STUB_NAVER_PATH + "?query={query}"),
+                    args.repeat
+                )))
+            else:
+                results.append({'name': "crawler.fetch_naver_news", 'scale': None, 'skipped': "playwright 미설치"})
+
+            # 저장 + Notion 대기열 + GPT 요약 (앱과 같은 news_pipeline, 캐시 미스 / 같은 기사 묶음 캐시 적중)
+            batches = iter(range(10 ** 9))
+
+            def summarize_suite_articles(articles, cache):
+                text, ok = news_pipeline.summarize_articles(client, articles, SUITE_QUERIES[0], keyword=keyword,
+                                                            notion_enabled=True, cache=cache)
+                if not ok:
+                    raise RuntimeError(text)
+
+            def summarize_new_batch(cache):
+                batch = next(batches)
+                articles = [sample_article(f"summary-{batch}-{i}") for i in range(5)]
+                summarize_suite_articles(articles, cache)
+
+            results.append(timing_result("summarize_articles(miss)",
+                                         time_calls(lambda: summarize_new_batch(None), args.repeat)))
+            cache = summarizer.SummaryCache()
+            cached_articles = [sample_article(f"summary-cached-{i}") for i in range(5)]
+            summarize_suite_articles(cached_articles, cache)
+            results.append(timing_result("summarize_articles(cache hit)", time_calls(
+                lambda: summarize_suite_articles(cached_articles, cache),
+                args.repeat
+            )))
+
+            # 정시 수집 (처음: 수집 위치 없음, 이후: 수집 위치 이후 기사만, 둘 다 피드 캐시 없이)
+            def collect():
+                if not collector.collect_news():
+                    raise RuntimeError(collector.read_log_tail(1))
+
+            def reset_collection():
+                clear_feed_cache()
+                with storage.get_pool().transaction() as conn:
+                    conn.execute("DELETE FROM collect_cursors")
+
+            collect_repeat = max(1, args.repeat // 4)
+            results.append(timing_result("auto_collect_news(first)",
+                                         time_calls(collect, collect_repeat, setup=reset_collection)))
+            results.append(timing_result("auto_collect_news(incremental)",
+                                         time_calls(collect, collect_repeat, setup=clear_feed_cache)))
+
+            # SQLite 조회/저장 (규모별)
+            seeded = storage.count_articles()
+            for scale in scales:
+                if scale > seeded:
+                    start = time.perf_counter()
+                    seed_suite_articles(seeded, scale)
+                    print(f"기사 {scale:,}건까지 채움: {time.perf_counter() - start:.1f}s")
+                    seeded = storage.count_articles()
+                results.extend(run_storage_suite(scale, args.repeat))
+        finally:
+            storage.get_pool().close()
+            feeds.GOOGLE_NEWS_RSS_URL = original_rss_url
+            collector.COLLECTION_LOG_PATH = original_log_path
+            metrics.recorder.path = original_metrics_path
+            server.shutdown()
+
+    revision, dirty = git_revision()
+    report = {
+        'meta': {
+            'revision': revision,
+            'dirty': dirty,
+            'created_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            'python': platform.python_version(),
+            'sqlite': sqlite3.sqlite_version,
+            'platform': platform.platform(),
+            'fixtures': {kind: sorted(recorded) or 'synthetic' for kind, recorded in fixtures.items()},
+            'params': {'scales': scales, 'repeat': args.repeat, 'tokens': args.tokens,
+                       'token_delay': args.token_delay},
+            'gpt_requests': len(calls),
+        },
+        'results': results,
+    }
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding='utf-8')
+        print(f"결과 저장: {args.output}")
+
+    print(f"{'benchmark':<40}{'scale':>10}{'p50':>14}{'p95':>14}")
+    for result in results:
+        scale = f"{result['scale']:,}" if result['scale'] else ''
+        if 'skipped' in result:
+            print(f"{result['name']:<40}{scale:>10}  건너뜀 ({result['skipped']})")
+            continue
+        print(f"{result['name']:<40}{scale:>10}{result['p50_ms']:>11.3f} ms{result['p95_ms']:>11.3f} ms")
+
+
+
+def bench_compare(args):
+    """
+    두 suite 결과의 p50 비교 (기준보다 threshold 비율 이상 느려진 항목이 있으면 종료 코드 1)
+    """
+    import json
+
+    base, new = (json.loads(Path(path).read_text(encoding='utf-8')) for path in (args.base, args.new))
+    base_results = {(r['name'], r['scale']): r for r in base['results'] if 'skipped' not in r}
+
+    print(f"기준 {base['meta'].get('revision') or args.base} → 비교 {new['meta'].get('revision') or args.new}")
+    print(f"{'benchmark':<40}{'scale':>10}{'base p50':>12}{'new p50':>12}{'change':>9}")
+    regressions = 0
+    for result in new['results']:
+        key = (result['name'], result['scale'])
+        if 'skipped' in result or key not in base_results:
+            continue
+        before, after = base_results[key]['p50_ms'], result['p50_ms']
+        change = (after - before) / before if before else 0.0
+        flag = ''
+        if change > args.threshold and after - before > args.min_delta_ms:
+            flag = '  ▲ 느려짐'
+            regressions += 1
+        scale = f"{result['scale']:,}" if result['scale'] else ''
+        print(f"{result['name']:<40}{scale:>10}{before:>9.3f} ms{after:>9.3f} ms{change:>+8.0%}{flag}")
+
+    print(f"느려진 항목 {regressions}개 (기준: p50 {args.threshold:.0%} 이상, {args.min_delta_ms} ms 이상 증가)")
+    if regressions:
+        raise SystemExit(1)
+
+
+# ==================== plans: 쿼리 플랜 회귀 점검 ====================
+def bench_plans(args):
+    """모든 등록 쿼리가 인덱스를 타는지 확인 (문제가 있으면 종료 코드 1)"""
+    with tempfile.TemporaryDirectory() as tmp:
+        storage.configure(Path(tmp) / "plans.db")
+        storage.init_database()
+        storage.save_articles([sample_article(i) for i in range(args.seed_rows)], "AI")
+        results = storage.explain_query_plans()
+        storage.get_pool().close()
+
+    failed = False
+    for name, details, problems in results:
+        status = "FAIL" if problems else "ok"
+        failed = failed or bool(problems)
+        print(f"[{status:>4}] {name}")
+        for detail in details:
+            print(f"         {detail}")
+
+    if failed:
+        raise SystemExit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="뉴스 챗봇 성능 측정")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    p = subparsers.add_parser("storage", help="커넥션 풀/WAL 효과 측정 (UI rerun + 스케줄러 동시 실행)")
+    p.add_argument("--reruns", type=int, default=200)
+    p.add_argument("--seed-rows", type=int, default=5000)
+    p.add_argument("--scheduler-batches", type=int, default=20)
+    p.set_defaults(func=bench_storage)
+
+    p = subparsers.add_parser("ingest", help="기사 단건 저장 vs save_articles 배치 저장")
+    p.add_argument("--keywords", type=int, default=5)
+    p.add_argument("--per-keyword", type=int, default=20)
+    p.add_argument("--runs", type=int, default=20)
+    p.set_defaults(func=bench_ingest)
+
+    p = subparsers.add_parser("search", help="FTS5 전문 검색 지연 측정")
+    p.add_argument("--rows", type=int, default=100000)
+    p.add_argument("--limit", type=int, default=20)
+    p.add_argument("--repeat", type=int, default=20)
+    p.set_defaults(func=bench_search)
+
+    p = subparsers.add_parser("pages", help="저장된 기사 페이지 위치별 조회 지연 (OFFSET vs 키셋)")
+    p.add_argument("--rows", type=int, default=100000)
+    p.add_argument("--page-size", type=int, default=20)
+    p.add_argument("--repeat", type=int, default=20)
+    p.set_defaults(func=bench_pages)
+
+    p = subparsers.add_parser("sidebar", help="테이블/로그 크기별 사이드바 rerun 조회 비용 (전체 COUNT vs 요약 테이블)")
+    p.add_argument("--rows", type=int, default=200000)
+    p.add_argument("--repeat", type=int, default=50)
+    p.set_defaults(func=bench_sidebar)
+
+    p = subparsers.add_parser("spans", help="구간 측정(span/timed) 호출당 비용 (비활성화 vs 활성화)")
+    p.add_argument("--calls", type=int, default=100000)
+    p.set_defaults(func=bench_spans)
+
+    p = subparsers.add_parser("startup", help="앱 콜드 스타트 import 비용(-X importtime)과 첫 실행/rerun 시간")
+    p.add_argument("--reruns", type=int, default=20)
+    p.add_argument("--top", type=int, default=15, help="자체 import 시간이 큰 모듈 표시 수")
+    p.set_defaults(func=bench_startup)
+
+    p = subparsers.add_parser("querycache", help="같은 키워드 동시 검색의 상위 소스 호출 수 (캐시 없음 vs 검색 결과 공유)")
+    p.add_argument("--users", type=int, default=50, help="동시에 검색하는 사용자 수")
+    p.add_argument("--keywords", type=int, default=2, help="서로 다른 키워드 수")
+    p.add_argument("--latency", type=float, default=0.5, help="검색 + 요약 한 번의 지연(초)")
+    p.set_defaults(func=bench_querycache)
+
+    p = subparsers.add_parser("parse", help="feedparser 전체 파싱 vs 스트리밍 파싱 (CPU/메모리)")
+    p.add_argument("--fixture", action="append", default=[],
+                   help="저장해 둔 RSS 파일 경로 (여러 번 지정 가능, 없으면 합성 피드 사용)")
+    p.add_argument("--max-results", type=int, default=5)
+    p.add_argument("--repeat", type=int, default=50)
+    p.set_defaults(func=bench_parse)
+
+    p = subparsers.add_parser("plans", help="EXPLAIN QUERY PLAN 회귀 점검")
+    p.add_argument("--seed-rows", type=int, default=1000)
+    p.set_defaults(func=bench_plans)
+
+    p = subparsers.add_parser("summary", help="요약 스트리밍 첫 표시 시간과 요약 캐시 적중 지연 (로컬 가짜 OpenAI 서버)")
+    p.add_argument("--tokens", type=int, default=300)
+    p.add_argument("--token-delay", type=float, default=0.005)
+    p.add_argument("--repeat", type=int, default=10)
+    p.set_defaults(func=bench_summary)
+
+    p = subparsers.add_parser("notion", help="Notion 전송 재시도/대기열 처리 확인 (로컬 가짜 Notion 서버)")
+    p.add_argument("--articles", type=int, default=3, help="시나리오별 기사 수")
+    p.add_argument("--retry-after", type=float, default=0.5, help="429 응답의 Retry-After(초)")
+    p.add_argument("--base-delay", type=float, default=0.2, help="재시도 첫 대기 시간(초)")
+    p.add_argument("--lease", type=float, default=1.0, help="대기열 항목 예약 시간(초)")
+    p.add_argument("--rate", type=float, default=20.0, help="초당 최대 요청 수")
+    p.add_argument("--timeout", type=float, default=30.0, help="전체 처리 최대 대기 시간(초)")
+    p.set_defaults(func=bench_notion)
+
+    p = subparsers.add_parser("keywords", help="검색 키워드 추출 지연과 기존 방식과의 결과 일치 확인")
+    p.add_argument("--repeat", type=int, default=200)
+    p.set_defaults(func=bench_keywords)
+
+    p = subparsers.add_parser("intent", help="의도 판단 처리량과 레이블 데이터 정확도")
+    p.add_argument("--samples", help="'레이블<TAB>질문' 형식의 TSV (없으면 내장 샘플 사용)")
+    p.add_argument("--folds", type=int, default=5)
+    p.add_argument("--repeat", type=int, default=2000)
+    p.set_defaults(func=bench_intent)
+
+    p = subparsers.add_parser("context", help="세션 길이에 따른 대화 기록 전송 크기 (전체 vs 토큰 예산)")
+    p.add_argument("--turns", type=int, default=500)
+    p.add_argument("--budget", type=int, default=8000)
+    p.set_defaults(func=bench_context)
+
+    p = subparsers.add_parser("suite", help="고정 응답 서버로 전체 파이프라인 측정 (커밋별 비교용 JSON 저장)")
+    p.add_argument("--scales", default="1000,100000", help="기사 수 규모 (쉼표 구분, 예: 1000,100000,1000000)")
+    p.add_argument("--repeat", type=int, default=20)
+    p.add_argument("--fixtures", default=str(FIXTURES_DIR), help="녹화한 피드/HTML 위치 (없으면 합성 응답)")
+    p.add_argument("--tokens", type=int, default=200, help="GPT 스텁 응답 토큰 수")
+    p.add_argument("--token-delay", type=float, default=0.0, help="GPT 스텁 토큰 간격(초)")
+    p.add_argument("--output", help="결과 JSON 경로")
+    p.set_defaults(func=bench_suite)
+
+    p = subparsers.add_parser("record", help="실제 Google News RSS/네이버 검색 결과를 고정 응답으로 저장")
+    p.add_argument("--keywords", default=",".join(SUITE_KEYWORDS))
+    p.add_argument("--fixtures", default=str(FIXTURES_DIR))
+    p.add_argument("--timeout", type=float, default=10)
+    p.set_defaults(func=bench_record)
+
+    p = subparsers.add_parser("compare", help="두 suite 결과 JSON의 p50 비교 (느려진 항목이 있으면 종료 코드 1)")
+    p.add_argument("base")
+    p.add_argument("new")
+    p.add_argument("--threshold", type=float, default=0.2, help="느려짐으로 볼 p50 증가 비율")
+    p.add_argument("--min-delta-ms", type=float, default=0.05, help="이보다 작은 증가는 무시(ms)")
+    p.set_defaults(func=bench_compare)
+
+    p = subparsers.add_parser("dedup", help="URL 정규화/비슷한 기사 클러스터 정확도와 저장 비용")
+    p.add_argument("--stories", type=int, default=2000)
+    p.add_argument("--outlets", type=int, default=4)
+    p.add_argument("--repeat", type=int, default=200)
+    p.set_defaults(func=bench_dedup)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
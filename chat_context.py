@@ -0,0 +1,152 @@
+"""
+대화 문맥 관리 모듈
+
+대화 전체를 매번 전송하던 방식 대신 토큰 예산 안에서 최근 대화만 전송합니다.
+- 메시지별 토큰 수는 새로 추가된 메시지만 계산하여 보관
+- 최근 대화부터 예산 안에 들어가는 만큼만 전송 (슬라이딩 윈도우)
+- 창 밖으로 밀려난 대화는 누적 요약에 합쳐 system 메시지로 전달
+  (요약은 세션에 보관하고, 창이 넘칠 때 여러 턴을 한꺼번에 요약하여 매 턴 호출하지 않음)
+"""
+import threading
+
+import jobs
+from settings import get_settings
+
+# tiktoken은 선택적으로 로드 (없으면 UTF-8 길이로 추정)
+try:
+    import tiktoken
+    _ENCODING = tiktoken.get_encoding("o200k_base")
+    TIKTOKEN_AVAILABLE = True
+except Exception:
+    _ENCODING = None
+    TIKTOKEN_AVAILABLE = False
+
+# 창이 넘쳤을 때 줄일 목표 비율 (토큰 예산은 설정의 context_token_budget)
+CONTEXT_LOW_WATER = 0.6
+
+# 누적 요약의 최대 생성 토큰 수, 요약 요청에 넣을 메시지당 최대 글자 수
+SUMMARY_MAX_TOKENS = 1024
+SUMMARY_INPUT_CHARS = 2000
+
+# 메시지 하나당 역할/구분자 토큰
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+def count_tokens(text):
+    """
+    텍스트의 토큰 수
+
+    tiktoken이 없으면 UTF-8 바이트 수로 추정합니다.
+    (한글 1글자 ≈ 3바이트 ≈ 1토큰, 영문은 3~4글자 ≈ 1토큰)
+    """
+    if _ENCODING is not None:
+        return len(_ENCODING.encode(text))
+    return len(text.encode('utf-8')) // 3 + 1
+
+
+def message_tokens(message):
+    """메시지 하나의 토큰 수 (역할/구분자 포함)"""
+    return count_tokens(message["content"]) + MESSAGE_OVERHEAD_TOKENS
+
+
+def format_for_summary(previous_summary, messages):
+    """누적 요약 요청에 넣을 텍스트 (이전 요약 + 밀려난 대화)"""
+    lines = [f"{m['role']}: {m['content'][:SUMMARY_INPUT_CHARS]}" for m in messages]
+    return f"이전 요약:\n{previous_summary or '(없음)'}\n\n이어진 대화:\n" + "\n".join(lines)
+
+
+class ChatContext:
+    """
+    세션별 대화 문맥
+
+    취소된 이전 턴의 작업이 다음 단계까지 계속 실행되는 동안 새 턴의 작업이 같은 객체를 쓰므로,
+    build()는 잠금 안에서 한 작업씩 실행합니다. (나중 작업은 앞 작업의 요약이 끝날 때까지 대기,
+    잠금을 얻었을 때 이미 취소된 작업은 상태를 바꾸지 않고 중단)
+
+    Args:
+        budget: 전송할 대화 기록(요약 포함)의 최대 토큰 수 (None이면 현재 설정의 context_token_budget)
+        low_water: 창이 넘쳤을 때 budget의 이 비율까지 오래된 대화를 요약으로 넘김
+    """
+
+    def __init__(self, budget=None, low_water=CONTEXT_LOW_WATER):
+        self.budget = get_settings().context_token_budget if budget is None else budget
+        self.low_water = low_water
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """대화 기록이 초기화되었을 때 상태 초기화"""
+        self._messages = []
+        self._tokens = []
+        self.start = 0
+        self.summary = ""
+        self.summary_tokens = 0
+
+        # 상태 표시용 통계
+        self.summaries = 0
+
+    def _sync(self, messages):
+        """
+        새로 추가된 메시지의 토큰 수만 계산 (앞부분이 달라졌으면 처음부터)
+
+        같은 목록 객체가 아니어도 이전에 본 메시지가 그대로 앞에 있으면 이어서 계산합니다.
+        (대화 턴 작업에는 세션 목록의 복사본이 전달됨, 같은 메시지 객체는 비교 없이 일치)
+        """
+        seen = len(self._messages)
+        if len(messages) < seen or messages[:seen] != self._messages:
+            self.reset()
+            seen = 0
+        for message in messages[seen:]:
+            self._messages.append(message)
+            self._tokens.append(message_tokens(message))
+
+    def window_tokens(self):
+        """현재 창(요약 제외)의 토큰 수"""
+        return sum(self._tokens[self.start:])
+
+    def build(self, messages, summarize=None):
+        """
+        전송할 대화 기록 생성
+
+        Args:
+            messages: 전체 대화 기록 (세션의 메시지 목록, 추가만 되는 리스트)
+            summarize: summarize(이전 요약, 밀려난 메시지 목록) -> 새 요약
+                (None이거나 실패하면 밀려난 대화는 버리고 이전 요약 유지,
+                 작업이 취소되어 중단되면 창을 그대로 두어 다음 턴에서 다시 요약)
+
+        Returns:
+            list: [누적 요약 system 메시지(있으면)] + 최근 대화
+
+        Raises:
+            JobCancelled: 현재 작업이 취소 요청된 경우
+        """
+        with self._lock:
+            # 기다리는 사이에 취소된 작업이 더 짧은 대화 기록으로 상태를 되돌리지 않도록 확인
+            jobs.progress()
+            self._sync(messages)
+
+            if self.window_tokens() + self.summary_tokens > self.budget:
+                # 창이 넘치면 low_water까지 한 번에 줄여서 요약 호출 횟수를 줄임
+                target = self.budget * self.low_water - self.summary_tokens
+                window = self.window_tokens()
+                end = self.start
+                while end < len(messages) - 1 and window > target:
+                    window -= self._tokens[end]
+                    end += 1
+
+                dropped = messages[self.start:end]
+                if dropped and summarize is not None:
+                    try:
+                        self.summary = summarize(self.summary, dropped)
+                        self.summary_tokens = count_tokens(self.summary) + MESSAGE_OVERHEAD_TOKENS
+                        self.summaries += 1
+                    except jobs.JobCancelled:
+                        raise
+                    except Exception:
+                        pass
+                self.start = end
+
+            history = list(messages[self.start:])
+            if self.summary:
+                history.insert(0, {"role": "system", "content": f"이전 대화 요약:\n{self.summary}"})
+            return history
@@ -0,0 +1,389 @@
+"""
+정시 기사 수집기
+
+Streamlit 앱과 별도 프로세스로 실행합니다. (앱은 수집 결과만 읽음)
+    python -m collector          # 매일 9시, 15시, 21시 수집
+    python -m collector --once   # 지금 한 번만 수집하고 종료
+
+- 수집 일정은 APScheduler 작업 저장소(articles.db의 apscheduler_jobs 테이블)에 보관하여
+  재시작해도 유지되고, 꺼져 있던 동안 놓친 실행은 한 번으로 합쳐서 실행
+- 여러 인스턴스를 띄워도 리더 잠금을 가진 하나만 수집
+  (리더가 비정상 종료하면 LEADER_TTL초 뒤 다른 인스턴스가 이어받음)
+- 키워드별 수집 위치(최신 발행 시각, 최근 본 링크)를 저장하여 새 기사만 처리하고,
+  키워드별 신규/중복/실패 건수를 collection_runs 테이블에 기록
+  (COLLECT_INTERVAL_MINUTES로 몇 분마다 수집해도 같은 기사를 다시 처리하지 않음)
+"""
+import argparse
+import importlib.util
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import feeds
+import metrics
+import notion_sync
+import storage
+from settings import get_settings
+
+# Notion 클라이언트 (선택적으로 로드, 설치 여부만 확인하고 import는 전송 스레드를 시작할 때)
+NOTION_AVAILABLE = importlib.util.find_spec("notion_client") is not None
+
+COLLECTION_LOG_PATH = Path("collection_log.txt")
+
+# 로그 끝에서부터 읽을 때 한 번에 읽는 크기(바이트)
+LOG_TAIL_BLOCK_SIZE = 4096
+
+# 수집 작업 ID, 수집 시각(매일 오전 9시, 오후 3시, 오후 9시), 시간대
+# (APScheduler/SQLAlchemy는 수집기 프로세스에서만 쓰므로 create_scheduler()에서 import,
+#  앱은 이 모듈의 상태 조회 함수만 사용)
+COLLECT_JOB_ID = 'auto_collect_news'
+COLLECT_JOB_REF = 'collector:collect_news'
+COLLECT_CRON_HOURS = '9,15,21'
+COLLECT_TIMEZONE = 'Asia/Seoul'
+
+# 최신 발행 시각보다 이만큼(초) 이전 기사까지는 늦게 올라온 기사일 수 있으므로 다시 확인
+CURSOR_OVERLAP = 3600
+
+# 수집 위치에 보관할 최근 본 링크 최대 개수
+CURSOR_MAX_SEEN = 500
+
+# 놓친 실행을 재시작 후에도 실행하는 최대 지연 시간(초)
+MISFIRE_GRACE_TIME = 3600
+
+# 리더 잠금 이름, 유지 시간(초), 연장 간격(초)
+LEADER_LOCK_NAME = 'collector'
+LEADER_TTL = 60
+LEADER_RENEW_INTERVAL = 20
+
+
+def write_log(message):
+    """수집 로그 파일에 한 줄 추가"""
+    with open(COLLECTION_LOG_PATH, "a", encoding="utf-8") as f:
+        f.write(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] {message}\n")
+
+
+def tail_lines(path, count, block_size=LOG_TAIL_BLOCK_SIZE):
+    """
+    파일의 마지막 count줄 읽기 (끝에서부터 블록 단위로 읽으므로 파일 크기와 관계없음)
+
+    Args:
+        path: 파일 경로
+        count: 읽을 줄 수
+        block_size: 한 번에 읽을 크기(바이트)
+
+    Returns:
+        list: 줄 끝 문자를 뗀 마지막 count줄 (파일이 없으면 빈 리스트)
+    """
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return []
+    with f:
+        position = f.seek(0, os.SEEK_END)
+        data = b''
+        # 마지막 줄 끝의 줄바꿈을 빼고 count개의 줄바꿈이 나올 때까지 앞쪽 블록을 붙임
+        while position > 0 and data.rstrip(b'\n').count(b'\n') < count:
+            size = min(block_size, position)
+            position -= size
+            f.seek(position)
+            data = f.read(size) + data
+    lines = data.decode("utf-8", errors="replace").splitlines()
+    return lines[-count:] if count > 0 else []
+
+
+def read_log_tail(count=5):
+    """수집 로그의 최근 count줄"""
+    return tail_lines(COLLECTION_LOG_PATH, count)
+
+
+def _shift_timestamp(timestamp, seconds):
+    """정규화된 발행 시각 문자열을 seconds초만큼 이동"""
+    moved = datetime.strptime(timestamp, storage.TIMESTAMP_FORMAT) + timedelta(seconds=seconds)
+    return moved.strftime(storage.TIMESTAMP_FORMAT)
+
+
+def select_new_entries(articles, last_published_at, seen_links, overlap=CURSOR_OVERLAP):
+    """
+    수집 위치 이후의 기사만 골라내고 다음 수집 위치 계산
+
+    최신 발행 시각에서 overlap초 이전까지는 다시 확인하되 그 구간에서 이미 본 링크는 건너뜁니다.
+    발행 시각을 알 수 없는 기사는 항상 처리합니다. (저장 시 링크 중복으로 걸러짐)
+
+    Args:
+        articles: 피드에서 읽은 기사 목록
+        last_published_at: 저장된 최신 발행 시각 (처음이면 None)
+        seen_links: 저장된 {최근 본 링크: 발행 시각}
+        overlap: 다시 확인할 구간(초)
+
+    Returns:
+        tuple: (새 기사 목록, 다음 최신 발행 시각, 다음 {최근 본 링크: 발행 시각})
+    """
+    floor = _shift_timestamp(last_published_at, -overlap) if last_published_at else None
+    new_entries = []
+    seen = dict(seen_links)
+    for article in articles:
+        published_at = storage.normalize_published(article.get('published'))
+        if published_at is not None and floor is not None and published_at < floor:
+            continue
+        if article['link'] in seen:
+            continue
+        new_entries.append(article)
+        if published_at is not None:
+            seen[article['link']] = published_at
+
+    timestamps = list(seen.values())
+    if last_published_at:
+        timestamps.append(last_published_at)
+    if not timestamps:
+        return new_entries, None, {}
+
+    high_water = max(timestamps)
+    next_floor = _shift_timestamp(high_water, -overlap)
+    recent = sorted(((published_at, link) for link, published_at in seen.items()
+                     if published_at >= next_floor), reverse=True)[:CURSOR_MAX_SEEN]
+    return new_entries, high_water, {link: published_at for published_at, link in recent}
+
+
+def collect_keyword(keyword, articles, notion_enabled=False):
+    """
+    키워드 하나의 수집 결과 처리 (새 기사 저장, 수집 위치 갱신)
+
+    기사를 먼저 저장하고 수집 위치를 갱신하므로, 중간에 중단되어도 다음 실행에서 다시 처리됩니다.
+
+    Returns:
+        tuple: (읽은 기사 수, 수집 위치 이전이라 건너뛴 수, 신규 저장 수, 중복 수)
+    """
+    last_published_at, seen_links = storage.get_collect_cursor(keyword)
+    new_entries, high_water, next_seen = select_new_entries(articles, last_published_at, seen_links)
+
+    with metrics.span("save_articles", keyword=keyword):
+        inserted, duplicates = storage.save_articles(new_entries, keyword)
+
+    # Notion 전송 대기열에 추가 (활성화된 경우, 이미 전송한 링크는 대기열에서 걸러짐)
+    if notion_enabled and new_entries:
+        notion_sync.enqueue_articles(new_entries, keyword)
+
+    storage.put_collect_cursor(keyword, high_water, next_seen, time.time())
+    return len(articles), len(articles) - len(new_entries), inserted, duplicates
+
+
+@metrics.timed("collect_news")
+def collect_news():
+    """
+    설정된 키워드의 새 기사를 수집하여 저장
+
+    Returns:
+        bool: 수집 성공 여부 (일부 키워드 실패는 로그와 실행 기록에만 남김)
+    """
+    started_at = time.time()
+    try:
+        results = []
+        settings = get_settings()
+
+        # 키워드별 RSS를 동시에 수집하고, 도착하는 순서대로 처리
+        for keyword, articles, error in feeds.fetch_many(
+            settings.collect_keywords, max_results=settings.collect_depth,
+            timeout=settings.fetch_timeout, deadline=settings.collect_deadline
+        ):
+            if error is None:
+                try:
+                    results.append((keyword, *collect_keyword(keyword, articles, settings.notion_configured), None))
+                    continue
+                except Exception as e:
+                    error = e
+            results.append((keyword, len(articles), 0, 0, 0, f"{type(error).__name__}: {error}"[:500]))
+
+        storage.record_collection_run(started_at, time.time(), results)
+
+        new_total = sum(row[3] for row in results)
+        duplicate_total = sum(row[2] + row[4] for row in results)
+        failed_keywords = [f"{row[0]}({row[5].split(':')[0]})" for row in results if row[5]]
+        message = f"자동 기사 수집 완료: 신규 {new_total}건, 중복 {duplicate_total}건"
+        if failed_keywords:
+            message += f" (실패: {', '.join(failed_keywords)})"
+        write_log(message)
+        return True
+    except Exception as e:
+        write_log(f"오류: {str(e)}")
+        return False
+
+
+def collector_status(now=None):
+    """
+    수집기 실행 상태 (앱 사이드바 표시용)
+
+    Returns:
+        str | None: 리더 잠금을 가진 수집기 식별자, 실행 중인 수집기가 없으면 None
+    """
+    leader = storage.get_leader(LEADER_LOCK_NAME)
+    if leader is None or leader[1] < (now or time.time()):
+        return None
+    return leader[0]
+
+
+def schedule_description():
+    """현재 설정의 수집 주기 설명"""
+    interval = get_settings().collect_interval_minutes
+    if interval > 0:
+        return f"{interval}분마다 수집"
+    return f"매일 {COLLECT_CRON_HOURS.replace(',', '시, ')}시 수집"
+
+
+def create_scheduler():
+    """SQLite 작업 저장소를 쓰는 스케줄러 생성 (작업 등록/시작은 하지 않음)"""
+    from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
+    from apscheduler.schedulers.background import BackgroundScheduler
+
+    return BackgroundScheduler(
+        jobstores={'default': SQLAlchemyJobStore(url=f"sqlite:///{storage.DB_PATH}")},
+        job_defaults={'coalesce': True, 'max_instances': 1, 'misfire_grace_time': MISFIRE_GRACE_TIME},
+        timezone=COLLECT_TIMEZONE,
+    )
+
+
+def collect_trigger():
+    """현재 설정의 수집 주기 트리거"""
+    from apscheduler.triggers.cron import CronTrigger
+    from apscheduler.triggers.interval import IntervalTrigger
+
+    interval = get_settings().collect_interval_minutes
+    if interval > 0:
+        return IntervalTrigger(minutes=interval, timezone=COLLECT_TIMEZONE)
+    return CronTrigger(hour=COLLECT_CRON_HOURS, minute=0, second=0, timezone=COLLECT_TIMEZONE)
+
+
+def register_collect_job(scheduler):
+    """
+    수집 작업 등록 (작업 저장소를 조회하므로 스케줄러를 시작한 뒤 호출)
+
+    이미 저장된 작업은 다음 실행 시각을 그대로 두어 꺼져 있던 동안 놓친 실행이 실행되도록 하고,
+    수집 주기 설정이 바뀐 경우에만 새 주기로 바꿉니다.
+    (add_job(replace_existing=True)는 다음 실행 시각을 지금 기준으로 다시 계산하여 놓친 실행을 버림)
+
+    Returns:
+        str: 'added', 'rescheduled', 'kept' 중 하나
+    """
+    trigger = collect_trigger()
+    job = scheduler.get_job(COLLECT_JOB_ID)
+    if job is None:
+        # 작업 저장소에는 함수 대신 참조 문자열이 저장되므로 모듈 경로로 등록
+        # (python -m collector로 실행하면 __main__이 collector 모듈로 등록되어 같은 모듈을 가리킴)
+        scheduler.add_job(COLLECT_JOB_REF, trigger, id=COLLECT_JOB_ID, name='자동 기사 수집')
+        return 'added'
+    # 트리거 문자열은 주기만 나타냄 (interval[0:30:00], cron[hour='9,15,21', ...])
+    if str(job.trigger) != str(trigger):
+        scheduler.reschedule_job(COLLECT_JOB_ID, trigger=trigger)
+        return 'rescheduled'
+    return 'kept'
+
+
+def start_scheduler():
+    """
+    스케줄러를 시작하고 수집 작업 등록
+
+    일시 정지 상태로 시작하여 작업을 등록한 뒤 재개하므로,
+    재개하는 시점에 놓친 실행(MISFIRE_GRACE_TIME 이내)이 한 번으로 합쳐져 실행됩니다.
+    """
+    scheduler = create_scheduler()
+    scheduler.start(paused=True)
+    try:
+        register_collect_job(scheduler)
+    except Exception:
+        scheduler.shutdown(wait=False)
+        raise
+    scheduler.resume()
+    return scheduler
+
+
+class Collector:
+    """
+    리더 잠금을 가진 동안에만 스케줄러를 실행하는 수집기
+
+    Args:
+        owner: 리더 잠금에 기록할 식별자 (기본값: 호스트명:PID)
+    """
+
+    def __init__(self, owner=None):
+        self.owner = owner or f"{socket.gethostname()}:{os.getpid()}"
+        self.scheduler = None
+        self._stopped = threading.Event()
+
+    @property
+    def is_leader(self):
+        return self.scheduler is not None
+
+    def stop(self):
+        """수집기 중지 (진행 중인 수집은 마치고 종료)"""
+        self._stopped.set()
+
+    def run(self):
+        """잠금을 주기적으로 획득/연장하며 리더일 때만 스케줄러 실행 (stop()까지 대기)"""
+        try:
+            while not self._stopped.is_set():
+                self._heartbeat()
+                self._stopped.wait(LEADER_RENEW_INTERVAL)
+        finally:
+            self._step_down()
+            try:
+                storage.release_leader(LEADER_LOCK_NAME, self.owner)
+            except Exception:
+                pass
+
+    def _heartbeat(self):
+        try:
+            leader = storage.acquire_leader(LEADER_LOCK_NAME, self.owner, time.time(), LEADER_TTL)
+        except Exception as e:
+            # DB에 접근하지 못하면 잠금을 연장할 수 없으므로 리더에서 물러남
+            write_log(f"수집기 잠금 오류: {str(e)}")
+            leader = False
+
+        if leader and not self.is_leader:
+            self.scheduler = start_scheduler()
+            write_log(f"수집기 시작 ({self.owner})")
+        elif not leader and self.is_leader:
+            write_log(f"수집기 리더 잠금 상실, 대기 상태로 전환 ({self.owner})")
+            self._step_down()
+
+    def _step_down(self):
+        if self.scheduler is not None:
+            self.scheduler.shutdown(wait=True)
+            self.scheduler = None
+
+
+def start_notion_worker():
+    """Notion 설정이 있으면 전송 스레드 시작 (앱을 띄우지 않아도 대기열 전송)"""
+    settings = get_settings()
+    if NOTION_AVAILABLE and settings.notion_configured:
+        from notion_client import Client
+        notion_sync.start_worker(Client(auth=settings.notion_api_key), settings.notion_database_id)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="정시 기사 수집기")
+    parser.add_argument("--once", action="store_true", help="지금 한 번만 수집하고 종료")
+    args = parser.parse_args(argv)
+
+    storage.init_database()
+    metrics.recorder.totals_store = storage
+    start_notion_worker()
+
+    if args.once:
+        return 0 if collect_news() else 1
+
+    collector = Collector()
+    signal.signal(signal.SIGTERM, lambda signum, frame: collector.stop())
+    signal.signal(signal.SIGINT, lambda signum, frame: collector.stop())
+    print(f"수집기 실행 중 ({collector.owner}), {schedule_description()}")
+    collector.run()
+    return 0
+
+
+if __name__ == "__main__":
+    # 작업 저장소의 참조 문자열(COLLECT_JOB_REF)이 이 모듈을 다시 import하지 않도록 등록
+    sys.modules.setdefault('collector', sys.modules[__name__])
+    raise SystemExit(main())
@@ -0,0 +1,259 @@
+"""
+Playwright 크롤링 모듈 (네이버 뉴스)
+
+검색마다 Chromium을 새로 띄우지 않고, 전용 작업 스레드가 브라우저/컨텍스트/페이지를
+계속 유지하면서 요청을 처리합니다.
+- Playwright sync API 객체는 만든 스레드에서만 사용할 수 있으므로,
+  다른 스레드(Streamlit 세션, 스케줄러)는 작업을 큐에 넣고 결과를 기다립니다.
+- 이미지/폰트/스타일시트/미디어 요청은 차단하여 로딩 시간과 메모리를 줄입니다.
+- 일정 횟수 사용 후 또는 오류(브라우저 크래시 등) 발생 시 브라우저를 새로 띄웁니다.
+"""
+import atexit
+import importlib.util
+import queue
+import threading
+from concurrent.futures import CancelledError, Future
+from urllib.parse import quote
+
+import metrics
+
+# Playwright는 선택적으로 로드 (Streamlit Cloud 호환성)
+# 설치 여부만 확인하고, import는 작업 스레드가 처음 브라우저를 띄울 때
+PLAYWRIGHT_AVAILABLE = importlib.util.find_spec("playwright") is not None
+
+NAVER_NEWS_SEARCH_URL = "https://search.naver.com/search.naver?where=news&sm=tab_jum&query={query}"
+
+# 브라우저 수(작업 스레드 수), 브라우저 재시작 주기, 페이지 로딩 타임아웃(ms)
+POOL_SIZE = 1
+MAX_USES_PER_BROWSER = 50
+PAGE_TIMEOUT_MS = 15000
+
+# 스크래핑에 필요 없는 리소스 유형
+BLOCKED_RESOURCE_TYPES = {"image", "font", "stylesheet", "media"}
+
+
+def _block_resources(route):
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        route.abort()
+    else:
+        route.continue_()
+
+
+class _BrowserWorker(threading.Thread):
+    """브라우저 하나를 소유하고 큐의 작업을 순서대로 실행하는 스레드"""
+
+    def __init__(self, jobs, max_uses):
+        super().__init__(daemon=True, name="playwright-worker")
+        self.jobs = jobs
+        self.max_uses = max_uses
+        self._playwright = None
+        self._browser = None
+        self._page = None
+        self._uses = 0
+
+        # 상태 표시용 통계
+        self.launches = 0
+
+    def _ensure_page(self):
+        if self._page is not None:
+            return self._page
+        if self._playwright is None:
+            from playwright.sync_api import sync_playwright
+            self._playwright = sync_playwright().start()
+        self._browser = self._playwright.chromium.launch(headless=True)
+        context = self._browser.new_context()
+        context.route("**/*", _block_resources)
+        context.set_default_timeout(PAGE_TIMEOUT_MS)
+        self._page = context.new_page()
+        self._uses = 0
+        self.launches += 1
+        return self._page
+
+    def _close_browser(self):
+        """브라우저 종료 (크래시로 이미 닫힌 경우의 오류는 무시)"""
+        if self._browser is not None:
+            try:
+                self._browser.close()
+            except Exception:
+                pass
+        self._browser = None
+        self._page = None
+
+    def _shutdown(self):
+        self._close_browser()
+        if self._playwright is not None:
+            try:
+                self._playwright.stop()
+            except Exception:
+                pass
+            self._playwright = None
+
+    def run(self):
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                self._shutdown()
+                return
+
+            func, future, cancel_event = job
+            # 큐에서 기다리는 동안 요청한 쪽이 취소했으면 브라우저를 띄우지 않고 건너뜀
+            if cancel_event is not None and cancel_event.is_set():
+                future.cancel()
+            if not future.set_running_or_notify_cancel():
+                continue
+
+            try:
+                result = func(self._ensure_page())
+            except Exception as e:
+                # 페이지/브라우저 상태를 알 수 없으므로 다음 작업은 새 브라우저로 처리
+                self._close_browser()
+                future.set_exception(e)
+                continue
+
+            future.set_result(result)
+            self._uses += 1
+            if self._uses >= self.max_uses:
+                self._close_browser()
+
+
+class BrowserPool:
+    """
+    스레드 안전한 Playwright 브라우저 풀
+
+    Args:
+        size: 동시에 유지할 브라우저 수
+        max_uses: 브라우저 하나로 처리할 최대 작업 수 (이후 재시작)
+    """
+
+    def __init__(self, size=POOL_SIZE, max_uses=MAX_USES_PER_BROWSER):
+        self._jobs = queue.Queue()
+        self._workers = [_BrowserWorker(self._jobs, max_uses) for _ in range(size)]
+        for worker in self._workers:
+            worker.start()
+
+    @property
+    def launches(self):
+        """지금까지 브라우저를 띄운 횟수"""
+        return sum(worker.launches for worker in self._workers)
+
+    def submit(self, func, cancel_event=None):
+        """
+        작업 스레드에서 func(page)를 실행하도록 요청
+
+        Args:
+            func: 실행할 함수 func(page)
+            cancel_event: 작업 스레드가 꺼낼 때 설정되어 있으면 실행하지 않고 취소 (threading.Event)
+
+        Returns:
+            Future: func의 반환값 또는 예외 (건너뛴 작업은 취소된 Future)
+        """
+        future = Future()
+        self._jobs.put((func, future, cancel_event))
+        return future
+
+    def run(self, func, timeout=None, cancel_event=None):
+        """
+        submit 후 결과를 기다려 반환
+
+        Raises:
+            CancelledError: cancel_event로 건너뛴 경우
+        """
+        return self.submit(func, cancel_event).result(timeout=timeout)
+
+    def close(self):
+        """모든 브라우저 종료"""
+        for _ in self._workers:
+            self._jobs.put(None)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_browser_pool():
+    """전역 브라우저 풀 반환 (최초 호출 시 생성, 프로세스 종료 시 정리)"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = BrowserPool()
+                atexit.register(_pool.close)
+    return _pool
+
+
+def scrape_news_page(page, url, max_results):
+    """
+    네이버 뉴스 검색 결과 페이지(div.news_area 구조)에서 기사 추출
+
+    Args:
+        page: Playwright Page
+        url: 검색 결과 URL (로컬 HTML 파일의 file:// URL도 가능)
+        max_results: 최대 수집 기사 수
+
+    Returns:
+        list: 기사 정보 리스트
+    """
+    page.goto(url, wait_until="domcontentloaded")
+
+    articles = []
+    for item in page.query_selector_all("div.news_area")[:max_results]:
+        try:
+            # 제목과 링크 추출
+            title_elem = item.query_selector("a.news_tit")
+            if not title_elem:
+                continue
+
+            title = title_elem.get_attribute("title")
+            link = title_elem.get_attribute("href")
+
+            # 요약 및 날짜 추출
+            text_elem = item.query_selector("div.news_dsc")
+            summary = text_elem.inner_text() if text_elem else ""
+
+            # 지면 정보("A1면 1단"), "언론사 선정"도 span.info라서 마지막 span.info가 날짜
+            date_elems = item.query_selector_all("span.info")
+            published = date_elems[-1].inner_text() if date_elems else "날짜 정보 없음"
+
+            if title and link:
+                articles.append({
+                    'title': title,
+                    'link': link,
+                    'published': published,
+                    'summary': summary,
+                    'source': 'Playwright (Naver News)'
+                })
+        except Exception:
+            continue
+
+    return articles
+
+
+@metrics.timed("fetch_naver_news")
+def fetch_naver_news(keyword, max_results=5, url_template=NAVER_NEWS_SEARCH_URL, timeout=30,
+                     cancel_event=None):
+    """
+    브라우저 풀을 사용하여 네이버 뉴스 검색 결과 크롤링
+
+    오류는 호출한 쪽에서 처리하도록 그대로 발생시킵니다.
+
+    Args:
+        keyword: 검색 키워드
+        max_results: 최대 수집 기사 수
+        url_template: 검색 URL 형식 ({query} 자리에 키워드가 들어감)
+        timeout: 전체 대기 시간(초)
+        cancel_event: 설정되면 아직 시작하지 않은 크롤링을 브라우저를 띄우지 않고 건너뜀 (threading.Event)
+
+    Returns:
+        list: 기사 정보 리스트
+    """
+    if not PLAYWRIGHT_AVAILABLE:
+        return []
+
+    url = url_template.format(query=quote(keyword))
+
+    try:
+        return get_browser_pool().run(lambda page: scrape_news_page(page, url, max_results),
+                                      timeout=timeout, cancel_event=cancel_event)
+    except CancelledError:
+        # 큐에서 기다리는 동안 검색이 끝남
+        return []
@@ -0,0 +1,247 @@
+"""
+기사 중복 판별 모듈
+
+articles.link UNIQUE 제약은 글자 단위로 같은 URL만 걸러내므로 두 단계로 보완합니다.
+1. URL 정규화: 추적 파라미터 제거, 알려진 리다이렉트 형식(Google 뉴스/검색, 네이버 뉴스)을
+   네트워크 요청 없이 원본 기사 주소로 변환 → 같은 기사는 한 번만 저장
+2. SimHash: 제목/요약의 문자 n-gram으로 64비트 지문을 만들어 해밍 거리가 가까운 기사를
+   같은 클러스터로 묶음 → 여러 언론사가 낸 같은 소식은 Notion 전송/GPT 요약에 한 번만 사용
+
+지문은 16비트씩 4개 구간(band)으로 나누어 색인합니다.
+해밍 거리가 3 이하인 두 지문은 적어도 한 구간이 완전히 같으므로, 구간 값이 같은 기사만 비교하면 됩니다.
+"""
+import base64
+import hashlib
+import re
+from functools import lru_cache
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# 지문 비트 수, 구간 수(구간당 16비트), 같은 소식으로 볼 최대 해밍 거리 (구간 수 - 1 이하여야 함)
+SIMHASH_BITS = 64
+SIMHASH_BANDS = 4
+NEAR_DUPLICATE_DISTANCE = 3
+
+# 지문 계산용 문자 n-gram 길이, 제목 가중치 (요약보다 제목이 소식을 더 잘 구분함)
+SHINGLE_SIZE = 2
+TITLE_WEIGHT = 2
+
+_BAND_BITS = SIMHASH_BITS // SIMHASH_BANDS
+_BAND_MASK = (1 << _BAND_BITS) - 1
+
+# 펼친 특징 해시 캐시 크기 (한국어 뉴스 제목의 2글자 n-gram은 자주 반복됨)
+FEATURE_CACHE_SIZE = 16384
+
+# 비트별 가중치 합을 담을 칸 크기 (특징 가중치 합이 2**32를 넘지 않는 한 넘치지 않음)
+_LANE_BITS = 32
+
+# 기사 주소와 무관한 추적/유입 경로 파라미터
+# (사이트마다 의미가 다른 sid, from 같은 이름은 제외, 네이버 뉴스는 아래에서 별도 처리)
+TRACKING_PARAMS = frozenset({
+    'fbclid', 'gclid', 'dclid', 'yclid', 'msclkid', 'igshid', 'mc_cid', 'mc_eid',
+    'ref_src', 'cmpid', 'ocid', 'oc',
+})
+TRACKING_PARAM_PREFIXES = ('utm_',)
+
+# Google 검색 결과의 리다이렉트 주소에서 원본 주소를 담는 파라미터
+_REDIRECT_PARAMS = ('url', 'q')
+
+_NAVER_NEWS_HOSTS = frozenset({'news.naver.com', 'n.news.naver.com', 'm.news.naver.com'})
+_NAVER_ARTICLE_PATH_RE = re.compile(r'^/(?:mnews/)?article/(\d+)/(\d+)')
+_URL_IN_BYTES_RE = re.compile(rb'https?://[\x21-\x7e]+')
+
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+# Google 뉴스 제목 끝의 " - 언론사명"
+_SOURCE_SUFFIX_RE = re.compile(r'\s+[-|–]\s+[^-|–]{1,30}$')
+_NON_WORD_RE = re.compile(r'[^0-9a-z가-힣]+')
+
+
+# ==================== URL 정규화 ====================
+def _decode_google_news(path):
+    """
+    Google 뉴스 RSS 기사 주소(/rss/articles/CBMi...)에 들어 있는 원본 주소 추출
+
+    주소의 마지막 부분은 원본 URL을 담은 base64 인코딩 값입니다.
+    (최근 형식은 원본 URL이 암호화되어 있어 추출할 수 없으며, 이 경우 None)
+    """
+    token = path.rstrip('/').rsplit('/', 1)[-1]
+    try:
+        data = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+    except (ValueError, TypeError):
+        return None
+    match = _URL_IN_BYTES_RE.search(data)
+    return match.group(0).decode('ascii') if match else None
+
+
+def canonicalize_url(url):
+    """
+    같은 기사를 가리키는 URL을 하나의 표기로 정규화
+
+    - 스킴/호스트 소문자, www. 와 기본 포트, 프래그먼트, 끝의 / 제거
+    - 추적 파라미터 제거, 나머지 파라미터는 이름순 정렬
+    - Google 뉴스/검색 리다이렉트는 원본 주소로, 네이버 뉴스는 언론사/기사 번호 형식으로 변환
+
+    Args:
+        url: 기사 링크
+
+    Returns:
+        str: 정규화된 URL (해석할 수 없으면 앞뒤 공백만 제거한 원본)
+    """
+    url = (url or '').strip()
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return url
+    if parts.scheme not in ('http', 'https') or not parts.hostname:
+        return url
+
+    host = parts.hostname.lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    query = parse_qsl(parts.query, keep_blank_values=True)
+
+    # Google 검색 결과 리다이렉트 (google.com/url?q=원본)
+    if host.startswith('google.') and parts.path == '/url':
+        for name, value in query:
+            if name in _REDIRECT_PARAMS and value.startswith(('http://', 'https://')):
+                return canonicalize_url(value)
+
+    # Google 뉴스 RSS 기사 주소 (/rss/articles/<base64>)
+    if host == 'news.google.com' and '/articles/' in parts.path:
+        original = _decode_google_news(parts.path)
+        if original:
+            return canonicalize_url(original)
+
+    # 네이버 뉴스: 모바일/PC/구형 주소를 n.news.naver.com/mnews/article/언론사/기사 로 통일
+    if host in _NAVER_NEWS_HOSTS:
+        match = _NAVER_ARTICLE_PATH_RE.match(parts.path)
+        params = dict(query)
+        if match:
+            office, article = match.groups()
+        elif 'oid' in params and 'aid' in params:
+            office, article = params['oid'], params['aid']
+        else:
+            office = article = None
+        if office and article:
+            return f"https://n.news.naver.com/mnews/article/{office}/{article}"
+
+    query = sorted(
+        (name, value) for name, value in query
+        if name.lower() not in TRACKING_PARAMS and not name.lower().startswith(TRACKING_PARAM_PREFIXES)
+    )
+    netloc = host
+    if parts.port and parts.port != {'http': 80, 'https': 443}[parts.scheme]:
+        netloc = f"{host}:{parts.port}"
+    path = parts.path.rstrip('/') or '/'
+    return urlunsplit((parts.scheme.lower(), netloc, path, urlencode(query), ''))
+
+
+# ==================== SimHash ====================
+def _shingles(text):
+    """공백/기호를 없앤 소문자 텍스트의 문자 n-gram"""
+    text = _NON_WORD_RE.sub('', text.lower())
+    if len(text) <= SHINGLE_SIZE:
+        return [text] if text else []
+    return [text[i:i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1)]
+
+
+def _feature_hash(feature):
+    return int.from_bytes(hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+# 바이트 값 → 8개 비트를 각각 _LANE_BITS 간격 칸에 펼친 값
+_SPREAD_BYTE = [sum(1 << (bit * _LANE_BITS) for bit in range(8) if byte >> bit & 1) for byte in range(256)]
+
+
+@lru_cache(maxsize=FEATURE_CACHE_SIZE)
+def _feature_lanes(feature):
+    """특징 해시의 각 비트를 _LANE_BITS 간격 칸에 펼친 값 (자주 나오는 n-gram은 캐시)"""
+    value = _feature_hash(feature)
+    spread = 0
+    for index in range(SIMHASH_BITS // 8):
+        spread |= _SPREAD_BYTE[value >> (index * 8) & 0xFF] << (index * 8 * _LANE_BITS)
+    return spread
+
+
+def simhash(title, summary=''):
+    """
+    제목/요약의 64비트 SimHash 지문
+
+    제목 끝의 언론사명과 요약의 HTML 태그는 제외합니다.
+    (Google 뉴스 요약은 제목 + 언론사명이라 언론사마다 달라지는 부분만 늘어남)
+
+    Returns:
+        int: 0 이상 2**64 미만의 지문 (특징이 없으면 0)
+    """
+    weights = {}
+    for feature in _shingles(_SOURCE_SUFFIX_RE.sub('', title or '')):
+        weights[feature] = weights.get(feature, 0) + TITLE_WEIGHT
+    for feature in _shingles(_HTML_TAG_RE.sub(' ', summary or '')):
+        weights[feature] = weights.get(feature, 0) + 1
+
+    # 비트별 가중치 합을 큰 정수 하나의 32비트 칸(lane)에 나눠 담아 한 번의 덧셈으로 누적
+    # (특징마다 64비트를 하나씩 더하지 않음)
+    lanes = 0
+    total = 0
+    for feature, weight in weights.items():
+        lanes += weight * _feature_lanes(feature)
+        total += weight
+
+    # 1인 특징의 가중치 합이 전체의 절반보다 큰 비트만 1
+    counts = memoryview(lanes.to_bytes(SIMHASH_BITS * _LANE_BITS // 8, 'little')).cast('I')
+    fingerprint = 0
+    for bit, count in enumerate(counts):
+        if count * 2 > total:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+def hamming_distance(a, b):
+    """두 지문의 서로 다른 비트 수"""
+    return bin(a ^ b).count('1')
+
+
+def simhash_bands(value):
+    """
+    지문을 색인용 구간 값으로 분할
+
+    Returns:
+        list: (구간 번호, 구간 값) 튜플 리스트
+    """
+    return [(band, value >> (band * _BAND_BITS) & _BAND_MASK) for band in range(SIMHASH_BANDS)]
+
+
+def to_signed(value):
+    """64비트 지문을 SQLite INTEGER(부호 있는 64비트)에 저장할 수 있는 값으로 변환"""
+    return value - (1 << SIMHASH_BITS) if value >= 1 << (SIMHASH_BITS - 1) else value
+
+
+def from_signed(value):
+    """SQLite에서 읽은 지문을 0 이상의 값으로 변환"""
+    return value + (1 << SIMHASH_BITS) if value < 0 else value
+
+
+# ==================== 메모리 내 중복 제거 ====================
+def pick_representatives(articles, max_distance=NEAR_DUPLICATE_DISTANCE):
+    """
+    기사 목록에서 같은 기사/같은 소식을 하나씩만 남김 (앞에 있는 기사 우선)
+
+    GPT 요약처럼 저장 여부와 관계없이 바로 쓰는 기사 목록용입니다.
+
+    Returns:
+        list: 대표 기사 목록 (원래 순서 유지)
+    """
+    representatives = []
+    links = set()
+    fingerprints = []
+    for article in articles:
+        link = canonicalize_url(article.get('link'))
+        if link in links:
+            continue
+        fingerprint = simhash(article.get('title', ''), article.get('summary', ''))
+        if fingerprint and any(hamming_distance(fingerprint, other) <= max_distance
+                               for other in fingerprints):
+            continue
+        links.add(link)
+        fingerprints.append(fingerprint)
+        representatives.append(article)
+    return representatives
@@ -0,0 +1,301 @@
+"""
+Google News RSS 수집 모듈
+
+- 요청마다 타임아웃을 적용 (feedparser.parse(url)은 타임아웃이 없음)
+- 여러 키워드를 제한된 동시성으로 병렬 수집하고, 키워드별 오류를 분리
+- URL별 피드 캐시(SQLite): TTL 안에서는 재요청 없음, 이후에는 조건부 GET(304면 파싱 생략)
+- 스트리밍 파싱: 필요한 기사 수만큼 읽으면 다운로드/파싱 중단 (형식 오류 시 feedparser로 폴백)
+"""
+import contextvars
+import threading
+import time
+import urllib.error
+import urllib.request
+import xml.etree.ElementTree as ET
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+from urllib.parse import quote
+
+import metrics
+import storage
+from settings import get_settings
+
+GOOGLE_NEWS_RSS_URL = "https://news.google.com/rss/search?q={query}&hl=ko&gl=KR&ceid=KR:ko"
+
+# 동시 요청 수 (요청 1건당 타임아웃은 설정의 fetch_timeout)
+MAX_CONCURRENCY = 8
+
+USER_AGENT = "Mozilla/5.0 (compatible; NewsChatbot/1.0)"
+
+# 스트리밍 파싱 시 한 번에 읽는 크기와 최소로 읽을 기사 수
+# (3건/5건 요청이 같은 캐시 항목을 재사용할 수 있도록 조금 더 읽어 둠)
+STREAM_CHUNK_SIZE = 16 * 1024
+STREAM_MIN_ENTRIES = 10
+
+
+def build_rss_url(keyword):
+    """검색 키워드로 Google News RSS URL 생성"""
+    return GOOGLE_NEWS_RSS_URL.format(query=quote(keyword))
+
+
+def open_url(url, headers=None, timeout=None):
+    """타임아웃(None이면 설정의 fetch_timeout)을 적용하여 URL 열기 (응답 객체는 호출한 쪽에서 닫음)"""
+    if timeout is None:
+        timeout = get_settings().fetch_timeout
+    request = urllib.request.Request(url, headers={"User-Agent": USER_AGENT, **(headers or {})})
+    return urllib.request.urlopen(request, timeout=timeout)
+
+
+def parse_entries(content, max_results=None):
+    """
+    RSS 문서를 기사 dict 목록으로 변환
+
+    Args:
+        content: RSS 원문 (bytes 또는 str)
+        max_results: 최대 기사 수 (None이면 전체)
+
+    Returns:
+        list: 기사 정보 리스트
+    """
+    # feedparser는 import가 느리고 형식 오류 폴백에서만 쓰므로 필요할 때 로드
+    import feedparser
+
+    feed = feedparser.parse(content)
+
+    articles = []
+    for entry in feed.entries[:max_results]:
+        articles.append({
+            'title': entry.title,
+            'link': entry.link,
+            'published': entry.published if 'published' in entry else '날짜 정보 없음',
+            'summary': entry.summary if 'summary' in entry else ''
+        })
+    return articles
+
+
+# ==================== 스트리밍 파싱 ====================
+def _item_to_article(item):
+    """RSS <item> 요소를 기사 dict로 변환 (parse_entries와 같은 형식)"""
+    def text(tag):
+        element = item.find(tag)
+        return (element.text or '').strip() if element is not None else ''
+
+    return {
+        'title': text('title'),
+        'link': text('link'),
+        'published': text('pubDate') or '날짜 정보 없음',
+        'summary': text('description'),
+    }
+
+
+def stream_entries(stream, max_results, chunk_size=STREAM_CHUNK_SIZE):
+    """
+    RSS를 조금씩 읽으면서 <item>을 기사로 변환하고, max_results개가 모이면 읽기를 중단
+
+    Google News 피드는 약 100건이지만 보통 3~5건만 필요하므로,
+    나머지 본문은 다운로드도 파싱도 하지 않습니다.
+    XML 형식 오류가 있거나 RSS 2.0이 아닌 경우(Atom 등)에는
+    남은 본문을 모두 읽어 feedparser로 처리합니다.
+
+    Args:
+        stream: read(size)를 지원하는 객체 (HTTP 응답, 파일 등)
+        max_results: 필요한 기사 수
+        chunk_size: 한 번에 읽을 바이트 수
+
+    Returns:
+        tuple: (기사 리스트, 피드를 끝까지 읽었는지 여부)
+    """
+    parser = ET.XMLPullParser(events=('end',))
+    received = []
+    articles = []
+    try:
+        while True:
+            chunk = stream.read(chunk_size)
+            if not chunk:
+                parser.close()
+                break
+            received.append(chunk)
+            parser.feed(chunk)
+            for _, element in parser.read_events():
+                if element.tag == 'item':
+                    articles.append(_item_to_article(element))
+                    element.clear()
+                    if len(articles) >= max_results:
+                        return articles, False
+    except ET.ParseError:
+        articles = []
+
+    if not articles and received:
+        # 형식 오류 또는 <item>이 없는 다른 형식 → feedparser로 전체 파싱
+        received.append(stream.read())
+        return parse_entries(b''.join(received)), True
+    return articles, True
+
+
+# ==================== 피드 캐시 ====================
+class FeedCache:
+    """
+    RSS URL 단위 피드 캐시
+
+    - TTL 이내: 캐시된 기사 목록을 그대로 반환 (hit)
+    - TTL 경과: If-None-Match/If-Modified-Since로 조건부 요청,
+      304 응답이면 파싱 없이 캐시 재사용 (revalidated)
+    - 그 외: 전체 다운로드 및 파싱 후 저장 (miss)
+
+    캐시 내용은 SQLite에 저장되어 재시작 후에도 유지되며,
+    최근 사용 순으로 max_entries개까지만 보관합니다.
+    ttl/max_entries를 지정하지 않으면 현재 설정(feed_cache_ttl, feed_cache_max_entries)을 따릅니다.
+    """
+
+    def __init__(self, ttl=None, max_entries=None):
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+
+    @property
+    def ttl(self):
+        return get_settings().feed_cache_ttl if self._ttl is None else self._ttl
+
+    @property
+    def max_entries(self):
+        return get_settings().feed_cache_max_entries if self._max_entries is None else self._max_entries
+
+    def _count(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def stats(self):
+        """적중/재검증/미스 횟수"""
+        with self._lock:
+            return {'hits': self.hits, 'revalidated': self.revalidated, 'misses': self.misses}
+
+    def fetch(self, url, max_results, timeout=None):
+        """
+        캐시를 거쳐 피드의 기사 목록 조회
+
+        Returns:
+            list: 최대 max_results개의 기사 목록
+        """
+        now = time.time()
+        cached = storage.get_feed_cache(url)
+
+        headers = {}
+        if cached is not None:
+            etag, last_modified, entries, complete, fetched_at = cached
+            if complete or len(entries) >= max_results:
+                if now - fetched_at < self.ttl:
+                    self._count('hits')
+                    storage.touch_feed_cache(url, now)
+                    return entries[:max_results]
+                if etag:
+                    headers["If-None-Match"] = etag
+                if last_modified:
+                    headers["If-Modified-Since"] = last_modified
+            else:
+                # 이전에 앞부분만 읽어 기사가 부족하면 조건부 요청 없이 다시 받음
+                cached = None
+
+        try:
+            with open_url(url, headers=headers, timeout=timeout) as response:
+                entries, complete = stream_entries(response, max(max_results, STREAM_MIN_ENTRIES))
+                etag = response.headers.get("ETag")
+                last_modified = response.headers.get("Last-Modified")
+        except urllib.error.HTTPError as e:
+            if e.code == 304 and cached is not None:
+                self._count('revalidated')
+                storage.touch_feed_cache(url, now, fetched_at=now)
+                return cached[2][:max_results]
+            raise
+
+        self._count('misses')
+        storage.put_feed_cache(url, etag, last_modified, entries, complete, now, self.max_entries)
+        return entries[:max_results]
+
+
+# 프로세스 전역 캐시 (Streamlit rerun과 스케줄러 스레드가 공유)
+feed_cache = FeedCache()
+
+
+@metrics.timed("fetch_feed")
+def fetch_feed(keyword, max_results=5, timeout=None, use_cache=True):
+    """
+    키워드 하나에 대한 Google News RSS 기사 수집
+
+    네트워크 오류와 타임아웃은 호출한 쪽에서 처리하도록 그대로 발생시킵니다.
+
+    Args:
+        keyword: 검색 키워드
+        max_results: 최대 수집 기사 수
+        timeout: 요청 타임아웃(초, None이면 설정값)
+        use_cache: 피드 캐시 사용 여부
+
+    Returns:
+        list: 기사 정보 리스트
+    """
+    url = build_rss_url(keyword)
+    if use_cache:
+        return feed_cache.fetch(url, max_results, timeout=timeout)
+    with open_url(url, timeout=timeout) as response:
+        return stream_entries(response, max_results)[0][:max_results]
+
+
+def fetch_many(keywords, max_results=3, max_workers=MAX_CONCURRENCY,
+               timeout=None, deadline=None):
+    """
+    여러 키워드의 RSS를 동시에 수집하여 완료되는 순서대로 반환
+
+    한 키워드의 실패/지연은 다른 키워드에 영향을 주지 않습니다.
+    deadline이 지나면 아직 시작하지 않은 요청은 취소되고,
+    진행 중인 요청은 타임아웃 오류로 보고됩니다.
+
+    Args:
+        keywords: 검색 키워드 목록
+        max_results: 키워드별 최대 기사 수
+        max_workers: 최대 동시 요청 수
+        timeout: 요청 1건당 타임아웃(초, None이면 설정값)
+        deadline: 전체 수집 제한 시간(초), None이면 제한 없음
+
+    Yields:
+        tuple: (keyword, articles, error) - 실패 시 articles는 [] 이고 error에 예외
+    """
+    keywords = list(dict.fromkeys(keywords))
+    if not keywords:
+        return
+
+    end_time = time.monotonic() + deadline if deadline else None
+    executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(keywords))),
+                                  thread_name_prefix="rss-fetch")
+    futures = {
+        # 키워드별로 현재 컨텍스트를 복사해서 실행 (구간 trace가 작업 스레드에서도 이어지도록)
+        executor.submit(contextvars.copy_context().run, fetch_feed, keyword, max_results, timeout): keyword
+        for keyword in keywords
+    }
+    try:
+        if end_time is None:
+            for future in as_completed(futures):
+                yield _result(futures[future], future)
+            return
+
+        pending = set(futures)
+        while pending:
+            remaining = end_time - time.monotonic()
+            if remaining <= 0:
+                break
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield _result(futures[future], future)
+
+        for future in pending:
+            future.cancel()
+            yield futures[future], [], TimeoutError(f"수집 제한 시간({deadline}초) 초과")
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _result(keyword, future):
+    error = future.exception()
+    if error is not None:
+        return keyword, [], error
+    return keyword, future.result(), None
@@ -0,0 +1,184 @@
+"""
+기사 검색 의도 판단 모듈
+
+- 뉴스 관련 단어를 하나의 정규식으로 한 번에 검색 (단어마다 부분 문자열을 찾던 방식 대체)
+- 같은 입력의 판단 결과는 캐시
+- 판단 로그는 최근 INTENT_LOG_SIZE개만 보관하는 링 버퍼 (세션이 길어져도 메모리 일정)
+- 선택: 뉴스 관련 단어가 없는 입력은 로컬 문자 n-gram 로지스틱 회귀 모델로 한 번 더 판단
+  (오프라인으로 학습한 intent_model.json이 있을 때만 사용, 없으면 기존처럼 일반 대화)
+
+모델 학습:
+    python intent.py train samples.tsv intent_model.json
+    (samples.tsv: 한 줄에 "1<TAB>질문" 또는 "0<TAB>질문", 1이 기사 검색)
+"""
+import json
+import math
+import random
+import re
+import sys
+from collections import deque
+from functools import lru_cache
+from pathlib import Path
+
+NEWS_KEYWORDS = ['뉴스', '기사', '소식', '보도', '언론', '신문', '최신', '최근']
+
+# 판단 로그 보관 개수, 판단 결과 캐시 크기
+INTENT_LOG_SIZE = 20
+INTENT_CACHE_SIZE = 1024
+
+# 오프라인 학습 모델 경로 (없으면 키워드 판단만 사용)
+INTENT_MODEL_PATH = Path("intent_model.json")
+
+_NEWS_KEYWORDS_RE = re.compile('|'.join(re.escape(keyword) for keyword in NEWS_KEYWORDS), re.IGNORECASE)
+
+
+# ==================== 문자 n-gram 점수 모델 ====================
+class NgramScorer:
+    """
+    문자 n-gram 로지스틱 회귀 점수 모델
+
+    Args:
+        weights: n-gram별 가중치
+        bias: 절편
+        ngram_range: 사용할 n-gram 길이 범위 (최소, 최대)
+        threshold: 기사 검색으로 판단할 최소 확률
+    """
+
+    def __init__(self, weights, bias=0.0, ngram_range=(1, 3), threshold=0.5):
+        self.weights = weights
+        self.bias = bias
+        self.ngram_range = tuple(ngram_range)
+        self.threshold = threshold
+
+    def features(self, text):
+        """공백을 정리한 소문자 텍스트의 문자 n-gram 집합"""
+        text = f" {' '.join(text.lower().split())} "
+        low, high = self.ngram_range
+        return {text[i:i + n] for n in range(low, high + 1) for i in range(len(text) - n + 1)}
+
+    def probability(self, text):
+        """기사 검색일 확률"""
+        return self._probability_of(self.features(text))
+
+    @classmethod
+    def train(cls, samples, ngram_range=(1, 3), epochs=30, learning_rate=0.3, l2=1e-4, seed=0):
+        """
+        (질문, 레이블) 목록으로 학습 (확률적 경사 하강법)
+
+        Args:
+            samples: (text, label) 목록, label은 1(기사 검색) 또는 0
+            ngram_range: n-gram 길이 범위
+            epochs: 전체 데이터 반복 횟수
+            learning_rate: 학습률
+            l2: L2 규제 계수
+            seed: 데이터 섞기용 시드
+
+        Returns:
+            NgramScorer: 학습된 모델
+        """
+        scorer = cls({}, ngram_range=ngram_range)
+        data = [(scorer.features(text), label) for text, label in samples]
+        rng = random.Random(seed)
+        for _ in range(epochs):
+            rng.shuffle(data)
+            for grams, label in data:
+                error = scorer._probability_of(grams) - label
+                scorer.bias -= learning_rate * error
+                for gram in grams:
+                    weight = scorer.weights.get(gram, 0.0)
+                    scorer.weights[gram] = weight - learning_rate * (error + l2 * weight)
+        # 영향이 거의 없는 n-gram은 버려서 모델 파일을 작게 유지
+        scorer.weights = {gram: round(w, 4) for gram, w in scorer.weights.items() if abs(w) >= 1e-3}
+        return scorer
+
+    def _probability_of(self, grams):
+        score = self.bias + sum(self.weights.get(gram, 0.0) for gram in grams)
+        return 1.0 / (1.0 + math.exp(-max(min(score, 30.0), -30.0)))
+
+    def save(self, path):
+        """모델을 JSON 파일로 저장"""
+        data = {
+            'ngram_range': list(self.ngram_range),
+            'threshold': self.threshold,
+            'bias': self.bias,
+            'weights': self.weights,
+        }
+        Path(path).write_text(json.dumps(data, ensure_ascii=False), encoding='utf-8')
+
+    @classmethod
+    def load(cls, path):
+        """JSON 파일에서 모델 로드"""
+        data = json.loads(Path(path).read_text(encoding='utf-8'))
+        return cls(data['weights'], data.get('bias', 0.0),
+                   data.get('ngram_range', (1, 3)), data.get('threshold', 0.5))
+
+
+def load_scorer(path=INTENT_MODEL_PATH):
+    """
+    모델 파일이 있으면 로드
+
+    Returns:
+        NgramScorer | None: 파일이 없거나 읽을 수 없으면 None
+    """
+    try:
+        return NgramScorer.load(path)
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+# ==================== 의도 판단 ====================
+class IntentClassifier:
+    """
+    기사 검색 의도 판단기
+
+    Args:
+        scorer: 키워드가 없는 입력에 사용할 점수 모델 (None이면 키워드 판단만)
+        cache_size: 판단 결과 캐시 크기
+    """
+
+    def __init__(self, scorer=None, cache_size=INTENT_CACHE_SIZE):
+        self.scorer = scorer
+        self.classify = lru_cache(maxsize=cache_size)(self._classify)
+
+    def _classify(self, text):
+        """
+        입력이 기사 검색 요청인지 판단
+
+        Returns:
+            tuple: (기사 검색 여부, 판단 근거)
+        """
+        if _NEWS_KEYWORDS_RE.search(text):
+            return True, "YES (키워드 매칭)"
+        if self.scorer is not None:
+            probability = self.scorer.probability(text)
+            if probability >= self.scorer.threshold:
+                return True, f"YES (모델 {probability:.2f})"
+            return False, f"NO (모델 {probability:.2f})"
+        return False, "NO (키워드 없음)"
+
+
+# 프로세스 전역 판단기 (모델 파일은 시작 시 한 번만 읽음)
+classifier = IntentClassifier(load_scorer())
+
+
+def new_intent_log():
+    """최근 INTENT_LOG_SIZE개만 보관하는 판단 로그"""
+    return deque(maxlen=INTENT_LOG_SIZE)
+
+
+def _read_samples(path):
+    """'레이블<TAB>질문' 형식의 TSV 파일 읽기"""
+    samples = []
+    for line in Path(path).read_text(encoding='utf-8').splitlines():
+        if line.strip() and not line.startswith('#'):
+            label, text = line.split('\t', 1)
+            samples.append((text, int(label)))
+    return samples
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 4 or sys.argv[1] != "train":
+        sys.exit("사용법: python intent.py train samples.tsv intent_model.json")
+    model = NgramScorer.train(_read_samples(sys.argv[2]))
+    model.save(sys.argv[3])
+    print(f"n-gram {len(model.weights)}개 저장: {sys.argv[3]}")
@@ -0,0 +1,277 @@
+"""
+대화 턴 백그라운드 실행 모듈
+
+채팅 입력 처리(기사 검색, GPT 응답)를 Streamlit 스크립트 실행 안에서 기다리지 않고
+프로세스 전역 스레드 풀의 작업(Job)으로 실행합니다.
+- 세션은 작업 ID만 보관하고, 화면은 rerun마다 작업의 진행 단계/스트리밍 중인 텍스트를 읽어 표시
+- 취소: 새 메시지가 오면 이전 작업에 취소를 요청하고, 작업은 progress() 호출 시점에 JobCancelled로 중단
+  (단계 사이, 요약 스트리밍 중 콜백마다 확인)
+- GPT 호출은 프로세스 전체에서 동시에 설정의 llm_max_concurrency개까지만 실행 (llm_slot())
+- 끝난 작업은 JOB_RETENTION초 동안 보관 후 삭제 (탭을 닫은 세션의 결과가 쌓이지 않도록)
+
+작업 함수 안에서는 Streamlit API를 호출하지 않습니다. (스크립트 실행 컨텍스트가 없음)
+"""
+import itertools
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+import metrics
+from settings import get_settings
+
+# 동시에 실행할 작업 수 (RSS/Playwright/GPT 대기가 대부분이라 CPU 수보다 크게)
+JOB_MAX_WORKERS = 8
+
+# 끝난 작업 보관 시간(초)
+JOB_RETENTION = 600
+
+# GPT 호출 슬롯을 기다리는 동안 취소 여부를 확인하는 간격(초)
+LLM_WAIT_POLL = 0.1
+
+# 작업 상태
+PENDING = 'pending'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+FINISHED_STATUSES = frozenset({DONE, FAILED, CANCELLED})
+
+# 현재 스레드에서 실행 중인 작업 (progress()/llm_slot()이 인자 없이 찾도록)
+_current_job = ContextVar('current_job', default=None)
+_job_ids = itertools.count(1)
+
+
+class JobCancelled(Exception):
+    """취소 요청된 작업을 중단할 때 발생 (작업 함수의 일반 예외 처리에서 다시 발생시킬 것)"""
+
+    # metrics.span()이 오류가 아닌 취소로 기록하도록 표시
+    cancelled = True
+
+
+# ==================== 작업 ====================
+class Job:
+    """
+    백그라운드 작업 하나의 상태 (작업 스레드가 쓰고 화면이 읽음)
+
+    Attributes:
+        id: 작업 ID (세션에 보관)
+        kind: 작업 종류 (화면 표시/구간 기록용)
+        status: PENDING, RUNNING, DONE, FAILED, CANCELLED
+        stage: 진행 단계 메시지
+        text: 스트리밍 중인 응답 텍스트
+        result: 작업 함수의 반환값 (DONE)
+        error: 오류 메시지 (FAILED)
+        notices: 작업 중 남긴 경고 메시지 (결과와 함께 표시)
+    """
+
+    def __init__(self, kind):
+        self.id = f"{os.getpid():x}-{next(_job_ids):x}"
+        self.kind = kind
+        self.status = PENDING
+        self.stage = ''
+        self.text = ''
+        self.result = None
+        self.error = None
+        self.notices = []
+        self.created_at = time.time()
+        self.finished_at = None
+        self._cancel = threading.Event()
+
+    @property
+    def done(self):
+        return self.status in FINISHED_STATUSES
+
+    @property
+    def cancel_requested(self):
+        return self._cancel.is_set()
+
+    def cancel(self):
+        """취소 요청 (실행 전이면 실행하지 않고, 실행 중이면 다음 progress() 호출에서 중단)"""
+        self._cancel.set()
+
+    def progress(self, stage=None, text=None):
+        """
+        진행 단계/스트리밍 텍스트 갱신 후 취소 여부 확인
+
+        Raises:
+            JobCancelled: 취소 요청된 경우
+        """
+        if stage is not None:
+            self.stage = stage
+        if text is not None:
+            self.text = text
+        if self._cancel.is_set():
+            raise JobCancelled(self.id)
+
+    def _finish(self, status, result=None, error=None):
+        self.result = result
+        self.error = error
+        self.finished_at = time.time()
+        self.status = status
+
+
+class JobManager:
+    """
+    작업 실행/조회 (프로세스당 하나, 모든 세션이 공유)
+
+    Args:
+        max_workers: 동시에 실행할 작업 수
+        retention: 끝난 작업 보관 시간(초)
+    """
+
+    def __init__(self, max_workers=JOB_MAX_WORKERS, retention=JOB_RETENTION):
+        self.retention = retention
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='chat-job')
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, func, *args, kind='job', **kwargs):
+        """
+        작업 실행 예약
+
+        Args:
+            func: 작업 함수 (func(job, *args, **kwargs) 형태로 호출)
+            kind: 작업 종류
+
+        Returns:
+            Job: 예약된 작업
+        """
+        job = Job(kind)
+        with self._lock:
+            self._prune()
+            self._jobs[job.id] = job
+        self._executor.submit(self._run, job, func, args, kwargs)
+        return job
+
+    def _run(self, job, func, args, kwargs):
+        if job.cancel_requested:
+            job._finish(CANCELLED)
+            return
+        job.status = RUNNING
+        token = _current_job.set(job)
+        try:
+            result = func(job, *args, **kwargs)
+        except JobCancelled:
+            job._finish(CANCELLED)
+        except Exception as e:
+            job._finish(FAILED, error=str(e))
+        else:
+            # 결과를 만든 뒤에 취소 요청이 왔어도 결과는 그대로 둠 (화면에서 사용 여부 결정)
+            job._finish(DONE, result=result)
+        finally:
+            _current_job.reset(token)
+
+    def get(self, job_id):
+        """작업 ID로 조회 (없거나 보관 기간이 지났으면 None)"""
+        if job_id is None:
+            return None
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id):
+        """작업 취소 요청 (작업이 없으면 None)"""
+        job = self.get(job_id)
+        if job is not None:
+            job.cancel()
+        return job
+
+    def stats(self):
+        """상태별 작업 수"""
+        with self._lock:
+            jobs = list(self._jobs.values())
+        counts = {status: 0 for status in (PENDING, RUNNING, DONE, FAILED, CANCELLED)}
+        for job in jobs:
+            counts[job.status] += 1
+        return counts
+
+    def _prune(self):
+        """보관 기간이 지난 끝난 작업 삭제 (잠금 안에서 호출)"""
+        cutoff = time.time() - self.retention
+        expired = [job_id for job_id, job in self._jobs.items()
+                   if job.finished_at is not None and job.finished_at < cutoff]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def shutdown(self):
+        """실행 중인 작업에 취소를 요청하고 스레드 풀 종료"""
+        with self._lock:
+            jobs = list(self._jobs.values())
+        for job in jobs:
+            job.cancel()
+        self._executor.shutdown(wait=False)
+
+
+# ==================== 작업 함수용 도우미 ====================
+def progress(stage=None, text=None):
+    """
+    현재 작업의 진행 단계/스트리밍 텍스트 갱신 (작업 밖에서는 아무 일도 하지 않음)
+
+    Raises:
+        JobCancelled: 현재 작업이 취소 요청된 경우
+    """
+    job = _current_job.get()
+    if job is not None:
+        job.progress(stage, text)
+
+
+def notify(message):
+    """현재 작업에 경고 메시지 추가 (작업 밖에서는 무시)"""
+    job = _current_job.get()
+    if job is not None:
+        job.notices.append(message)
+
+
+# ==================== GPT 동시 호출 제한 ====================
+class LLMLimiter:
+    """
+    프로세스 전체 GPT 동시 호출 수 제한
+
+    Args:
+        limit: 동시 호출 수 (None이면 현재 설정의 llm_max_concurrency, 설정이 바뀌면 다음 호출부터 반영)
+    """
+
+    def __init__(self, limit=None):
+        self._limit = limit
+        self.active = 0
+        self._condition = threading.Condition()
+
+    @property
+    def limit(self):
+        return get_settings().llm_max_concurrency if self._limit is None else self._limit
+
+    @contextmanager
+    def slot(self):
+        """
+        호출 슬롯을 얻을 때까지 대기 (기다리는 동안 현재 작업의 취소 여부 확인)
+
+        Raises:
+            JobCancelled: 기다리는 중 현재 작업이 취소 요청된 경우
+        """
+        job = _current_job.get()
+        with self._condition:
+            if self.active >= max(1, self.limit):
+                with metrics.span("llm_wait"):
+                    while self.active >= max(1, self.limit):
+                        if job is not None and job.cancel_requested:
+                            raise JobCancelled(job.id)
+                        self._condition.wait(LLM_WAIT_POLL)
+            self.active += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self.active -= 1
+                self._condition.notify()
+
+
+# 프로세스 전역 작업 관리자와 GPT 호출 제한
+manager = JobManager()
+llm_limiter = LLMLimiter()
+
+
+def llm_slot():
+    """GPT 호출을 감쌀 컨텍스트 매니저 (프로세스 전체 동시 호출 수 제한)"""
+    return llm_limiter.slot()
@@ -0,0 +1,519 @@
+"""
+구간별 지연 시간 측정 모듈
+
+기사 검색 한 번은 키워드 추출 → RSS/Playwright 수집 → SQLite 저장 → Notion 대기열 → GPT 요약을
+차례로 거치므로, 구간(span)마다 걸린 시간을 기록하여 느린 응답의 시간이 어디에 쓰였는지 확인합니다.
+- 측정: `with metrics.span("이름"):` 또는 `@metrics.timed("이름")`
+  (with 문으로 감쌀 수 없는 구간은 `metrics.record("이름", 초)`)
+- 같은 컨텍스트에서 바깥 구간 안에 열린 구간은 같은 trace로 묶임 (요청 한 번의 구간별 내역)
+  (스레드 풀에 넘기는 작업은 contextvars.copy_context().run으로 실행해야 trace가 이어짐)
+- cancelled 속성이 참인 예외(jobs.JobCancelled)로 끝난 구간은 오류가 아닌 취소로 집계
+- 기록은 메모리 버퍼에 모았다가 JSONL 파일(metrics.jsonl)에 추가하고, 파일이 METRICS_MAX_BYTES를
+  넘으면 metrics.jsonl.1로 옮긴 뒤 새로 시작 (최근 기록만 유지, 앱/수집기 프로세스가 같은 파일 사용)
+- 비활성화하면 span()은 아무 일도 하지 않는 공용 객체를 반환 (시각 측정/기록 없음)
+- 구간별 누적 횟수/합계/오류/취소 수는 파일에 옮길 때마다 recorder.totals_store(storage 모듈)의
+  span_totals 테이블에 더하므로, 기록 파일이 교체되어도 Prometheus 카운터가 줄어들지 않음
+
+Prometheus 텍스트 형식 엔드포인트:
+    python -m metrics [--port 9464]    # http://127.0.0.1:9464/metrics
+"""
+import argparse
+import atexit
+import functools
+import itertools
+import json
+import os
+import threading
+import time
+from contextvars import ContextVar
+from pathlib import Path
+
+from settings import get_settings
+
+METRICS_PATH = Path("metrics.jsonl")
+
+# 기록 파일 최대 크기(바이트), 넘으면 .1 파일로 옮기고 새로 시작
+METRICS_MAX_BYTES = 5 * 1024 * 1024
+
+# 버퍼 항목 수/시간(초)이 이만큼 쌓이면 파일에 기록 (가장 바깥 구간이 끝날 때도 기록)
+FLUSH_SIZE = 64
+FLUSH_INTERVAL = 5.0
+
+# 구간별 통계의 백분위
+QUANTILES = (50, 95, 99)
+
+# Prometheus 엔드포인트 기본 포트
+DEFAULT_PORT = 9464
+
+# 현재 스레드/컨텍스트의 trace ID (가장 바깥 구간에서 생성, 프로세스 ID + 일련번호)
+_current_trace = ContextVar('metrics_trace', default=None)
+_trace_ids = itertools.count(1)
+
+
+# ==================== 기록 저장소 ====================
+class MetricsRecorder:
+    """
+    구간 기록을 버퍼에 모아 JSONL 파일에 추가하는 저장소
+
+    Args:
+        path: 기록 파일 경로
+        max_bytes: 기록 파일 최대 크기(바이트)
+        enabled: 측정 여부 (False면 span()/timed()가 아무 일도 하지 않음, None이면 현재 설정의 metrics_enabled)
+    """
+
+    def __init__(self, path=METRICS_PATH, max_bytes=METRICS_MAX_BYTES, enabled=None):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self._enabled = enabled
+        # 누적 통계 저장소 (add_span_totals/get_span_totals를 가진 storage 모듈, DB를 초기화한 쪽에서 지정)
+        self.totals_store = None
+        self._buffer = []
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        # 이 프로세스의 누적 통계, 저장소에 아직 더하지 않은 증가분
+        self._totals = {}
+        self._unsaved = {}
+
+    @property
+    def enabled(self):
+        return get_settings().metrics_enabled if self._enabled is None else self._enabled
+
+    @enabled.setter
+    def enabled(self, enabled):
+        self._enabled = enabled
+
+    @property
+    def backup_path(self):
+        return self.path.with_name(self.path.name + '.1')
+
+    def record(self, entry, flush=False):
+        """구간 기록 추가 (flush=True이거나 버퍼가 차면 파일에 기록)"""
+        with self._lock:
+            self._buffer.append(entry)
+            flush = (flush or len(self._buffer) >= FLUSH_SIZE
+                     or time.monotonic() - self._last_flush >= FLUSH_INTERVAL)
+        if flush:
+            self.flush()
+
+    def flush(self):
+        """버퍼의 기록을 파일에 추가하고 누적 통계 갱신 (기록 실패는 무시하여 본 작업을 막지 않음)"""
+        with self._lock:
+            entries, self._buffer = self._buffer, []
+            self._last_flush = time.monotonic()
+            if not entries:
+                return
+            data = ''.join(json.dumps(entry, ensure_ascii=False) + '\n' for entry in entries)
+            try:
+                if self.path.exists() and self.path.stat().st_size + len(data) > self.max_bytes:
+                    os.replace(self.path, self.backup_path)
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.write(data)
+            except OSError:
+                pass
+            for entry in entries:
+                _add_entry(self._totals, entry)
+                _add_entry(self._unsaved, entry)
+            store = self.totals_store
+            unsaved = self._unsaved
+            if store is not None:
+                self._unsaved = {}
+
+        if store is not None:
+            try:
+                store.add_span_totals(unsaved)
+            except Exception:
+                # 다음 기록 때 다시 시도
+                with self._lock:
+                    _merge_totals(self._unsaved, unsaved)
+
+    def totals(self):
+        """
+        구간별 누적 통계 (저장소가 있으면 모든 프로세스의 합계, 없으면 이 프로세스 시작 후 합계)
+
+        Returns:
+            dict: {이름: {'count', 'errors', 'cancelled', 'sum_ms'}}
+        """
+        with self._lock:
+            store = self.totals_store
+            unsaved = {name: dict(totals) for name, totals in self._unsaved.items()}
+            local = {name: dict(totals) for name, totals in self._totals.items()}
+        if store is None:
+            return local
+        try:
+            totals = store.get_span_totals()
+        except Exception:
+            return local
+        _merge_totals(totals, unsaved)
+        return totals
+
+    def stamp(self):
+        """기록 파일들의 (수정 시각, 크기) (조회 결과 캐시 키용)"""
+        stamps = []
+        for path in (self.backup_path, self.path):
+            try:
+                stat = path.stat()
+                stamps.append((stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                stamps.append(None)
+        return tuple(stamps)
+
+    def read(self):
+        """
+        파일에 기록된 구간 목록 (오래된 순, 손상된 줄은 건너뜀)
+
+        Returns:
+            list: {'ts', 'name', 'ms', 'ok', 'trace', ...} 딕셔너리 리스트
+        """
+        entries = []
+        for path in (self.backup_path, self.path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        try:
+                            entries.append(json.loads(line))
+                        except ValueError:
+                            continue
+            except OSError:
+                continue
+        return entries
+
+
+def _add_entry(totals, entry):
+    """구간 기록 하나를 누적 통계에 더하기"""
+    stats = totals.setdefault(entry.get('name'), {'count': 0, 'errors': 0, 'cancelled': 0, 'sum_ms': 0.0})
+    stats['count'] += 1
+    stats['sum_ms'] += entry.get('ms', 0.0)
+    if entry.get('cancelled'):
+        stats['cancelled'] += 1
+    elif not entry.get('ok', True):
+        stats['errors'] += 1
+
+
+def _merge_totals(totals, other):
+    """누적 통계 other를 totals에 더하기"""
+    for name, stats in other.items():
+        target = totals.setdefault(name, {'count': 0, 'errors': 0, 'cancelled': 0, 'sum_ms': 0.0})
+        for key, value in stats.items():
+            target[key] += value
+
+
+# 프로세스 전역 저장소
+recorder = MetricsRecorder()
+atexit.register(recorder.flush)
+
+
+# ==================== 구간 측정 ====================
+class _Span:
+    """측정 중인 구간 (with 문 안에서 set()으로 속성 추가)"""
+    __slots__ = ('name', 'attrs', 'trace', '_token', '_started_at', '_start')
+
+    def __init__(self, name, attrs):
+        self.name = name
+        self.attrs = attrs
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+    def __enter__(self):
+        self.trace = _current_trace.get()
+        self._token = None
+        if self.trace is None:
+            self.trace = f"{os.getpid():x}-{next(_trace_ids):x}"
+            self._token = _current_trace.set(self.trace)
+        self._started_at = time.time()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed = time.perf_counter() - self._start
+        root = self._token is not None
+        if root:
+            _current_trace.reset(self._token)
+        entry = {
+            'ts': round(self._started_at, 3),
+            'name': self.name,
+            'ms': round(elapsed * 1000, 3),
+            'ok': exc_type is None,
+            'trace': self.trace,
+        }
+        if getattr(exc, 'cancelled', False):
+            entry['cancelled'] = True
+        if self.attrs:
+            entry['attrs'] = self.attrs
+        # 가장 바깥 구간이 끝나면 바로 기록 (요청이 끝난 직후 패널/엔드포인트에 반영)
+        recorder.record(entry, flush=root)
+        return False
+
+
+class _NoopSpan:
+    """측정 비활성화 시 사용하는 빈 구간"""
+    __slots__ = ()
+
+    def set(self, **attrs):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+def span(name, **attrs):
+    """
+    구간 측정 컨텍스트 매니저
+
+    Args:
+        name: 구간 이름 (통계는 이름별로 집계)
+        **attrs: 기록에 함께 남길 속성
+
+    Returns:
+        with 문에 쓸 구간 객체 (비활성화 시 아무 일도 하지 않는 공용 객체)
+    """
+    if not recorder.enabled:
+        return _NOOP_SPAN
+    return _Span(name, attrs)
+
+
+def record(name, seconds, started_at=None, **attrs):
+    """
+    with 문으로 감쌀 수 없는 구간(예: Streamlit 스크립트 한 번 실행)을 직접 기록
+
+    Args:
+        name: 구간 이름
+        seconds: 걸린 시간(초)
+        started_at: 시작 시각(epoch 초, 기본값: 지금 - seconds)
+        **attrs: 기록에 함께 남길 속성
+    """
+    if not recorder.enabled:
+        return
+    if started_at is None:
+        started_at = time.time() - seconds
+    entry = {
+        'ts': round(started_at, 3),
+        'name': name,
+        'ms': round(seconds * 1000, 3),
+        'ok': True,
+        'trace': f"{os.getpid():x}-{next(_trace_ids):x}",
+    }
+    if attrs:
+        entry['attrs'] = attrs
+    recorder.record(entry, flush=True)
+
+
+def timed(name=None):
+    """
+    함수 실행 시간을 구간으로 기록하는 데코레이터
+
+    Args:
+        name: 구간 이름 (기본값: 함수 이름)
+    """
+    def decorator(func):
+        span_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not recorder.enabled:
+                return func(*args, **kwargs)
+            with _Span(span_name, {}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# ==================== 통계 ====================
+def percentile(values, pct):
+    """정렬된 값 목록의 백분위 값 (nearest-rank)"""
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, max(0, round(pct / 100 * len(values)) - 1))
+    return values[index]
+
+
+def summarize_spans(entries, since=None):
+    """
+    구간 이름별 지연 시간 통계
+
+    Args:
+        entries: 구간 기록 목록
+        since: 이 시각(time.time()) 이후에 시작한 구간만 집계 (None이면 전체)
+
+    Returns:
+        dict: {이름: {'count', 'errors', 'cancelled', 'sum_ms', 'max_ms', 'p50', 'p95', 'p99'}} (이름순)
+    """
+    durations = {}
+    errors = {}
+    cancelled = {}
+    for entry in entries:
+        if since is not None and entry.get('ts', 0) < since:
+            continue
+        name = entry.get('name')
+        durations.setdefault(name, []).append(entry.get('ms', 0.0))
+        if entry.get('cancelled'):
+            cancelled[name] = cancelled.get(name, 0) + 1
+        elif not entry.get('ok', True):
+            errors[name] = errors.get(name, 0) + 1
+
+    summary = {}
+    for name in sorted(durations):
+        values = sorted(durations[name])
+        stats = {
+            'count': len(values),
+            'errors': errors.get(name, 0),
+            'cancelled': cancelled.get(name, 0),
+            'sum_ms': sum(values),
+            'max_ms': values[-1],
+        }
+        for pct in QUANTILES:
+            stats[f'p{pct}'] = percentile(values, pct)
+        summary[name] = stats
+    return summary
+
+
+def latest_trace(entries, root_name):
+    """
+    root_name 구간으로 시작한 가장 최근 요청의 구간 목록
+
+    Returns:
+        list: 같은 trace의 구간 기록 (시작 시각순), 없으면 빈 리스트
+    """
+    for entry in reversed(entries):
+        if entry.get('name') == root_name:
+            trace = entry.get('trace')
+            # 시작 시각이 같으면 긴 구간(바깥 구간)이 먼저
+            return sorted((e for e in entries if e.get('trace') == trace),
+                          key=lambda e: (e.get('ts', 0), -e.get('ms', 0)))
+    return []
+
+
+def prometheus_text(summary, totals):
+    """
+    구간별 통계를 Prometheus 텍스트 형식으로 변환
+
+    Args:
+        summary: summarize_spans() 결과 (최근 기록 파일 기준 백분위)
+        totals: 누적 통계 (_sum/_count와 오류/취소 카운터, 기록 파일이 교체되어도 줄지 않음)
+
+    Returns:
+        str: summary 타입 지연 시간(초)과 오류/취소 수 카운터
+    """
+    names = sorted(set(summary) | set(totals), key=str)
+    empty = {'count': 0, 'errors': 0, 'cancelled': 0, 'sum_ms': 0.0}
+    lines = [
+        '# HELP news_span_duration_seconds Span latency (quantiles over the metrics log, sum/count cumulative).',
+        '# TYPE news_span_duration_seconds summary',
+    ]
+    for name in names:
+        label = _label_value(name)
+        if name in summary:
+            for pct in QUANTILES:
+                lines.append(f'news_span_duration_seconds{{span="{label}",quantile="{pct / 100}"}} '
+                             f'{summary[name][f"p{pct}"] / 1000:.6f}')
+        stats = totals.get(name, empty)
+        lines.append(f'news_span_duration_seconds_sum{{span="{label}"}} {stats["sum_ms"] / 1000:.6f}')
+        lines.append(f'news_span_duration_seconds_count{{span="{label}"}} {stats["count"]}')
+    lines.append('# HELP news_span_errors_total Spans that ended with an exception.')
+    lines.append('# TYPE news_span_errors_total counter')
+    for name in names:
+        lines.append(f'news_span_errors_total{{span="{_label_value(name)}"}} {totals.get(name, empty)["errors"]}')
+    lines.append('# HELP news_span_cancelled_total Spans that ended because their job was cancelled.')
+    lines.append('# TYPE news_span_cancelled_total counter')
+    for name in names:
+        lines.append(f'news_span_cancelled_total{{span="{_label_value(name)}"}} '
+                     f'{totals.get(name, empty)["cancelled"]}')
+    return '\n'.join(lines) + '\n'
+
+
+def _label_value(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+# ==================== Prometheus 엔드포인트 ====================
+_summary_cache = (None, None)
+_summary_lock = threading.Lock()
+
+
+def load_summary():
+    """기록 파일 전체의 구간별 통계 (파일이 바뀌지 않았으면 이전 결과 재사용)"""
+    global _summary_cache
+    recorder.flush()
+    stamp = recorder.stamp()
+    with _summary_lock:
+        if _summary_cache[0] != stamp:
+            _summary_cache = (stamp, summarize_spans(recorder.read()))
+        return _summary_cache[1]
+
+
+def load_totals():
+    """구간별 누적 통계 (버퍼의 기록을 먼저 반영)"""
+    recorder.flush()
+    return recorder.totals()
+
+
+def _create_server(host, port):
+    """엔드포인트 HTTP 서버 생성 (http.server는 엔드포인트를 켤 때만 import)"""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?', 1)[0] not in ('/', '/metrics'):
+                self.send_error(404)
+                return
+            body = prometheus_text(load_summary(), load_totals()).encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            # 수집기가 주기적으로 요청하므로 접근 로그는 출력하지 않음
+            pass
+
+    return ThreadingHTTPServer((host, port), MetricsHandler)
+
+
+def start_server(port=DEFAULT_PORT, host='127.0.0.1'):
+    """
+    Prometheus 텍스트 형식 엔드포인트를 백그라운드 스레드로 실행
+
+    포트를 이미 쓰고 있으면 OSError가 발생합니다.
+
+    Returns:
+        ThreadingHTTPServer: 실행 중인 서버 (shutdown()으로 종료)
+    """
+    server = _create_server(host, port)
+    threading.Thread(target=server.serve_forever, name='metrics-server', daemon=True).start()
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="구간별 지연 시간 Prometheus 엔드포인트")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--path", default=str(METRICS_PATH), help="구간 기록 파일 경로")
+    parser.add_argument("--db", help="누적 통계를 읽을 SQLite 파일 (기본값: 앱과 같은 DB)")
+    args = parser.parse_args(argv)
+
+    import storage
+    if args.db:
+        storage.configure(args.db)
+    storage.init_database()
+    recorder.totals_store = storage
+    recorder.path = Path(args.path)
+    server = _create_server(args.host, args.port)
+    print(f"http://{args.host}:{args.port}/metrics ({recorder.path})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,110 @@
+"""
+검색한 기사 처리 모듈 (저장 → Notion 대기열 → 비슷한 기사 제거 → GPT 요약)
+
+Streamlit 없이 실행되므로 app.py의 대화 턴 작업과 benchmark.py가 같은 코드를 사용합니다.
+검색 히스토리는 검색 결과 공유 캐시를 거친 요청마다 저장해야 하므로 여기서 저장하지 않습니다. (app.search_news)
+"""
+import dedup
+import jobs
+import metrics
+import notion_sync
+import query_parser
+import storage
+import summarizer
+
+NO_ARTICLES_MESSAGE = "❌ 검색 결과가 없습니다. 다른 키워드로 시도해주세요."
+
+
+@metrics.timed("save_articles")
+def save_articles(articles, keyword):
+    """
+    기사 목록을 데이터베이스에 한 번에 저장
+
+    Returns:
+        tuple: (새로 저장된 기사 수, 중복 기사 수)
+    """
+    try:
+        return storage.save_articles(articles, keyword)
+    except Exception as e:
+        # 대화 턴 작업 안에서 호출되므로 오류는 작업에 남겨 결과와 함께 표시
+        jobs.notify(f"기사 저장 중 오류: {str(e)}")
+        return 0, 0
+
+
+@metrics.timed("notion_enqueue")
+def queue_articles_for_notion(articles, keyword):
+    """
+    기사를 Notion 전송 대기열에 추가
+
+    실제 전송은 백그라운드 스레드가 속도 제한/재시도를 적용하여 처리하므로
+    응답 생성이 Notion API를 기다리지 않습니다.
+
+    Returns:
+        int: 새로 대기열에 들어간 기사 수
+    """
+    try:
+        return notion_sync.enqueue_articles(articles, keyword)
+    except Exception:
+        # Notion 대기열 오류는 조용히 처리 (SQLite는 정상 작동)
+        return 0
+
+
+def format_article_list(articles, user_query, error):
+    """GPT 요약 실패 시 보여줄 기사 목록"""
+    result = f"📰 **'{user_query}' 관련 기사 {len(articles)}건**\n\n"
+
+    for idx, article in enumerate(articles, 1):
+        result += f"**[{idx}] {article['title']}**\n"
+        result += f"🔗 {article['link']}\n"
+        result += f"📅 {article['published']}\n\n"
+
+    result += f"\n⚠️ AI 요약 생성 실패: {str(error)}\n위 기사 링크를 클릭하여 자세한 내용을 확인하세요."
+    return result
+
+
+def summarize_articles(client, articles, user_query, keyword=None, notion_enabled=False, on_delta=None,
+                       model=summarizer.SUMMARY_MODEL, cache=summarizer.summary_cache):
+    """
+    수집된 기사를 저장하고 GPT로 요약
+
+    같은 기사 묶음은 요약 캐시에서 바로 응답하고,
+    캐시에 없으면 스트리밍으로 받은 텍스트를 on_delta로 전달합니다.
+
+    Args:
+        client: OpenAI 호환 클라이언트
+        articles: 기사 리스트
+        user_query: 사용자 원본 질문
+        keyword: 저장에 사용할 검색 키워드 (None이면 user_query에서 추출)
+        notion_enabled: Notion 전송 대기열에 추가할지 여부
+        on_delta: 스트리밍 중 지금까지 받은 텍스트를 받는 콜백 (화면 표시용)
+        model: 모델 이름
+        cache: 요약 캐시 (None이면 캐시 사용 안 함)
+
+    Returns:
+        tuple: (요약된 기사 정보, GPT 요약 성공 여부)
+    """
+    if not articles:
+        return NO_ARTICLES_MESSAGE, False
+
+    # 기사를 데이터베이스에 저장
+    if keyword is None:
+        keyword = query_parser.extract_search_keyword(user_query)
+    save_articles(articles, keyword)
+
+    # Notion 전송 대기열에 추가 (활성화된 경우)
+    if notion_enabled:
+        queue_articles_for_notion(articles, keyword)
+
+    # 같은 기사/같은 소식(다른 언론사)은 하나만 요약에 사용
+    articles = dedup.pick_representatives(articles)
+
+    try:
+        # GPT에게 요약 요청 (캐시 적중 시 호출 없음)
+        jobs.progress(stage=f"🧠 기사 {len(articles)}건 요약 중...")
+        return summarizer.summarize(client, articles, user_query, on_delta=on_delta, model=model, cache=cache), True
+
+    except jobs.JobCancelled:
+        raise
+    except Exception as e:
+        # GPT 요약 실패 시 기본 포맷으로 표시
+        return format_article_list(articles, user_query, e), False
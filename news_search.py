@@ -0,0 +1,185 @@
+"""
+기사 검색 소스 오케스트레이션
+
+Google News RSS, Playwright(네이버 뉴스), 대체 키워드 RSS를 순서대로 시도하던 방식 대신
+모든 소스를 동시에 실행하고 소스별 제한 시간 안에 도착한 결과를 링크 기준으로 합칩니다.
+- 우선순위가 높은 소스가 결과를 내면 나머지 소스는 기다리지 않고 취소
+- 대체 키워드 소스는 기본 소스(RSS, Playwright)가 모두 빈 결과일 때만 사용
+- 최악의 경우 지연은 각 소스 지연의 합이 아니라 가장 긴 소스 제한 시간
+"""
+import contextvars
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import crawler
+import dedup
+import feeds
+import metrics
+from settings import get_settings
+
+# 원본 입력에서 추가로 시도할 대체 키워드 수
+MAX_ALTERNATIVE_KEYWORDS = 3
+
+# name: 표시용 이름, keyword: 이 소스가 검색한 키워드, fetch: fetch(cancel_event) -> 기사 리스트,
+# deadline: 제한 시간(초), fallback: True면 기본 소스가 모두 빈 결과일 때만 사용
+Source = namedtuple("Source", ["name", "keyword", "fetch", "deadline", "fallback"])
+
+
+def merge_articles(result_lists):
+    """여러 소스의 기사 목록을 순서대로 합치면서 링크 중복 제거 (정규화 URL 기준)"""
+    merged = []
+    seen = set()
+    for articles in result_lists:
+        for article in articles or []:
+            link = article.get('link')
+            if not link:
+                continue
+            canonical_link = dedup.canonicalize_url(link)
+            if canonical_link not in seen:
+                seen.add(canonical_link)
+                merged.append(article)
+    return merged
+
+
+def _finished_prefix(results):
+    """앞에서부터 완료된 결과만 반환 (진행 중인 소스를 만나면 멈춤)"""
+    prefix = []
+    for result in results:
+        if result is None:
+            break
+        prefix.append(result)
+    return prefix
+
+
+def _decide(sources, results, max_results):
+    """
+    현재까지의 결과로 검색을 끝낼 수 있는지 판단
+
+    Returns:
+        tuple | None: 끝낼 수 있으면 (기사 리스트, 키워드), 아직이면 None
+    """
+    primary = [i for i, source in enumerate(sources) if not source.fallback]
+    fallback = [i for i, source in enumerate(sources) if source.fallback]
+
+    # 기본 소스: 우선순위 순서대로 완료된 결과가 있으면 바로 종료
+    # (기존처럼 RSS 결과가 있으면 Playwright를 기다리지 않음, 이미 끝난 소스의 결과는 합침)
+    prefix = _finished_prefix([results[i] for i in primary])
+    merged = merge_articles(prefix)
+    if merged:
+        return merged[:max_results], sources[primary[0]].keyword
+    if len(prefix) < len(primary):
+        return None
+
+    # 기본 소스가 모두 빈 결과 → 대체 소스 중 앞 순서부터 첫 번째 결과 사용
+    prefix = _finished_prefix([results[i] for i in fallback])
+    for i, result in zip(fallback, prefix):
+        if result:
+            return merge_articles([result])[:max_results], sources[i].keyword
+    if len(prefix) < len(fallback):
+        return None
+    return [], None
+
+
+def race_sources(sources, max_results):
+    """
+    소스들을 동시에 실행하고, 결과가 충분해지는 즉시 나머지를 취소하고 반환
+
+    Args:
+        sources: Source 목록 (앞쪽이 우선순위 높음)
+        max_results: 필요한 기사 수
+
+    Returns:
+        tuple: (기사 리스트, 결과를 낸 키워드 또는 None)
+    """
+    if not sources:
+        return [], None
+
+    start = time.monotonic()
+    cancel_event = threading.Event()
+    executor = ThreadPoolExecutor(max_workers=len(sources), thread_name_prefix="news-source")
+    # 소스별로 현재 컨텍스트를 복사해서 실행 (구간 trace, 대화 턴 작업이 작업 스레드에서도 이어지도록)
+    futures = {
+        executor.submit(contextvars.copy_context().run, source.fetch, cancel_event): i
+        for i, source in enumerate(sources)
+    }
+
+    # None: 진행 중, list: 완료 (실패/제한 시간 초과는 빈 리스트)
+    results = [None] * len(sources)
+    pending = set(futures)
+    try:
+        while True:
+            elapsed = time.monotonic() - start
+            for future in list(pending):
+                if elapsed >= sources[futures[future]].deadline:
+                    results[futures[future]] = []
+                    pending.discard(future)
+
+            decision = _decide(sources, results, max_results)
+            if decision is not None:
+                return decision
+
+            next_deadline = min(sources[futures[f]].deadline for f in pending) - elapsed
+            done, pending = wait(pending, timeout=max(next_deadline, 0), return_when=FIRST_COMPLETED)
+            for future in done:
+                error = future.exception()
+                results[futures[future]] = [] if error is not None else (future.result() or [])
+    finally:
+        # 남은 소스 취소 (시작 전이면 실행하지 않고, 실행 중이면 결과를 버림)
+        cancel_event.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def build_sources(keyword, user_input, max_results=5, rss_deadline=None, playwright_deadline=None):
+    """검색 키워드와 원본 입력으로 실행할 소스 목록 생성 (우선순위 순, 제한 시간이 None이면 설정값)"""
+    settings = get_settings()
+    if rss_deadline is None:
+        rss_deadline = settings.rss_deadline
+    if playwright_deadline is None:
+        playwright_deadline = settings.playwright_deadline
+    sources = [
+        Source("Google News RSS", keyword,
+               lambda cancel_event: feeds.fetch_feed(keyword, max_results=max_results), rss_deadline, False),
+    ]
+
+    if crawler.PLAYWRIGHT_AVAILABLE:
+        sources.append(Source(
+            "Playwright (Naver News)", keyword,
+            lambda cancel_event: crawler.fetch_naver_news(
+                keyword, max_results=max_results, cancel_event=cancel_event, timeout=playwright_deadline
+            ),
+            playwright_deadline, False,
+        ))
+
+    # 원본 입력의 단어들로도 동시에 검색 (기본 소스가 모두 빈 결과일 때만 사용)
+    if len(keyword) > 2:
+        alternatives = [w for w in dict.fromkeys(user_input.split()) if len(w) >= 2 and w != keyword]
+        for alt_keyword in alternatives[:MAX_ALTERNATIVE_KEYWORDS]:
+            sources.append(Source(
+                "Google News RSS (대체 키워드)", alt_keyword,
+                lambda cancel_event, k=alt_keyword: feeds.fetch_feed(k, max_results=max_results),
+                rss_deadline, True,
+            ))
+
+    return sources
+
+
+@metrics.timed("gather_articles")
+def gather_articles(keyword, user_input, max_results=5, rss_deadline=None, playwright_deadline=None):
+    """
+    모든 검색 소스를 동시에 실행하여 기사 수집
+
+    Args:
+        keyword: 추출된 검색 키워드
+        user_input: 사용자 원본 입력 (대체 키워드 추출용)
+        max_results: 최대 기사 수
+        rss_deadline: RSS 소스 제한 시간(초, None이면 설정값)
+        playwright_deadline: Playwright 소스 제한 시간(초, None이면 설정값)
+
+    Returns:
+        tuple: (기사 리스트, 실제로 결과를 낸 키워드)
+    """
+    sources = build_sources(keyword, user_input, max_results, rss_deadline, playwright_deadline)
+    articles, used_keyword = race_sources(sources, max_results)
+    return articles, used_keyword or keyword
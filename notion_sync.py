@@ -0,0 +1,217 @@
+"""
+Notion 동기화 모듈
+
+기사 저장 요청 경로에서 Notion API를 직접 호출하지 않고,
+SQLite 대기열(outbox)에 넣은 뒤 백그라운드 작업 스레드가 전송합니다.
+- Notion API 제한(평균 초당 3회)에 맞춰 토큰 버킷으로 호출 간격 조절
+- 실패 시 지수 백오프로 재시도 (429 응답의 Retry-After 우선), 잘못된 요청은 재시도하지 않음
+- 전송한 링크는 페이지 ID와 함께 기록하여 다시 전송하지 않음
+- 대기열이 DB에 있으므로 재시작해도 남은 항목을 이어서 전송
+"""
+import atexit
+import threading
+import time
+
+import metrics
+import storage
+
+# Notion API 평균 허용 속도(초당 요청 수)와 순간 최대 요청 수
+NOTION_RATE_PER_SECOND = 3.0
+NOTION_BURST = 3
+
+# 한 번에 대기열에서 가져올 항목 수, 가져간 항목의 예약 시간(초)
+SYNC_BATCH_SIZE = 10
+SYNC_LEASE_SECONDS = 60
+
+# 새 항목이 없을 때 대기열을 다시 확인하는 간격(초)
+SYNC_POLL_INTERVAL = 5.0
+
+# 재시도: 첫 대기 시간(초), 최대 대기 시간(초), 최대 시도 횟수
+RETRY_BASE_DELAY = 2.0
+RETRY_MAX_DELAY = 600.0
+MAX_ATTEMPTS = 8
+
+# 재시도해도 결과가 같은 응답 코드 (요청 내용 오류, 권한 없음 등)
+PERMANENT_ERROR_STATUSES = {400, 401, 403, 404}
+
+
+class TokenBucket:
+    """
+    토큰 버킷 속도 제한
+
+    Args:
+        rate: 초당 채워지는 토큰 수
+        capacity: 최대 보관 토큰 수 (순간 최대 요청 수)
+    """
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """토큰 하나를 쓸 수 있을 때까지 대기"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+def build_page_properties(title, link, keyword, published_at, summary):
+    """
+    기사를 Notion 데이터베이스 페이지 속성으로 변환
+
+    발행일은 정규화된 UTC 시각(published_at)을 ISO 8601로 보냅니다.
+    (RSS 원문 형식 'Mon, 06 Jan 2025 ...'은 Notion date에서 거부됨)
+    """
+    if published_at:
+        start = published_at.replace(' ', 'T') + '+00:00'
+    else:
+        start = time.strftime('%Y-%m-%dT%H:%M:%S%z')
+    return {
+        "제목": {"title": [{"text": {"content": title[:100]}}]},  # Notion 제한으로 100자 제한
+        "링크": {"url": link},
+        "키워드": {"select": {"name": keyword}},
+        "발행일": {"date": {"start": start}},
+        "요약": {"rich_text": [{"text": {"content": (summary or '')[:1000]}}]},  # 요약 1000자 제한
+    }
+
+
+def retry_delay(attempts, error=None):
+    """
+    다음 재시도까지 대기 시간(초)
+
+    429 응답에 Retry-After 헤더가 있으면 그 값을 우선 사용합니다.
+    """
+    headers = getattr(error, 'headers', None)
+    if getattr(error, 'status', None) == 429 and headers is not None:
+        try:
+            return float(headers.get('retry-after'))
+        except (TypeError, ValueError):
+            pass
+    return min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** (attempts - 1))
+
+
+class NotionSyncWorker(threading.Thread):
+    """
+    Notion 대기열 전송 스레드
+
+    Args:
+        client: notion_client.Client
+        database_id: 기사를 저장할 Notion 데이터베이스 ID
+        rate: 초당 최대 요청 수
+    """
+
+    def __init__(self, client, database_id, rate=NOTION_RATE_PER_SECOND):
+        super().__init__(daemon=True, name="notion-sync")
+        self.client = client
+        self.database_id = database_id
+        self.bucket = TokenBucket(rate, NOTION_BURST)
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+
+        # 상태 표시용 통계
+        self.sent = 0
+        self.failures = 0
+
+    def notify(self):
+        """새 항목이 들어왔음을 알림 (대기 중이면 바로 전송 시작)"""
+        self._wakeup.set()
+
+    def stop(self):
+        """작업 중지 (진행 중인 요청은 마치고 종료)"""
+        self._stopped.set()
+        self._wakeup.set()
+
+    def run(self):
+        while not self._stopped.is_set():
+            try:
+                rows = storage.claim_notion_batch(time.time(), SYNC_BATCH_SIZE, SYNC_LEASE_SECONDS)
+            except Exception:
+                rows = []
+
+            for row in rows:
+                if self._stopped.is_set():
+                    # 예약만 된 항목은 lease가 끝나면 다시 전송 대상이 됨
+                    return
+                self._send(*row)
+
+            if len(rows) < SYNC_BATCH_SIZE:
+                self._wakeup.wait(self._idle_timeout())
+                self._wakeup.clear()
+
+    def _idle_timeout(self):
+        """다음 재시도 예정 시각까지 (최대 SYNC_POLL_INTERVAL초) 대기"""
+        try:
+            next_attempt_at = storage.next_notion_attempt_at()
+        except Exception:
+            return SYNC_POLL_INTERVAL
+        if next_attempt_at is None:
+            return SYNC_POLL_INTERVAL
+        return min(SYNC_POLL_INTERVAL, max(0.0, next_attempt_at - time.time()))
+
+    def _send(self, outbox_id, link, title, keyword, published_at, summary, attempts):
+        self.bucket.acquire()
+        attempts += 1
+        try:
+            with metrics.span("notion_create_page"):
+                page = self.client.pages.create(
+                    parent={"database_id": self.database_id},
+                    properties=build_page_properties(title, link, keyword, published_at, summary)
+                )
+        except Exception as e:
+            self.failures += 1
+            status = getattr(e, 'status', None)
+            if status in PERMANENT_ERROR_STATUSES or attempts >= MAX_ATTEMPTS:
+                next_attempt_at = None
+            else:
+                next_attempt_at = time.time() + retry_delay(attempts, e)
+            storage.retry_notion(outbox_id, attempts, next_attempt_at, f"{type(e).__name__}: {e}"[:500])
+            return
+
+        self.sent += 1
+        storage.complete_notion(outbox_id, link, page.get("id", ""), time.time())
+
+
+_worker = None
+_worker_lock = threading.Lock()
+
+
+def start_worker(client, database_id):
+    """
+    전송 스레드 시작 (프로세스당 하나)
+
+    이미 실행 중이면 클라이언트와 데이터베이스 ID만 바꿔서 반환합니다.
+    (설정이 바뀌어도 스레드를 새로 만들지 않음)
+    """
+    global _worker
+    with _worker_lock:
+        if _worker is None or not _worker.is_alive():
+            _worker = NotionSyncWorker(client, database_id)
+            _worker.start()
+            atexit.register(_worker.stop)
+        else:
+            _worker.client = client
+            _worker.database_id = database_id
+    return _worker
+
+
+def enqueue_articles(articles, keyword):
+    """
+    기사 목록을 Notion 전송 대기열에 추가 (API 호출 없이 바로 반환)
+
+    Returns:
+        int: 새로 대기열에 들어간 기사 수 (이미 전송했거나 대기 중인 링크 제외)
+    """
+    queued = storage.enqueue_notion(articles, keyword, time.time())
+    if queued and _worker is not None:
+        _worker.notify()
+    return queued
@@ -0,0 +1,252 @@
+"""
+검색 결과 공유 캐시 모듈
+
+같은 화제를 여러 사용자가 동시에 검색하면 세션마다 RSS/크롤링, DB 저장, GPT 요약을 따로 실행합니다.
+(st.session_state는 사용자별이라 세션 사이에 공유되지 않음)
+정규화한 검색 키워드를 키로 결과를 프로세스 전역에서 짧게 공유합니다.
+- TTL(기본 2분) 안의 같은 검색은 저장된 결과로 바로 응답
+- single-flight: 같은 키를 계산 중이면 새 요청은 계산하지 않고 그 결과를 기다림
+  (기다리는 동안 계산 중인 쪽의 스트리밍 텍스트를 on_wait으로 전달, 계산이 실패하면 기다리던 쪽이 다시 계산)
+- shared=True면 SQLite에도 저장하고, 리더 잠금(leader_lock)으로 여러 프로세스 사이에서도 한 곳만 계산
+
+값은 JSON으로 저장할 수 있는 값이어야 합니다. (SQLite 공유 시)
+"""
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+
+import metrics
+import storage
+from settings import get_settings
+
+# 기다리는 쪽이 결과/취소 여부를 확인하는 간격(초)
+QUERY_WAIT_POLL = 0.1
+
+# 다른 프로세스의 계산을 기다리는 최대 시간(초), 지나면 잠금이 만료되어 직접 계산
+# (검색 + 요약이 끝나기에 충분한 시간)
+QUERY_LOCK_TTL = 120
+
+# SQLite 리더 잠금 이름 접두사 (정시 수집기의 잠금과 구분)
+LOCK_PREFIX = 'query_cache:'
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def query_key(*parts):
+    """
+    검색 결과 캐시 키 (공백 정리, 대소문자 무시)
+
+    Args:
+        *parts: 결과를 구분하는 값 (예: 모델, 검색 키워드)
+
+    Returns:
+        str: 캐시 키
+    """
+    return '\x1f'.join(_WHITESPACE_RE.sub(' ', str(part)).strip().casefold() for part in parts)
+
+
+class _Flight:
+    """계산 중인 키 하나 (같은 키를 요청한 스레드들이 결과를 기다림)"""
+    __slots__ = ('partial', 'value', 'ok', '_event')
+
+    def __init__(self):
+        self.partial = None
+        self.value = None
+        self.ok = False
+        self._event = threading.Event()
+
+    def report(self, partial):
+        """계산 중간 결과 기록 (스트리밍 중인 텍스트 등)"""
+        self.partial = partial
+
+    def finish(self, value, ok):
+        self.value = value
+        self.ok = ok
+        self._event.set()
+
+    def wait(self, on_wait=None, poll=QUERY_WAIT_POLL):
+        """
+        계산이 끝날 때까지 대기
+
+        Returns:
+            bool: 계산에 성공했으면 True (실패/중단이면 False)
+        """
+        while not self._event.wait(poll):
+            if on_wait is not None:
+                on_wait(self.partial)
+        return self.ok
+
+
+class QueryCache:
+    """
+    키별 결과 캐시 (TTL, 최근 사용 순 LRU, single-flight)
+
+    Args:
+        ttl: 결과 유지 시간(초)
+        max_entries: 보관할 최대 키 수
+        shared: SQLite에도 저장하여 여러 프로세스가 공유할지 여부
+        (None이면 현재 설정의 query_cache_ttl, query_cache_max_entries, query_cache_shared를 따름)
+    """
+
+    def __init__(self, ttl=None, max_entries=None, shared=None):
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._shared = shared
+        self._entries = OrderedDict()
+        self._flights = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.waits = 0
+        self.misses = 0
+
+    @property
+    def ttl(self):
+        return get_settings().query_cache_ttl if self._ttl is None else self._ttl
+
+    @property
+    def max_entries(self):
+        return get_settings().query_cache_max_entries if self._max_entries is None else self._max_entries
+
+    @property
+    def shared(self):
+        return get_settings().query_cache_shared if self._shared is None else self._shared
+
+    def _count(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def stats(self):
+        """적중/계산 합류/미스 횟수"""
+        with self._lock:
+            return {'hits': self.hits, 'waits': self.waits, 'misses': self.misses}
+
+    def get(self, key):
+        """
+        유효한 결과 조회 (메모리 → SQLite 순)
+
+        Returns:
+            tuple: (적중 여부, 값)
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if now - entry[1] < self.ttl:
+                    self._entries.move_to_end(key)
+                    return True, entry[0]
+                del self._entries[key]
+        if self.shared:
+            cached = storage.get_query_cache(key)
+            if cached is not None and now - cached[1] < self.ttl:
+                self._remember(key, cached[0], cached[1])
+                return True, cached[0]
+        return False, None
+
+    def put(self, key, value):
+        """결과 저장"""
+        now = time.time()
+        self._remember(key, value, now)
+        if self.shared:
+            storage.put_query_cache(key, value, now, self.max_entries)
+
+    def _remember(self, key, value, created_at):
+        with self._lock:
+            self._entries[key] = (value, created_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """메모리의 결과 삭제 (SQLite에 저장된 결과는 TTL이 지나면 사용되지 않음)"""
+        with self._lock:
+            self._entries.clear()
+
+    def get_or_compute(self, key, compute, on_wait=None, cacheable=None):
+        """
+        저장된 결과를 반환하고, 없으면 한 곳에서만 계산
+
+        Args:
+            key: 캐시 키 (query_key())
+            compute: 결과 계산 함수 compute(report) (report(중간 결과)로 진행 상황을 기다리는 쪽에 전달)
+            on_wait: 다른 곳의 계산을 기다리는 동안 QUERY_WAIT_POLL초마다 호출 (중간 결과 또는 None)
+                     (예외를 발생시키면 기다리기를 중단, 작업 취소용)
+            cacheable: 결과 저장 여부 판단 함수 (None이면 항상 저장, 실패 응답은 저장하지 않도록)
+
+        Returns:
+            계산 결과 또는 저장된 결과
+        """
+        while True:
+            hit, value = self.get(key)
+            if hit:
+                self._count('hits')
+                return value
+
+            with self._lock:
+                flight = self._flights.get(key)
+                leader = flight is None
+                if leader:
+                    flight = self._flights[key] = _Flight()
+
+            if not leader:
+                self._count('waits')
+                with metrics.span("query_cache_wait"):
+                    if flight.wait(on_wait):
+                        return flight.value
+                # 계산한 쪽이 실패/취소되었으면 다시 시도 (기다리던 쪽 중 하나가 계산)
+                continue
+
+            ok = False
+            value = None
+            try:
+                found, value = self._wait_other_process(key, flight, on_wait)
+                if found:
+                    ok = True
+                    self._count('waits')
+                    return value
+                self._count('misses')
+                value = compute(flight.report)
+                ok = cacheable is None or cacheable(value)
+                if ok:
+                    self.put(key, value)
+                return value
+            finally:
+                self._release_lock(key)
+                with self._lock:
+                    self._flights.pop(key, None)
+                flight.finish(value, ok)
+
+    # ==================== 여러 프로세스 사이의 single-flight ====================
+    def _lock_owner(self):
+        return f"{os.getpid()}:{threading.get_ident()}"
+
+    def _wait_other_process(self, key, flight, on_wait):
+        """
+        SQLite 리더 잠금을 얻을 때까지 대기 (shared=False면 바로 반환)
+
+        다른 프로세스가 같은 키를 계산 중이면 결과가 저장되거나 잠금이 풀릴/만료될 때까지 기다립니다.
+
+        Returns:
+            tuple: (다른 프로세스의 결과를 찾았는지 여부, 값)
+        """
+        if not self.shared:
+            return False, None
+        owner = self._lock_owner()
+        while not storage.acquire_leader(LOCK_PREFIX + key, owner, time.time(), QUERY_LOCK_TTL):
+            time.sleep(QUERY_WAIT_POLL)
+            hit, value = self.get(key)
+            if hit:
+                return True, value
+            if on_wait is not None:
+                on_wait(None)
+        # 잠금을 얻는 사이에 다른 프로세스가 저장했을 수 있음
+        return self.get(key)
+
+    def _release_lock(self, key):
+        if self.shared:
+            storage.release_leader(LOCK_PREFIX + key, self._lock_owner())
+
+
+# 프로세스 전역 캐시
+query_cache = QueryCache()
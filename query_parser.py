@@ -0,0 +1,96 @@
+"""
+검색 키워드 추출 모듈
+
+불필요한 단어 목록을 모듈 로드 시 한 번만 정규식으로 컴파일하여,
+단어마다 정규식을 새로 만들어 90여 번 치환하던 방식을 한 번의 치환으로 처리합니다.
+- 단어 경계(\\b) 기준으로 통째로 일치하는 단어만 제거 (기존 동작과 동일)
+- 명사 뒤에 붙은 조사(을/를/은/는/에/에서/에게/으로 등)를 떼어내어
+  '뉴스를', '삼성전자는' 같은 표현도 처리
+- 같은 입력은 결과를 캐시 (검색 1회에 여러 번 호출되어도 한 번만 계산)
+"""
+import re
+from functools import lru_cache
+
+# 불필요한 단어/조사/종결어
+REMOVE_WORDS = [
+    # 동사/조동사
+    '알려줘', '알려주세요', '찾아줘', '검색해줘', '보여줘', '해줄래', '해주세요',
+    # 명사 (뉴스 관련)
+    '기사', '뉴스', '소식', '보도', '속보', '긴급',
+    # 조사
+    '을', '를', '이', '가', '은', '는', '에', '서', '에게', '께', '로', '에서', '로부터', '에 대한', '의',
+    # 한국어 종결어미 및 의존명사
+    '거', '거지', '거가', '거네', '거라', '거야', '것', '네', '네요', '네길',
+    '고', '곤', '고야', '고말', '고들', '고곤', '일', '해', '해요',
+    # 시간 표현
+    '오늘', '어제', '요즘', '지금', '현재', '최신', '최근',
+    # 형용사
+    '많은', '인기', '인기있는', '인기많은',
+    # 인사말
+    '안녕', '안녕하세요', '반가워', '반갑습니다', '만나서',
+    # 기타
+    '아', '어', '음', '어떻게', '어떤', '뭔지', '뭐야', '뭐지', '뭘', '뭐냐',
+    '서치', '조회', '검색', '찾기', '말해줘', '설명해줘', '안내', '정보',
+    '나', '날', '너', '우리', '우리가'
+]
+
+# 단어 끝에서 떼어낼 조사 (명사 끝 글자와 헷갈리기 쉬운 이/가/도/로 등은 제외)
+# 앞쪽 항목부터 시도하므로 '에 대한'이 '에'보다 먼저 와야 함
+PARTICLES = ['에 대한', '에서는', '에서', '에게', '에는', '으로', '을', '를', '은', '는', '에']
+
+# 결과 캐시 크기
+KEYWORD_CACHE_SIZE = 1024
+
+_REMOVE_WORD_SET = frozenset(REMOVE_WORDS)
+
+# 긴 단어를 먼저 시도해야 '알려주세요'가 '알려줘'보다 우선함 (기존의 긴 단어부터 처리와 동일)
+_WORDS_PATTERN = '|'.join(re.escape(word) for word in sorted(REMOVE_WORDS, key=len, reverse=True))
+_PARTICLES_PATTERN = '|'.join(re.escape(particle) for particle in PARTICLES)
+
+_REMOVE_WORDS_RE = re.compile(rf'\b(?:{_WORDS_PATTERN})\b', re.IGNORECASE)
+# '뉴스를'처럼 불필요한 단어 뒤에 조사가 붙은 경우까지 제거
+_REMOVE_WORDS_WITH_PARTICLE_RE = re.compile(rf'\b(?:{_WORDS_PATTERN})(?:{_PARTICLES_PATTERN})?\b', re.IGNORECASE)
+# 남은 단어 끝의 조사 제거 (조사를 뗀 뒤 2글자 이상 남는 경우만)
+_TRAILING_PARTICLE_RE = re.compile(rf'\b(\w{{2,}}?)(?:{_PARTICLES_PATTERN})\b')
+_SPECIAL_CHARS_RE = re.compile(r'[^가-힣a-zA-Z0-9\s]')
+
+
+@lru_cache(maxsize=KEYWORD_CACHE_SIZE)
+def extract_search_keyword(user_input, strip_particles=True):
+    """
+    사용자 입력에서 검색 키워드를 추출하는 함수
+
+    Args:
+        user_input: 사용자 입력 텍스트
+        strip_particles: 단어 끝의 조사도 제거할지 여부
+            (False면 기존 단어 단위 제거와 같은 결과)
+
+    Returns:
+        str: 추출된 검색 키워드
+    """
+    # 1단계: 텍스트 정규화
+    keyword = user_input.strip()
+
+    # 2단계: 불필요한 단어 제거 (한 번의 치환으로 처리)
+    if strip_particles:
+        keyword = _REMOVE_WORDS_WITH_PARTICLE_RE.sub(' ', keyword)
+        keyword = _TRAILING_PARTICLE_RE.sub(r'\1', keyword)
+    else:
+        keyword = _REMOVE_WORDS_RE.sub(' ', keyword)
+
+    # 3단계: 특수문자 제거 (한글, 영문, 숫자만 유지)
+    keyword = _SPECIAL_CHARS_RE.sub('', keyword)
+
+    # 4단계: 연속된 공백 정리
+    keyword = ' '.join(keyword.split()).strip()
+
+    # 5단계: 최종 검증
+    if len(keyword) < 2:
+        # 키워드가 너무 짧으면 원본 중 가장 먼저 나온 주요 단어 선택
+        filtered_words = [w for w in user_input.split() if len(w) >= 2 and w not in _REMOVE_WORD_SET]
+        if filtered_words:
+            keyword = filtered_words[0]
+        else:
+            keyword = user_input
+
+    return keyword
@@ -0,0 +1,225 @@
+"""
+설정 모듈
+
+API 키, 모델, 수집 키워드, 타임아웃, 캐시 크기, 검색 결과 공유, GPT 동시 호출 수, 지연 시간 기록 설정을 한 번 읽어 변경 불가능한 Settings 객체로 제공합니다.
+기능마다 st.secrets와 os.getenv를 따로 조회하던 방식을 대체합니다.
+- 우선순위: Streamlit Secrets → 환경변수 → .env 파일 → 기본값
+- .env 또는 secrets.toml이 바뀌면 다음 get_settings() 호출 때 다시 읽음
+  (파일 변경 확인은 최대 RELOAD_CHECK_INTERVAL초에 한 번, stat만 사용)
+- 기능 모듈(feeds, summarizer, query_cache, jobs, metrics 등)은 값이 필요할 때 get_settings()에서 읽으므로
+  이 모듈은 기능 모듈을 import하지 않고 기본값도 여기서 정의
+"""
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from dotenv import dotenv_values
+
+ENV_PATH = Path(".env")
+SECRETS_PATHS = (Path(".streamlit") / "secrets.toml", Path.home() / ".streamlit" / "secrets.toml")
+
+# 설정 파일 변경 확인 최소 간격(초)
+RELOAD_CHECK_INTERVAL = 1.0
+
+# GMS 엔드포인트: https://gms.ssafy.io/gmsapi/api.openai.com/v1
+DEFAULT_OPENAI_BASE_URL = "https://gms.ssafy.io/gmsapi/api.openai.com/v1"
+DEFAULT_MODEL = "gpt-5-nano"
+
+# 정시 수집 기본 키워드와 전체 수집 제한 시간(초) - 다음 수집 주기 전에 반드시 끝나도록
+DEFAULT_COLLECT_KEYWORDS = ('AI', '기술', '경제', '정치', '스포츠')
+DEFAULT_COLLECT_DEADLINE = 600
+
+# 키워드별로 피드에서 읽을 최대 기사 수 (새 기사만 저장하므로 한 번에 여러 개 읽어도 됨)
+DEFAULT_COLLECT_DEPTH = 20
+
+# 수집 간격(분), 0이면 매일 정해진 시각(9시, 15시, 21시)에 수집
+DEFAULT_COLLECT_INTERVAL_MINUTES = 0
+
+# RSS 요청 1건당 타임아웃(초), 검색 소스별 제한 시간(초)
+DEFAULT_FETCH_TIMEOUT = 10
+DEFAULT_RSS_DEADLINE = 8
+DEFAULT_PLAYWRIGHT_DEADLINE = 15
+
+# 피드 캐시: 이 시간(초) 안의 재요청은 네트워크 없이 응답, 최대 보관 URL 수
+DEFAULT_FEED_CACHE_TTL = 300
+DEFAULT_FEED_CACHE_MAX_ENTRIES = 200
+
+# 요약 캐시: 유지 시간(초)과 최대 보관 개수
+DEFAULT_SUMMARY_CACHE_TTL = 60 * 60
+DEFAULT_SUMMARY_CACHE_MAX_ENTRIES = 500
+
+# 대화 기록에 쓸 토큰 예산
+DEFAULT_CONTEXT_TOKEN_BUDGET = 8000
+
+# 검색 결과 공유: 유지 시간(초), 메모리/SQLite에 보관할 최대 키 수
+DEFAULT_QUERY_CACHE_TTL = 120
+DEFAULT_QUERY_CACHE_MAX_ENTRIES = 256
+
+# 프로세스 전체 GPT 동시 호출 수
+DEFAULT_LLM_MAX_CONCURRENCY = 4
+
+
+@dataclass(frozen=True)
+class Settings:
+    """애플리케이션 설정 (변경 불가, 바꾸려면 load_settings()로 새로 생성)"""
+    openai_api_key: str = None
+    openai_base_url: str = DEFAULT_OPENAI_BASE_URL
+    model: str = DEFAULT_MODEL
+
+    notion_api_key: str = None
+    notion_database_id: str = None
+
+    collect_keywords: tuple = DEFAULT_COLLECT_KEYWORDS
+    collect_deadline: float = DEFAULT_COLLECT_DEADLINE
+    collect_depth: int = DEFAULT_COLLECT_DEPTH
+    collect_interval_minutes: int = DEFAULT_COLLECT_INTERVAL_MINUTES
+
+    fetch_timeout: float = DEFAULT_FETCH_TIMEOUT
+    rss_deadline: float = DEFAULT_RSS_DEADLINE
+    playwright_deadline: float = DEFAULT_PLAYWRIGHT_DEADLINE
+
+    feed_cache_ttl: float = DEFAULT_FEED_CACHE_TTL
+    feed_cache_max_entries: int = DEFAULT_FEED_CACHE_MAX_ENTRIES
+    summary_cache_ttl: float = DEFAULT_SUMMARY_CACHE_TTL
+    summary_cache_max_entries: int = DEFAULT_SUMMARY_CACHE_MAX_ENTRIES
+    context_token_budget: int = DEFAULT_CONTEXT_TOKEN_BUDGET
+
+    # 같은 검색 키워드의 결과를 세션 사이에 공유하는 시간(초, 0이면 동시에 들어온 같은 검색만 합침), 최대 키 수,
+    # SQLite에도 저장하여 여러 프로세스가 공유할지 여부
+    query_cache_ttl: float = DEFAULT_QUERY_CACHE_TTL
+    query_cache_max_entries: int = DEFAULT_QUERY_CACHE_MAX_ENTRIES
+    query_cache_shared: bool = False
+
+    # 프로세스 전체 GPT 동시 호출 수 (대화 턴 작업이 이 수를 넘으면 차례를 기다림)
+    llm_max_concurrency: int = DEFAULT_LLM_MAX_CONCURRENCY
+
+    # 구간별 지연 시간 기록 여부, Prometheus 엔드포인트 포트 (0이면 실행하지 않음)
+    metrics_enabled: bool = True
+    metrics_port: int = 0
+
+    # 읽어 온 설정 파일의 수정 시각 (변경 감지용)
+    source_mtimes: tuple = field(default=(), compare=False, repr=False)
+
+    @property
+    def notion_configured(self):
+        """Notion API Key와 Database ID가 모두 설정되었는지 여부"""
+        return bool(self.notion_api_key and self.notion_database_id)
+
+
+def _source_mtimes():
+    """설정 파일들의 수정 시각 (없는 파일은 None)"""
+    mtimes = []
+    for path in (ENV_PATH, *SECRETS_PATHS):
+        try:
+            mtimes.append(path.stat().st_mtime_ns)
+        except OSError:
+            mtimes.append(None)
+    return tuple(mtimes)
+
+
+def _read_secrets():
+    """Streamlit Secrets 읽기 (Streamlit이 없거나 secrets 파일이 없으면 빈 dict)"""
+    # 파일이 없을 때 st.secrets에 접근하면 화면에 오류가 출력되므로 먼저 확인
+    if not any(path.exists() for path in SECRETS_PATHS):
+        return {}
+    try:
+        import streamlit as st
+        return dict(st.secrets)
+    except Exception:
+        # Secrets 파일이 없거나 오류가 발생한 경우 무시
+        return {}
+
+
+def _normalize_base_url(base_url):
+    """http/https로 시작하지 않거나 공백/잘못된 값이면 기본 엔드포인트로 교체"""
+    if not isinstance(base_url, str) or not base_url.strip().lower().startswith(("http://", "https://")):
+        return DEFAULT_OPENAI_BASE_URL
+    return base_url.strip()
+
+
+def load_settings():
+    """
+    Secrets, 환경변수, .env 파일에서 설정을 읽어 Settings 생성
+
+    숫자 값이 잘못된 경우 기본값을 사용합니다.
+
+    Returns:
+        Settings: 새 설정 객체
+    """
+    mtimes = _source_mtimes()
+    secrets = _read_secrets()
+    dotenv = dotenv_values(ENV_PATH) if ENV_PATH.exists() else {}
+    defaults = Settings()
+
+    def get(name, default=None):
+        value = secrets.get(name) or os.environ.get(name) or dotenv.get(name)
+        return value if value not in (None, "") else default
+
+    def number(name, default, cast=float):
+        try:
+            return cast(get(name, default))
+        except (TypeError, ValueError):
+            return default
+
+    def flag(name, default):
+        value = get(name, default)
+        if isinstance(value, str):
+            return value.strip().lower() not in ("0", "false", "no", "off")
+        return bool(value)
+
+    keywords = get("COLLECT_KEYWORDS")
+    if isinstance(keywords, str):
+        keywords = [k.strip() for k in keywords.split(",")]
+
+    return Settings(
+        openai_api_key=get("OPENAI_API_KEY"),
+        openai_base_url=_normalize_base_url(get("OPENAI_BASE_URL", DEFAULT_OPENAI_BASE_URL)),
+        model=get("OPENAI_MODEL", DEFAULT_MODEL),
+        notion_api_key=get("NOTION_API_KEY"),
+        notion_database_id=get("NOTION_DATABASE_ID"),
+        collect_keywords=tuple(k for k in keywords if k) if keywords else DEFAULT_COLLECT_KEYWORDS,
+        collect_deadline=number("COLLECT_DEADLINE", defaults.collect_deadline),
+        collect_depth=number("COLLECT_DEPTH", defaults.collect_depth, int),
+        collect_interval_minutes=number("COLLECT_INTERVAL_MINUTES", defaults.collect_interval_minutes, int),
+        fetch_timeout=number("FETCH_TIMEOUT", defaults.fetch_timeout),
+        rss_deadline=number("RSS_DEADLINE", defaults.rss_deadline),
+        playwright_deadline=number("PLAYWRIGHT_DEADLINE", defaults.playwright_deadline),
+        feed_cache_ttl=number("FEED_CACHE_TTL", defaults.feed_cache_ttl),
+        feed_cache_max_entries=number("FEED_CACHE_MAX_ENTRIES", defaults.feed_cache_max_entries, int),
+        summary_cache_ttl=number("SUMMARY_CACHE_TTL", defaults.summary_cache_ttl),
+        summary_cache_max_entries=number("SUMMARY_CACHE_MAX_ENTRIES", defaults.summary_cache_max_entries, int),
+        context_token_budget=number("CONTEXT_TOKEN_BUDGET", defaults.context_token_budget, int),
+        query_cache_ttl=number("QUERY_CACHE_TTL", defaults.query_cache_ttl),
+        query_cache_max_entries=number("QUERY_CACHE_MAX_ENTRIES", defaults.query_cache_max_entries, int),
+        query_cache_shared=flag("QUERY_CACHE_SHARED", defaults.query_cache_shared),
+        llm_max_concurrency=number("LLM_MAX_CONCURRENCY", defaults.llm_max_concurrency, int),
+        metrics_enabled=flag("METRICS_ENABLED", defaults.metrics_enabled),
+        metrics_port=number("METRICS_PORT", defaults.metrics_port, int),
+        source_mtimes=mtimes,
+    )
+
+
+_settings = None
+_checked_at = 0.0
+_lock = threading.Lock()
+
+
+def get_settings():
+    """
+    현재 설정 반환 (최초 호출 시 로드, 설정 파일이 바뀌었으면 다시 로드)
+
+    Returns:
+        Settings: 현재 설정 객체
+    """
+    global _settings, _checked_at
+    now = time.monotonic()
+    if _settings is not None and now - _checked_at < RELOAD_CHECK_INTERVAL:
+        return _settings
+
+    with _lock:
+        if _settings is None or _source_mtimes() != _settings.source_mtimes:
+            _settings = load_settings()
+        _checked_at = now
+    return _settings
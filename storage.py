@@ -0,0 +1,1617 @@
+"""
+SQLite 저장소 모듈
+
+articles.db에 대한 모든 접근은 이 모듈의 커넥션 풀을 거칩니다.
+- WAL 저널링: Streamlit UI(읽기)와 수집기(쓰기)가 서로를 막지 않음
+- 커넥션 재사용: rerun마다 connect/close 하지 않음
+- 쓰기는 BEGIN IMMEDIATE 트랜잭션으로 처리하여 "database is locked" 방지
+"""
+import json
+import queue
+import re
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+
+import dedup
+
+DB_PATH = Path("articles.db")
+
+KST = timezone(timedelta(hours=9))
+
+# 풀 크기 및 대기 시간
+POOL_SIZE = 4
+POOL_TIMEOUT = 10.0
+
+# 커넥션별 준비된 문장(prepared statement) 캐시 크기
+STATEMENT_CACHE_SIZE = 128
+
+# 커넥션 생성 시 적용할 PRAGMA (순서대로 실행)
+PRAGMAS = (
+    ("journal_mode", "WAL"),
+    ("synchronous", "NORMAL"),   # WAL에서는 NORMAL로도 손상 없음 (체크포인트 시에만 fsync)
+    ("cache_size", -16000),      # 약 16MB (음수는 KiB 단위)
+    ("mmap_size", 64 * 1024 * 1024),
+    ("temp_store", "MEMORY"),
+    ("busy_timeout", 5000),
+)
+
+
+# ==================== 커넥션 풀 ====================
+class ConnectionPool:
+    """
+    스레드 안전한 SQLite 커넥션 풀
+
+    커넥션은 필요할 때 최대 size개까지 생성되고, 반납된 커넥션은 재사용됩니다.
+    sqlite3 모듈은 커넥션마다 SQL 문자열 기준으로 준비된 문장을 캐시하므로,
+    커넥션을 재사용하면 같은 쿼리의 재컴파일도 피할 수 있습니다.
+    """
+
+    def __init__(self, db_path, size=POOL_SIZE, timeout=POOL_TIMEOUT):
+        self.db_path = Path(db_path)
+        self.size = size
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._created = 0
+        self._closed = False
+
+        # 벤치마크/사이드바 표시용 통계
+        self.connects = 0
+        self.checkouts = 0
+
+    def _connect(self):
+        """새 커넥션 생성 및 PRAGMA 적용"""
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self.timeout,
+            isolation_level=None,  # 트랜잭션은 transaction()에서 직접 관리
+            check_same_thread=False,
+            cached_statements=STATEMENT_CACHE_SIZE,
+        )
+        for name, value in PRAGMAS:
+            conn.execute(f"PRAGMA {name}={value}")
+        self.connects += 1
+        return conn
+
+    def _acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("커넥션 풀이 이미 종료되었습니다.")
+            if self._created < self.size:
+                self._created += 1
+                try:
+                    return self._connect()
+                except Exception:
+                    self._created -= 1
+                    raise
+
+        # 모든 커넥션이 사용 중이면 반납될 때까지 대기
+        try:
+            return self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise sqlite3.OperationalError("커넥션 풀 대기 시간 초과") from None
+
+    def _release(self, conn):
+        if conn.in_transaction:
+            conn.rollback()
+        if self._closed:
+            conn.close()
+        else:
+            self._idle.put(conn)
+
+    @contextmanager
+    def connection(self):
+        """읽기용 커넥션 대여 (autocommit)"""
+        conn = self._acquire()
+        self.checkouts += 1
+        try:
+            yield conn
+        finally:
+            self._release(conn)
+
+    @contextmanager
+    def transaction(self):
+        """
+        쓰기 트랜잭션
+
+        BEGIN IMMEDIATE로 시작하여 쓰기 잠금을 먼저 확보하므로,
+        다른 쓰기가 진행 중이면 busy_timeout 동안 기다렸다가 진행합니다.
+        """
+        with self.connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.rollback()
+                raise
+            else:
+                conn.commit()
+
+    def close(self):
+        """유휴 커넥션을 모두 닫기"""
+        with self._lock:
+            self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """전역 커넥션 풀 반환 (최초 호출 시 생성)"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(DB_PATH)
+    return _pool
+
+
+def configure(db_path, size=POOL_SIZE):
+    """
+    다른 DB 파일을 사용하도록 풀을 교체 (벤치마크/별도 프로세스용)
+
+    Args:
+        db_path: SQLite 파일 경로
+        size: 최대 커넥션 수
+    """
+    global _pool, DB_PATH
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+        DB_PATH = Path(db_path)
+        _pool = ConnectionPool(DB_PATH, size=size)
+    return _pool
+
+
+# ==================== 발행일 정규화 ====================
+# 정렬 가능한 UTC 문자열 (CURRENT_TIMESTAMP와 같은 형식)
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# 네이버 뉴스 상대 시간 표기 (예: "3시간 전")
+_RELATIVE_TIME_RE = re.compile(r'(\d+)\s*(초|분|시간|일|주)\s*전')
+_RELATIVE_UNITS = {'초': 'seconds', '분': 'minutes', '시간': 'hours', '일': 'days', '주': 'weeks'}
+
+# 네이버 뉴스 절대 날짜 표기 (예: "2025.01.06.")
+_DOTTED_DATE_RE = re.compile(r'(\d{4})\.(\d{1,2})\.(\d{1,2})')
+
+
+def normalize_published(published, reference=None):
+    """
+    수집 소스마다 다른 발행일 문자열을 정렬 가능한 UTC 타임스탬프로 변환
+
+    Args:
+        published: RSS pubDate(RFC 822), ISO 8601, 네이버 표기("3시간 전", "2025.01.06.") 등
+        reference: 상대 시간 계산 기준 시각 (기본값: 현재 시각)
+
+    Returns:
+        str | None: "YYYY-MM-DD HH:MM:SS" (UTC), 해석할 수 없으면 None
+    """
+    if not published or not isinstance(published, str):
+        return None
+    value = published.strip()
+
+    parsed = None
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        pass
+
+    if parsed is None:
+        try:
+            parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            pass
+
+    if parsed is None:
+        match = _RELATIVE_TIME_RE.search(value)
+        if match:
+            base = reference or datetime.now(timezone.utc)
+            parsed = base - timedelta(**{_RELATIVE_UNITS[match.group(2)]: int(match.group(1))})
+
+    if parsed is None:
+        match = _DOTTED_DATE_RE.search(value)
+        if match:
+            try:
+                parsed = datetime(*map(int, match.groups()), tzinfo=KST)
+            except ValueError:
+                pass
+
+    if parsed is None:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc).strftime(TIMESTAMP_FORMAT)
+
+
+# ==================== 전문 검색용 토큰화 ====================
+# 한국어는 조사가 명사에 붙어 있어 공백 단위 토큰으로는 "삼성전자가"에서 "삼성"을 찾을 수 없음.
+# 한글 구간은 2글자(bigram) 단위로 쪼개어 저장하고, 검색어도 같은 방식으로 쪼개 구문(phrase)으로 검색합니다.
+# (trigram 토크나이저는 3글자 미만 검색어를 찾지 못해 "삼성", "경제" 같은 2음절 단어에 쓸 수 없음)
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+_SEARCH_TOKEN_RE = re.compile(r'[가-힣]+|[a-z0-9]+')
+
+
+def _hangul_bigrams(run):
+    if len(run) == 1:
+        return [run]
+    return [run[i:i + 2] for i in range(len(run) - 1)]
+
+
+def to_search_text(text):
+    """
+    FTS 색인용 텍스트 생성 (한글 bigram + 영문/숫자 단어)
+
+    Args:
+        text: 제목 또는 요약 (HTML 포함 가능)
+
+    Returns:
+        str: 공백으로 구분된 토큰 문자열
+    """
+    if not text:
+        return ''
+    text = _HTML_TAG_RE.sub(' ', text).lower()
+    tokens = []
+    for run in _SEARCH_TOKEN_RE.findall(text):
+        if '가' <= run[0] <= '힣':
+            tokens.extend(_hangul_bigrams(run))
+        else:
+            tokens.append(run)
+    return ' '.join(tokens)
+
+
+def _search_terms(query):
+    """검색어를 (토큰 목록, 접두어 여부) 목록으로 변환"""
+    terms = []
+    for run in _SEARCH_TOKEN_RE.findall(_HTML_TAG_RE.sub(' ', query or '').lower()):
+        if '가' <= run[0] <= '힣':
+            terms.append((_hangul_bigrams(run), len(run) == 1))
+        else:
+            terms.append(([run], False))
+    return terms
+
+
+def build_fts_query(query):
+    """
+    사용자 검색어를 FTS5 MATCH 식으로 변환
+
+    단어마다 bigram 구문을 만들고 AND로 연결합니다.
+    한 글자 단어는 접두어 검색으로 처리합니다.
+
+    Returns:
+        str: MATCH 식 (검색할 토큰이 없으면 빈 문자열)
+    """
+    return ' AND '.join(
+        '"' + ' '.join(tokens) + '"' + ('*' if prefix else '')
+        for tokens, prefix in _search_terms(query)
+    )
+
+
+def _count_phrase(field_tokens, tokens, prefix):
+    """필드 토큰 목록에서 구문 등장 횟수 계산"""
+    n = len(tokens)
+    count = 0
+    for i in range(len(field_tokens) - n + 1):
+        if prefix:
+            if field_tokens[i].startswith(tokens[0]):
+                count += 1
+        elif field_tokens[i:i + n] == tokens:
+            count += 1
+    return count
+
+
+def rank_search_results(rows, query, k1=1.2, b=0.75, title_weight=3.0):
+    """
+    후보 기사를 BM25 방식으로 정렬 (제목 일치 가중치 3, 요약 1)
+
+    모든 후보가 모든 검색어를 포함(AND)하므로 IDF는 순위에 영향이 없어 생략하고,
+    단어 빈도와 필드 길이 정규화만 계산합니다. 점수가 같으면 최신 기사가 먼저 옵니다.
+
+    Args:
+        rows: SEARCH_CANDIDATES_SQL 결과
+        query: 사용자 검색어
+
+    Returns:
+        list: 정렬된 rows
+    """
+    terms = _search_terms(query)
+    if not rows or not terms:
+        return list(rows)
+
+    fields = [((row[6] or '').split(), (row[7] or '').split()) for row in rows]
+    avg_title = sum(len(t) for t, _ in fields) / len(fields) or 1
+    avg_summary = sum(len(s) for _, s in fields) / len(fields) or 1
+
+    def field_score(field_tokens, avg_len, weight):
+        norm = k1 * (1 - b + b * len(field_tokens) / avg_len)
+        score = 0.0
+        for tokens, prefix in terms:
+            tf = _count_phrase(field_tokens, tokens, prefix)
+            if tf:
+                score += weight * tf * (k1 + 1) / (tf + norm)
+        return score
+
+    scored = []
+    for row, (title_tokens, summary_tokens) in zip(rows, fields):
+        score = (field_score(title_tokens, avg_title, title_weight)
+                 + field_score(summary_tokens, avg_summary, 1.0))
+        scored.append((-score, -row[0], row))
+    scored.sort(key=lambda item: item[:2])
+    return [row for _, _, row in scored]
+
+
+# ==================== 스키마 마이그레이션 ====================
+# PRAGMA user_version에 적용된 마지막 버전을 기록합니다.
+# 새 마이그레이션은 항상 목록 끝에 추가하고, 이미 배포된 항목은 수정하지 않습니다.
+def _migration_base_tables(conn):
+    """기본 테이블 생성 (기존 init_database와 동일)"""
+    # 기사 저장 테이블
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS articles (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT NOT NULL,
+            link TEXT UNIQUE NOT NULL,
+            keyword TEXT,
+            published TEXT,
+            summary TEXT,
+            saved_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+    # 검색 히스토리 테이블
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS search_history (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            keyword TEXT NOT NULL,
+            article_count INTEGER,
+            searched_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+
+def _migration_indexes(conn):
+    """조회 쿼리용 인덱스 (키워드별/전체 최신순, 검색 히스토리 최신순)"""
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_articles_keyword_saved_at ON articles(keyword, saved_at)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_articles_saved_at ON articles(saved_at)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_search_history_searched_at ON search_history(searched_at)')
+
+
+def _migration_published_at(conn):
+    """published 문자열을 정규화한 published_at 컬럼 추가 및 기존 데이터 변환"""
+    conn.execute('ALTER TABLE articles ADD COLUMN published_at TIMESTAMP')
+
+    rows = conn.execute('SELECT id, published, saved_at FROM articles').fetchall()
+    updates = []
+    for article_id, published, saved_at in rows:
+        # 상대 시간("3시간 전")은 저장 시각 기준으로 계산
+        reference = None
+        if saved_at:
+            reference = datetime.strptime(saved_at, TIMESTAMP_FORMAT).replace(tzinfo=timezone.utc)
+        published_at = normalize_published(published, reference)
+        if published_at:
+            updates.append((published_at, article_id))
+    conn.executemany('UPDATE articles SET published_at = ? WHERE id = ?', updates)
+
+
+def _migration_fulltext_search(conn):
+    """
+    제목/요약 전문 검색용 FTS5 테이블
+
+    색인용 텍스트(search_title, search_summary)는 저장 시 Python에서 만들어 articles에 두고,
+    FTS 테이블은 이를 외부 콘텐츠로 참조하여 트리거로만 동기화합니다.
+    (트리거가 순수 SQL이므로 다른 도구로 articles를 수정해도 오류가 나지 않음)
+    """
+    conn.execute('ALTER TABLE articles ADD COLUMN search_title TEXT')
+    conn.execute('ALTER TABLE articles ADD COLUMN search_summary TEXT')
+
+    rows = conn.execute('SELECT id, title, summary FROM articles').fetchall()
+    conn.executemany(
+        'UPDATE articles SET search_title = ?, search_summary = ? WHERE id = ?',
+        [(to_search_text(title), to_search_text(summary), article_id)
+         for article_id, title, summary in rows]
+    )
+
+    conn.execute('''
+        CREATE VIRTUAL TABLE articles_fts USING fts5(
+            search_title, search_summary,
+            content='articles', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 0'
+        )
+    ''')
+    conn.execute('''
+        CREATE TRIGGER articles_fts_insert AFTER INSERT ON articles BEGIN
+            INSERT INTO articles_fts(rowid, search_title, search_summary)
+            VALUES (new.id, new.search_title, new.search_summary);
+        END
+    ''')
+    conn.execute('''
+        CREATE TRIGGER articles_fts_delete AFTER DELETE ON articles BEGIN
+            INSERT INTO articles_fts(articles_fts, rowid, search_title, search_summary)
+            VALUES ('delete', old.id, old.search_title, old.search_summary);
+        END
+    ''')
+    conn.execute('''
+        CREATE TRIGGER articles_fts_update AFTER UPDATE OF search_title, search_summary ON articles BEGIN
+            INSERT INTO articles_fts(articles_fts, rowid, search_title, search_summary)
+            VALUES ('delete', old.id, old.search_title, old.search_summary);
+            INSERT INTO articles_fts(rowid, search_title, search_summary)
+            VALUES (new.id, new.search_title, new.search_summary);
+        END
+    ''')
+    conn.execute("INSERT INTO articles_fts(articles_fts) VALUES ('rebuild')")
+
+
+def _migration_feed_cache(conn):
+    """RSS 피드 캐시 (조건부 요청용 ETag/Last-Modified와 파싱된 기사 목록)"""
+    conn.execute('''
+        CREATE TABLE feed_cache (
+            url TEXT PRIMARY KEY,
+            etag TEXT,
+            last_modified TEXT,
+            entries TEXT NOT NULL,
+            fetched_at REAL NOT NULL,
+            last_used_at REAL NOT NULL
+        )
+    ''')
+    conn.execute('CREATE INDEX idx_feed_cache_last_used_at ON feed_cache(last_used_at)')
+
+
+def _migration_feed_cache_complete(conn):
+    """피드를 끝까지 읽었는지 여부 (스트리밍 파싱은 필요한 만큼만 읽고 멈춤)"""
+    conn.execute('ALTER TABLE feed_cache ADD COLUMN complete INTEGER NOT NULL DEFAULT 1')
+
+
+def _migration_summary_cache(conn):
+    """GPT 기사 요약 캐시 (모델/프롬프트/기사 링크 해시 → 요약문)"""
+    conn.execute('''
+        CREATE TABLE summary_cache (
+            key TEXT PRIMARY KEY,
+            model TEXT NOT NULL,
+            summary TEXT NOT NULL,
+            created_at REAL NOT NULL,
+            last_used_at REAL NOT NULL
+        )
+    ''')
+    conn.execute('CREATE INDEX idx_summary_cache_last_used_at ON summary_cache(last_used_at)')
+
+
+def _migration_notion_outbox(conn):
+    """Notion 전송 대기열(outbox)과 전송 완료 기록"""
+    conn.execute('''
+        CREATE TABLE notion_outbox (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            link TEXT UNIQUE NOT NULL,
+            title TEXT NOT NULL,
+            keyword TEXT,
+            published_at TEXT,
+            summary TEXT,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            next_attempt_at REAL,
+            last_error TEXT,
+            created_at REAL NOT NULL
+        )
+    ''')
+    # next_attempt_at이 NULL이면 재시도를 포기한 항목
+    conn.execute('CREATE INDEX idx_notion_outbox_next_attempt_at ON notion_outbox(next_attempt_at)')
+    conn.execute('''
+        CREATE TABLE notion_synced (
+            link TEXT PRIMARY KEY,
+            page_id TEXT NOT NULL,
+            synced_at REAL NOT NULL
+        )
+    ''')
+
+
+def _migration_leader_lock(conn):
+    """여러 프로세스 중 하나만 작업하도록 하는 리더 잠금 (만료 시각이 지나면 다른 프로세스가 가져감)"""
+    conn.execute('''
+        CREATE TABLE leader_lock (
+            name TEXT PRIMARY KEY,
+            owner TEXT NOT NULL,
+            expires_at REAL NOT NULL
+        )
+    ''')
+
+
+def _migration_collection_cursors(conn):
+    """키워드별 수집 위치(최신 발행 시각, 최근 본 링크)와 수집 실행 기록"""
+    conn.execute('''
+        CREATE TABLE collect_cursors (
+            keyword TEXT PRIMARY KEY,
+            last_published_at TEXT,
+            seen_links TEXT NOT NULL DEFAULT '{}',
+            updated_at REAL NOT NULL
+        )
+    ''')
+    # 한 번의 수집 실행은 키워드별로 한 행씩, 같은 started_at으로 묶임
+    conn.execute('''
+        CREATE TABLE collection_runs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            started_at REAL NOT NULL,
+            finished_at REAL NOT NULL,
+            keyword TEXT NOT NULL,
+            fetched INTEGER NOT NULL DEFAULT 0,
+            skipped INTEGER NOT NULL DEFAULT 0,
+            new_count INTEGER NOT NULL DEFAULT 0,
+            duplicate_count INTEGER NOT NULL DEFAULT 0,
+            error TEXT
+        )
+    ''')
+    conn.execute('CREATE INDEX idx_collection_runs_started_at ON collection_runs(started_at)')
+
+
+def _migration_near_duplicates(conn):
+    """
+    정규화 URL, SimHash 지문, 같은 소식 클러스터
+
+    cluster_id가 NULL이면 자기 자신이 클러스터 대표이고, 아니면 대표 기사의 id입니다.
+    지문의 구간 값은 article_simhash_bands에 색인하여 비슷한 기사 후보를 바로 찾습니다.
+    """
+    conn.execute('ALTER TABLE articles ADD COLUMN canonical_link TEXT')
+    conn.execute('ALTER TABLE articles ADD COLUMN simhash INTEGER')
+    conn.execute('ALTER TABLE articles ADD COLUMN cluster_id INTEGER')
+    conn.execute('CREATE INDEX idx_articles_canonical_link ON articles(canonical_link)')
+    conn.execute('''
+        CREATE TABLE article_simhash_bands (
+            band INTEGER NOT NULL,
+            value INTEGER NOT NULL,
+            article_id INTEGER NOT NULL,
+            PRIMARY KEY (band, value, article_id)
+        ) WITHOUT ROWID
+    ''')
+    conn.execute('''
+        CREATE TRIGGER articles_simhash_bands_delete AFTER DELETE ON articles BEGIN
+            DELETE FROM article_simhash_bands WHERE band = 0 AND value = old.simhash & 65535 AND article_id = old.id;
+            DELETE FROM article_simhash_bands WHERE band = 1 AND value = (old.simhash >> 16) & 65535 AND article_id = old.id;
+            DELETE FROM article_simhash_bands WHERE band = 2 AND value = (old.simhash >> 32) & 65535 AND article_id = old.id;
+            DELETE FROM article_simhash_bands WHERE band = 3 AND value = (old.simhash >> 48) & 65535 AND article_id = old.id;
+        END
+    ''')
+
+    # 기존 기사는 저장 순서대로 지문을 계산하여 클러스터 배정
+    rows = conn.execute('SELECT id, title, link, summary, saved_at FROM articles ORDER BY id').fetchall()
+    for article_id, title, link, summary, saved_at in rows:
+        fingerprint = dedup.simhash(title, summary)
+        cluster_id = _find_cluster(conn, fingerprint, _cluster_window_start(saved_at))
+        conn.execute(
+            'UPDATE articles SET canonical_link = ?, simhash = ?, cluster_id = ? WHERE id = ?',
+            (dedup.canonicalize_url(link), dedup.to_signed(fingerprint), cluster_id, article_id)
+        )
+        _index_simhash(conn, article_id, fingerprint)
+
+
+def _migration_table_versions(conn):
+    """테이블 변경 번호 (트리거로 갱신, 조회 결과 캐시 무효화용)"""
+    conn.execute('''
+        CREATE TABLE table_versions (
+            name TEXT PRIMARY KEY,
+            version INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+    conn.execute("INSERT INTO table_versions (name) VALUES ('articles')")
+    for event in ('INSERT', 'UPDATE', 'DELETE'):
+        conn.execute(f'''
+            CREATE TRIGGER articles_version_{event.lower()} AFTER {event} ON articles BEGIN
+                UPDATE table_versions SET version = version + 1 WHERE name = 'articles';
+            END
+        ''')
+
+
+def _migration_sidebar_stats(conn):
+    """
+    사이드바 통계용 요약 테이블 (기사 수, 키워드별 기사 수, Notion 전송 완료 수, 마지막 수집 시각)
+
+    기사/전송 완료 수는 트리거로, 마지막 수집 시각은 record_collection_run에서
+    쓰기와 같은 트랜잭션 안에서 갱신하므로 조회할 때 테이블 전체를 세지 않습니다.
+    """
+    conn.execute('''
+        CREATE TABLE stats_counters (
+            name TEXT PRIMARY KEY,
+            value
+        )
+    ''')
+    # 키워드가 없는 기사는 '' 키워드로 셈
+    conn.execute('''
+        CREATE TABLE article_stats (
+            keyword TEXT PRIMARY KEY,
+            article_count INTEGER NOT NULL
+        )
+    ''')
+    conn.execute('CREATE INDEX idx_article_stats_count ON article_stats(article_count)')
+
+    conn.execute("INSERT INTO stats_counters (name, value) SELECT 'articles_total', COUNT(*) FROM articles")
+    conn.execute("INSERT INTO stats_counters (name, value) SELECT 'notion_synced', COUNT(*) FROM notion_synced")
+    conn.execute('''
+        INSERT INTO stats_counters (name, value)
+        SELECT 'last_collection_at', MAX(finished_at) FROM collection_runs
+    ''')
+    conn.execute('''
+        INSERT INTO article_stats (keyword, article_count)
+        SELECT COALESCE(keyword, ''), COUNT(*) FROM articles GROUP BY COALESCE(keyword, '')
+    ''')
+
+    conn.execute('''
+        CREATE TRIGGER article_stats_insert AFTER INSERT ON articles BEGIN
+            UPDATE stats_counters SET value = value + 1 WHERE name = 'articles_total';
+            INSERT INTO article_stats (keyword, article_count) VALUES (COALESCE(NEW.keyword, ''), 1)
+            ON CONFLICT(keyword) DO UPDATE SET article_count = article_count + 1;
+        END
+    ''')
+    conn.execute('''
+        CREATE TRIGGER article_stats_delete AFTER DELETE ON articles BEGIN
+            UPDATE stats_counters SET value = value - 1 WHERE name = 'articles_total';
+            UPDATE article_stats SET article_count = article_count - 1 WHERE keyword = COALESCE(OLD.keyword, '');
+            DELETE FROM article_stats WHERE keyword = COALESCE(OLD.keyword, '') AND article_count <= 0;
+        END
+    ''')
+    conn.execute('''
+        CREATE TRIGGER article_stats_update AFTER UPDATE OF keyword ON articles
+        WHEN COALESCE(OLD.keyword, '') != COALESCE(NEW.keyword, '') BEGIN
+            UPDATE article_stats SET article_count = article_count - 1 WHERE keyword = COALESCE(OLD.keyword, '');
+            DELETE FROM article_stats WHERE keyword = COALESCE(OLD.keyword, '') AND article_count <= 0;
+            INSERT INTO article_stats (keyword, article_count) VALUES (COALESCE(NEW.keyword, ''), 1)
+            ON CONFLICT(keyword) DO UPDATE SET article_count = article_count + 1;
+        END
+    ''')
+    # 전송 완료 기록은 UPSERT로 저장하므로 새 링크일 때만 INSERT 트리거가 실행됨
+    conn.execute('''
+        CREATE TRIGGER notion_synced_stats_insert AFTER INSERT ON notion_synced BEGIN
+            UPDATE stats_counters SET value = value + 1 WHERE name = 'notion_synced';
+        END
+    ''')
+
+    # 사이드바 조회 결과 캐시 무효화용 변경 번호
+    conn.execute("INSERT INTO table_versions (name) VALUES ('search_history'), ('collection_runs'), ('notion')")
+    conn.execute('''
+        CREATE TRIGGER search_history_version_insert AFTER INSERT ON search_history BEGIN
+            UPDATE table_versions SET version = version + 1 WHERE name = 'search_history';
+        END
+    ''')
+    conn.execute('''
+        CREATE TRIGGER search_history_version_delete AFTER DELETE ON search_history BEGIN
+            UPDATE table_versions SET version = version + 1 WHERE name = 'search_history';
+        END
+    ''')
+    conn.execute('''
+        CREATE TRIGGER collection_runs_version_insert AFTER INSERT ON collection_runs BEGIN
+            UPDATE table_versions SET version = version + 1 WHERE name = 'collection_runs';
+        END
+    ''')
+    for table in ('notion_outbox', 'notion_synced'):
+        for event in ('INSERT', 'UPDATE', 'DELETE'):
+            conn.execute(f'''
+                CREATE TRIGGER {table}_version_{event.lower()} AFTER {event} ON {table} BEGIN
+                    UPDATE table_versions SET version = version + 1 WHERE name = 'notion';
+                END
+            ''')
+
+
+def _migration_query_cache(conn):
+    """검색 결과 공유 캐시 (정규화한 검색 키워드 → 결과 JSON, 여러 프로세스 공유용)"""
+    conn.execute('''
+        CREATE TABLE query_cache (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL,
+            created_at REAL NOT NULL
+        )
+    ''')
+    conn.execute('CREATE INDEX idx_query_cache_created_at ON query_cache(created_at)')
+
+
+def _migration_span_totals(conn):
+    """
+    구간별 누적 통계 (metrics 기록 파일은 크기 제한으로 교체되므로 Prometheus 카운터는 여기서 읽음)
+
+    여러 프로세스(앱, 수집기)가 기록을 버퍼에서 파일로 옮길 때마다 증가분을 더합니다.
+    """
+    conn.execute('''
+        CREATE TABLE span_totals (
+            name TEXT PRIMARY KEY,
+            count INTEGER NOT NULL,
+            errors INTEGER NOT NULL,
+            cancelled INTEGER NOT NULL,
+            sum_ms REAL NOT NULL
+        )
+    ''')
+
+
+MIGRATIONS = [
+    _migration_base_tables,
+    _migration_indexes,
+    _migration_published_at,
+    _migration_fulltext_search,
+    _migration_feed_cache,
+    _migration_feed_cache_complete,
+    _migration_summary_cache,
+    _migration_notion_outbox,
+    _migration_leader_lock,
+    _migration_collection_cursors,
+    _migration_near_duplicates,
+    _migration_table_versions,
+    _migration_sidebar_stats,
+    _migration_query_cache,
+    _migration_span_totals,
+]
+
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+def migrate():
+    """
+    적용되지 않은 마이그레이션을 순서대로 실행
+
+    각 마이그레이션은 user_version 갱신과 함께 하나의 트랜잭션으로 실행되므로,
+    여러 프로세스가 동시에 시작해도 같은 버전이 두 번 적용되지 않습니다.
+
+    Returns:
+        int: 마이그레이션 후 스키마 버전
+    """
+    pool = get_pool()
+    while True:
+        with pool.transaction() as conn:
+            version = conn.execute('PRAGMA user_version').fetchone()[0]
+            if version >= SCHEMA_VERSION:
+                return version
+            MIGRATIONS[version](conn)
+            conn.execute(f'PRAGMA user_version = {version + 1}')
+
+
+def init_database():
+    """데이터베이스 초기화 (스키마를 최신 버전으로 마이그레이션)"""
+    return migrate()
+
+
+# ==================== 쿼리 ====================
+# SQL 문자열을 상수로 두어 커넥션별 문장 캐시에서 항상 같은 키로 재사용되도록 함
+UPSERT_ARTICLE_SQL = '''
+    INSERT INTO articles
+    (title, link, keyword, published, published_at, summary, search_title, search_summary,
+     canonical_link, simhash, cluster_id)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(link) DO NOTHING
+'''
+
+# 추적 파라미터/리다이렉트만 다른 같은 기사가 이미 저장되었는지 확인
+CANONICAL_LINK_EXISTS_SQL = 'SELECT 1 FROM articles WHERE canonical_link = ? LIMIT 1'
+
+# 같은 구간 값을 가진 최근 기사 (비슷한 기사 후보)
+SELECT_SIMHASH_CANDIDATES_SQL = '''
+    SELECT a.id, a.simhash, a.cluster_id
+    FROM article_simhash_bands b
+    JOIN articles a ON a.id = b.article_id
+    WHERE b.band = ? AND b.value = ? AND a.saved_at >= ?
+    ORDER BY b.article_id DESC
+    LIMIT ?
+'''
+
+INSERT_SIMHASH_BAND_SQL = 'INSERT OR IGNORE INTO article_simhash_bands (band, value, article_id) VALUES (?, ?, ?)'
+
+# 같은 소식으로 묶을 기사의 저장 시각 범위(일) - 반복되는 제목(예: 날씨, 증시 마감)이 몇 주씩 묶이지 않도록
+CLUSTER_WINDOW_DAYS = 3
+
+# 구간별로 비교할 최근 후보 수 (같은 구간 값이 많아도 저장 비용이 늘지 않도록)
+CLUSTER_CANDIDATE_LIMIT = 32
+
+# 최신순 목록은 (saved_at, id) 키셋 페이지네이션으로 조회
+# (OFFSET은 건너뛴 행을 모두 읽으므로 뒤 페이지일수록 느려지지만, 키셋은 어느 페이지든 인덱스에서 바로 시작)
+# saved_at 인덱스에는 rowid(id)가 뒤에 붙어 있어 (saved_at, id) 정렬도 인덱스 순서 그대로 읽음
+SELECT_ARTICLES_BY_KEYWORD_SQL = '''
+    SELECT title, link, keyword, published, saved_at, id
+    FROM articles
+    WHERE keyword = ?
+    ORDER BY saved_at DESC, id DESC
+    LIMIT ?
+'''
+
+SELECT_ARTICLES_BY_KEYWORD_BEFORE_SQL = '''
+    SELECT title, link, keyword, published, saved_at, id
+    FROM articles
+    WHERE keyword = ? AND (saved_at, id) < (?, ?)
+    ORDER BY saved_at DESC, id DESC
+    LIMIT ?
+'''
+
+SELECT_ARTICLES_SQL = '''
+    SELECT title, link, keyword, published, saved_at, id
+    FROM articles
+    ORDER BY saved_at DESC, id DESC
+    LIMIT ?
+'''
+
+SELECT_ARTICLES_BEFORE_SQL = '''
+    SELECT title, link, keyword, published, saved_at, id
+    FROM articles
+    WHERE (saved_at, id) < (?, ?)
+    ORDER BY saved_at DESC, id DESC
+    LIMIT ?
+'''
+
+SELECT_ARTICLES_VERSION_SQL = "SELECT version FROM table_versions WHERE name = 'articles'"
+
+SELECT_TABLE_VERSIONS_SQL = 'SELECT name, version FROM table_versions ORDER BY name'
+
+COUNT_ARTICLES_SQL = "SELECT value FROM stats_counters WHERE name = 'articles_total'"
+
+SELECT_STATS_COUNTERS_SQL = 'SELECT name, value FROM stats_counters ORDER BY name'
+
+SELECT_TOP_KEYWORDS_SQL = '''
+    SELECT keyword, article_count
+    FROM article_stats
+    ORDER BY article_count DESC
+    LIMIT ?
+'''
+
+SELECT_SEARCH_HISTORY_SQL = '''
+    SELECT keyword, article_count, searched_at
+    FROM search_history
+    ORDER BY searched_at DESC
+    LIMIT ?
+'''
+
+INSERT_SEARCH_HISTORY_SQL = '''
+    INSERT INTO search_history (keyword, article_count)
+    VALUES (?, ?)
+'''
+
+DELETE_ARTICLE_SQL = 'DELETE FROM articles WHERE link = ?'
+
+# 관련도 정렬 대상 후보 수 (최신 일치 기사 중에서 순위를 매김)
+# 모든 페이지가 같은 후보 범위의 순위를 사용하고, 범위 밖의 기사는 그 뒤에 최신순으로 이어짐
+SEARCH_CANDIDATE_LIMIT = 200
+
+# FTS5는 rowid 역순으로 doclist를 읽다가 LIMIT에서 멈추므로 일치 기사가 많아도 비용이 일정함.
+# (FTS5 내장 bm25는 IDF 계산을 위해 일치 기사 전체를 훑어 흔한 검색어에서 느려짐)
+SEARCH_CANDIDATES_SQL = '''
+    SELECT a.id, a.title, a.link, a.keyword, a.published, a.saved_at,
+           a.search_title, a.search_summary
+    FROM articles_fts
+    JOIN articles a ON a.id = articles_fts.rowid
+    WHERE articles_fts MATCH ?
+    ORDER BY articles_fts.rowid DESC
+    LIMIT ? OFFSET ?
+'''
+
+
+def _cluster_window_start(saved_at=None):
+    """클러스터 후보로 볼 가장 오래된 저장 시각 (saved_at 기준, 없으면 현재 시각 기준)"""
+    reference = datetime.now(timezone.utc)
+    if saved_at:
+        reference = datetime.strptime(saved_at, TIMESTAMP_FORMAT)
+    return (reference - timedelta(days=CLUSTER_WINDOW_DAYS)).strftime(TIMESTAMP_FORMAT)
+
+
+def _find_cluster(conn, fingerprint, since):
+    """
+    지문이 가까운 기사의 클러스터 대표 id
+
+    Returns:
+        int | None: 가장 가까운 기사의 클러스터 대표 id, 없으면 None (새 클러스터)
+    """
+    if not fingerprint:
+        return None
+    best = None
+    for band, value in dedup.simhash_bands(fingerprint):
+        candidates = conn.execute(SELECT_SIMHASH_CANDIDATES_SQL, (band, value, since, CLUSTER_CANDIDATE_LIMIT))
+        for article_id, other, cluster_id in candidates:
+            distance = dedup.hamming_distance(fingerprint, dedup.from_signed(other))
+            if distance <= dedup.NEAR_DUPLICATE_DISTANCE and (best is None or distance < best[0]):
+                best = (distance, cluster_id or article_id)
+    return best[1] if best else None
+
+
+def _index_simhash(conn, article_id, fingerprint):
+    if fingerprint:
+        conn.executemany(INSERT_SIMHASH_BAND_SQL,
+                         [(band, value, article_id) for band, value in dedup.simhash_bands(fingerprint)])
+
+
+def _insert_article(conn, title, link, keyword, published, summary, since):
+    """
+    기사 한 건 저장 (같은 기사면 건너뛰고, 비슷한 기사가 있으면 같은 클러스터로 배정)
+
+    Returns:
+        bool: 새로 저장되었으면 True
+    """
+    canonical_link = dedup.canonicalize_url(link)
+    if conn.execute(CANONICAL_LINK_EXISTS_SQL, (canonical_link,)).fetchone():
+        return False
+
+    fingerprint = dedup.simhash(title, summary)
+    cursor = conn.execute(UPSERT_ARTICLE_SQL, (
+        title, link, keyword, published, normalize_published(published), summary,
+        to_search_text(title), to_search_text(summary),
+        canonical_link, dedup.to_signed(fingerprint), _find_cluster(conn, fingerprint, since)
+    ))
+    if cursor.rowcount == 0:
+        return False
+    _index_simhash(conn, cursor.lastrowid, fingerprint)
+    return True
+
+
+def save_article(title, link, keyword, published, summary=""):
+    """
+    기사를 데이터베이스에 저장
+
+    Returns:
+        bool: 새로 저장되었으면 True, 이미 있던 기사면 False
+    """
+    with get_pool().transaction() as conn:
+        return _insert_article(conn, title, link, keyword, published, summary, _cluster_window_start())
+
+
+def save_articles(articles, keyword):
+    """
+    여러 기사를 하나의 트랜잭션으로 저장
+
+    Args:
+        articles: 기사 dict 목록 (title, link, published, summary)
+        keyword: 기사에 기록할 검색 키워드
+
+    Returns:
+        tuple: (새로 저장된 기사 수, 중복으로 무시된 기사 수)
+            같은 링크뿐 아니라 정규화 URL이 같은 기사도 중복으로 셉니다.
+            비슷한 소식(다른 언론사)은 저장하되 같은 클러스터로 묶습니다.
+    """
+    if not articles:
+        return 0, 0
+
+    since = _cluster_window_start()
+    inserted = 0
+    with get_pool().transaction() as conn:
+        for article in articles:
+            inserted += _insert_article(conn, article['title'], article['link'], keyword,
+                                        article.get('published'), article.get('summary', ''), since)
+
+    return inserted, len(articles) - inserted
+
+
+def get_saved_articles(keyword=None, limit=10, before=None):
+    """
+    저장된 기사 최신순 조회
+
+    Args:
+        keyword: 기사 키워드 (None이면 전체)
+        limit: 최대 결과 수
+        before: 이 위치 이후(더 오래된 쪽)부터 조회할 (saved_at, id), None이면 처음부터
+            다음 페이지는 이전 페이지 마지막 행의 (saved_at, id)를 넘기면 됨
+
+    Returns:
+        list: (title, link, keyword, published, saved_at, id) 튜플 리스트
+    """
+    with get_pool().connection() as conn:
+        if keyword and before:
+            return conn.execute(SELECT_ARTICLES_BY_KEYWORD_BEFORE_SQL, (keyword, *before, limit)).fetchall()
+        if keyword:
+            return conn.execute(SELECT_ARTICLES_BY_KEYWORD_SQL, (keyword, limit)).fetchall()
+        if before:
+            return conn.execute(SELECT_ARTICLES_BEFORE_SQL, (*before, limit)).fetchall()
+        return conn.execute(SELECT_ARTICLES_SQL, (limit,)).fetchall()
+
+
+def articles_version():
+    """
+    기사 테이블 변경 번호 (기사가 추가/삭제/수정될 때마다 증가, 다른 프로세스의 변경 포함)
+
+    조회 결과 캐시의 키에 넣어 쓰기가 있으면 캐시가 자동으로 무효화되도록 합니다.
+    """
+    with get_pool().connection() as conn:
+        return conn.execute(SELECT_ARTICLES_VERSION_SQL).fetchone()[0]
+
+
+def table_versions():
+    """
+    테이블별 변경 번호 (articles, search_history, collection_runs, notion)
+
+    Returns:
+        tuple: (테이블 이름, 변경 번호) 튜플 (캐시 키로 그대로 사용 가능)
+    """
+    with get_pool().connection() as conn:
+        return tuple(conn.execute(SELECT_TABLE_VERSIONS_SQL).fetchall())
+
+
+def search_saved_articles(query, limit=20, offset=0):
+    """
+    저장된 기사의 제목/요약 전문 검색 (관련도순)
+
+    최신 일치 기사 SEARCH_CANDIDATE_LIMIT건만 관련도순으로 정렬하고, 그보다 오래된 일치 기사는
+    뒤에 최신순으로 붙입니다. 순위를 매기는 범위가 페이지와 관계없이 같으므로 페이지 사이에
+    기사가 빠지거나 겹치지 않습니다.
+
+    Args:
+        query: 검색어 (여러 단어는 모두 포함된 기사만 검색)
+        limit: 최대 결과 수
+        offset: 건너뛸 결과 수 (페이지 이동용)
+
+    Returns:
+        list: (title, link, keyword, published, saved_at) 튜플 리스트
+    """
+    match = build_fts_query(query)
+    if not match:
+        return []
+    rows = []
+    with get_pool().connection() as conn:
+        if offset < SEARCH_CANDIDATE_LIMIT:
+            candidates = conn.execute(SEARCH_CANDIDATES_SQL, (match, SEARCH_CANDIDATE_LIMIT, 0)).fetchall()
+            rows = rank_search_results(candidates, query)[offset:offset + limit]
+            if len(candidates) < SEARCH_CANDIDATE_LIMIT:
+                # 일치 기사가 후보 범위보다 적으면 더 없음
+                return [row[1:6] for row in rows]
+        if len(rows) < limit:
+            # 후보 범위 밖의 기사는 최신순
+            rows += conn.execute(
+                SEARCH_CANDIDATES_SQL, (match, limit - len(rows), max(offset, SEARCH_CANDIDATE_LIMIT))
+            ).fetchall()
+    return [row[1:6] for row in rows]
+
+
+def count_articles():
+    """저장된 기사 수 조회 (요약 테이블의 카운터, 기사 수와 관계없이 한 행만 읽음)"""
+    with get_pool().connection() as conn:
+        return conn.execute(COUNT_ARTICLES_SQL).fetchone()[0]
+
+
+def get_article_stats(top_keywords=5):
+    """
+    사이드바 통계 조회 (요약 테이블만 읽음)
+
+    Args:
+        top_keywords: 기사 수가 많은 순으로 가져올 키워드 수
+
+    Returns:
+        dict: articles_total, notion_synced, last_collection_at(없으면 None),
+              keywords((키워드, 기사 수) 튜플 리스트)
+    """
+    with get_pool().connection() as conn:
+        stats = dict(conn.execute(SELECT_STATS_COUNTERS_SQL).fetchall())
+        stats['keywords'] = conn.execute(SELECT_TOP_KEYWORDS_SQL, (top_keywords,)).fetchall()
+    return stats
+
+
+def get_search_history(limit=5):
+    """검색 히스토리 조회"""
+    with get_pool().connection() as conn:
+        return conn.execute(SELECT_SEARCH_HISTORY_SQL, (limit,)).fetchall()
+
+
+def save_search_history(keyword, article_count):
+    """검색 히스토리 저장"""
+    with get_pool().transaction() as conn:
+        conn.execute(INSERT_SEARCH_HISTORY_SQL, (keyword, article_count))
+
+
+def delete_article(link):
+    """기사 삭제"""
+    with get_pool().transaction() as conn:
+        conn.execute(DELETE_ARTICLE_SQL, (link,))
+
+
+def clear_all_articles():
+    """모든 기사 및 검색 히스토리 삭제"""
+    with get_pool().transaction() as conn:
+        conn.execute('DELETE FROM articles')
+        conn.execute('DELETE FROM search_history')
+        # 수집 위치도 초기화해야 다음 수집에서 최근 기사를 다시 저장함
+        conn.execute('DELETE FROM collect_cursors')
+
+
+# ==================== RSS 피드 캐시 ====================
+SELECT_FEED_CACHE_SQL = '''
+    SELECT etag, last_modified, entries, complete, fetched_at
+    FROM feed_cache
+    WHERE url = ?
+'''
+
+UPSERT_FEED_CACHE_SQL = '''
+    INSERT INTO feed_cache (url, etag, last_modified, entries, complete, fetched_at, last_used_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(url) DO UPDATE SET
+        etag = excluded.etag,
+        last_modified = excluded.last_modified,
+        entries = excluded.entries,
+        complete = excluded.complete,
+        fetched_at = excluded.fetched_at,
+        last_used_at = excluded.last_used_at
+'''
+
+TOUCH_FEED_CACHE_SQL = '''
+    UPDATE feed_cache SET last_used_at = ?, fetched_at = COALESCE(?, fetched_at)
+    WHERE url = ?
+'''
+
+# 최근 사용 순으로 max_entries개를 남기고 삭제 (LRU)
+EVICT_FEED_CACHE_SQL = '''
+    DELETE FROM feed_cache
+    WHERE url IN (
+        SELECT url FROM feed_cache
+        ORDER BY last_used_at DESC
+        LIMIT -1 OFFSET ?
+    )
+'''
+
+
+def get_feed_cache(url):
+    """
+    캐시된 피드 조회
+
+    Returns:
+        tuple | None: (etag, last_modified, entries(list), complete(bool), fetched_at)
+    """
+    with get_pool().connection() as conn:
+        row = conn.execute(SELECT_FEED_CACHE_SQL, (url,)).fetchone()
+    if row is None:
+        return None
+    etag, last_modified, entries, complete, fetched_at = row
+    return etag, last_modified, json.loads(entries), bool(complete), fetched_at
+
+
+def put_feed_cache(url, etag, last_modified, entries, complete, fetched_at, max_entries):
+    """피드 캐시 저장 후 오래 사용하지 않은 항목을 정리"""
+    with get_pool().transaction() as conn:
+        conn.execute(UPSERT_FEED_CACHE_SQL, (
+            url, etag, last_modified, json.dumps(entries, ensure_ascii=False),
+            int(complete), fetched_at, fetched_at
+        ))
+        conn.execute(EVICT_FEED_CACHE_SQL, (max_entries,))
+
+
+def touch_feed_cache(url, used_at, fetched_at=None):
+    """캐시 사용 시각 갱신 (재검증에 성공했으면 fetched_at도 갱신)"""
+    with get_pool().transaction() as conn:
+        conn.execute(TOUCH_FEED_CACHE_SQL, (used_at, fetched_at, url))
+
+
+# ==================== GPT 요약 캐시 ====================
+SELECT_SUMMARY_CACHE_SQL = '''
+    SELECT summary, created_at
+    FROM summary_cache
+    WHERE key = ?
+'''
+
+UPSERT_SUMMARY_CACHE_SQL = '''
+    INSERT INTO summary_cache (key, model, summary, created_at, last_used_at)
+    VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT(key) DO UPDATE SET
+        model = excluded.model,
+        summary = excluded.summary,
+        created_at = excluded.created_at,
+        last_used_at = excluded.last_used_at
+'''
+
+TOUCH_SUMMARY_CACHE_SQL = 'UPDATE summary_cache SET last_used_at = ? WHERE key = ?'
+
+# 최근 사용 순으로 max_entries개를 남기고 삭제 (LRU)
+EVICT_SUMMARY_CACHE_SQL = '''
+    DELETE FROM summary_cache
+    WHERE key IN (
+        SELECT key FROM summary_cache
+        ORDER BY last_used_at DESC
+        LIMIT -1 OFFSET ?
+    )
+'''
+
+
+def get_summary_cache(key):
+    """
+    캐시된 요약 조회
+
+    Returns:
+        tuple | None: (summary, created_at)
+    """
+    with get_pool().connection() as conn:
+        return conn.execute(SELECT_SUMMARY_CACHE_SQL, (key,)).fetchone()
+
+
+def put_summary_cache(key, model, summary, created_at, max_entries):
+    """요약 캐시 저장 후 오래 사용하지 않은 항목을 정리"""
+    with get_pool().transaction() as conn:
+        conn.execute(UPSERT_SUMMARY_CACHE_SQL, (key, model, summary, created_at, created_at))
+        conn.execute(EVICT_SUMMARY_CACHE_SQL, (max_entries,))
+
+
+def touch_summary_cache(key, used_at):
+    """요약 캐시 사용 시각 갱신"""
+    with get_pool().transaction() as conn:
+        conn.execute(TOUCH_SUMMARY_CACHE_SQL, (used_at, key))
+
+
+# ==================== 검색 결과 공유 캐시 ====================
+SELECT_QUERY_CACHE_SQL = 'SELECT value, created_at FROM query_cache WHERE key = ?'
+
+UPSERT_QUERY_CACHE_SQL = '''
+    INSERT INTO query_cache (key, value, created_at)
+    VALUES (?, ?, ?)
+    ON CONFLICT(key) DO UPDATE SET
+        value = excluded.value,
+        created_at = excluded.created_at
+'''
+
+# 최근 저장 순으로 max_entries개를 남기고 삭제 (TTL이 짧아 사용 시각은 기록하지 않음)
+EVICT_QUERY_CACHE_SQL = '''
+    DELETE FROM query_cache
+    WHERE key IN (
+        SELECT key FROM query_cache
+        ORDER BY created_at DESC
+        LIMIT -1 OFFSET ?
+    )
+'''
+
+
+def get_query_cache(key):
+    """
+    공유된 검색 결과 조회
+
+    Returns:
+        tuple | None: (value, created_at)
+    """
+    with get_pool().connection() as conn:
+        row = conn.execute(SELECT_QUERY_CACHE_SQL, (key,)).fetchone()
+    if row is None:
+        return None
+    return json.loads(row[0]), row[1]
+
+
+def put_query_cache(key, value, created_at, max_entries):
+    """검색 결과 저장 후 오래된 항목을 정리"""
+    with get_pool().transaction() as conn:
+        conn.execute(UPSERT_QUERY_CACHE_SQL, (key, json.dumps(value, ensure_ascii=False), created_at))
+        conn.execute(EVICT_QUERY_CACHE_SQL, (max_entries,))
+
+
+# ==================== 구간 누적 통계 ====================
+ADD_SPAN_TOTALS_SQL = '''
+    INSERT INTO span_totals (name, count, errors, cancelled, sum_ms)
+    VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT(name) DO UPDATE SET
+        count = count + excluded.count,
+        errors = errors + excluded.errors,
+        cancelled = cancelled + excluded.cancelled,
+        sum_ms = sum_ms + excluded.sum_ms
+'''
+
+SELECT_SPAN_TOTALS_SQL = 'SELECT name, count, errors, cancelled, sum_ms FROM span_totals ORDER BY name'
+
+
+def add_span_totals(totals):
+    """
+    구간별 누적 통계에 증가분 더하기 (하나의 트랜잭션)
+
+    Args:
+        totals: {이름: {'count', 'errors', 'cancelled', 'sum_ms'}}
+    """
+    rows = [(name, t['count'], t['errors'], t['cancelled'], t['sum_ms']) for name, t in totals.items()]
+    if not rows:
+        return
+    with get_pool().transaction() as conn:
+        conn.executemany(ADD_SPAN_TOTALS_SQL, rows)
+
+
+def get_span_totals():
+    """
+    구간별 누적 통계
+
+    Returns:
+        dict: {이름: {'count', 'errors', 'cancelled', 'sum_ms'}} (이름순)
+    """
+    with get_pool().connection() as conn:
+        rows = conn.execute(SELECT_SPAN_TOTALS_SQL).fetchall()
+    return {name: {'count': count, 'errors': errors, 'cancelled': cancelled, 'sum_ms': sum_ms}
+            for name, count, errors, cancelled, sum_ms in rows}
+
+
+# ==================== Notion 전송 대기열 ====================
+# 이미 전송했거나 대기 중인 링크(정규화 URL 기준)와 다른 기사의 클러스터에 속한 비슷한 소식은 넣지 않음
+ENQUEUE_NOTION_SQL = '''
+    INSERT INTO notion_outbox (link, title, keyword, published_at, summary, next_attempt_at, created_at)
+    SELECT ?, ?, ?, ?, ?, ?, ?
+    WHERE NOT EXISTS (SELECT 1 FROM notion_synced WHERE link = ?)
+      AND NOT EXISTS (SELECT 1 FROM articles WHERE canonical_link = ? AND cluster_id IS NOT NULL)
+    ON CONFLICT(link) DO NOTHING
+'''
+
+SELECT_DUE_NOTION_SQL = '''
+    SELECT id, link, title, keyword, published_at, summary, attempts
+    FROM notion_outbox
+    WHERE next_attempt_at <= ?
+    ORDER BY next_attempt_at
+    LIMIT ?
+'''
+
+LEASE_NOTION_SQL = 'UPDATE notion_outbox SET next_attempt_at = ? WHERE id = ?'
+
+DELETE_NOTION_OUTBOX_SQL = 'DELETE FROM notion_outbox WHERE id = ?'
+
+INSERT_NOTION_SYNCED_SQL = '''
+    INSERT INTO notion_synced (link, page_id, synced_at)
+    VALUES (?, ?, ?)
+    ON CONFLICT(link) DO UPDATE SET page_id = excluded.page_id, synced_at = excluded.synced_at
+'''
+
+RETRY_NOTION_SQL = '''
+    UPDATE notion_outbox SET attempts = ?, next_attempt_at = ?, last_error = ?
+    WHERE id = ?
+'''
+
+NEXT_NOTION_ATTEMPT_SQL = 'SELECT MIN(next_attempt_at) FROM notion_outbox'
+
+NOTION_OUTBOX_STATS_SQL = '''
+    SELECT
+        (SELECT COUNT(*) FROM notion_outbox WHERE next_attempt_at IS NOT NULL),
+        (SELECT COUNT(*) FROM notion_outbox WHERE next_attempt_at IS NULL),
+        (SELECT value FROM stats_counters WHERE name = 'notion_synced')
+'''
+
+
+def enqueue_notion(articles, keyword, now):
+    """
+    기사 목록을 Notion 전송 대기열에 추가 (하나의 트랜잭션)
+
+    Returns:
+        int: 새로 대기열에 들어간 기사 수
+    """
+    rows = []
+    for article in articles:
+        link = dedup.canonicalize_url(article['link'])
+        rows.append((link, article['title'], keyword, normalize_published(article.get('published')),
+                     article.get('summary', ''), now, now, link, link))
+    if not rows:
+        return 0
+    with get_pool().transaction() as conn:
+        return conn.executemany(ENQUEUE_NOTION_SQL, rows).rowcount
+
+
+def claim_notion_batch(now, limit, lease):
+    """
+    전송할 차례가 된 항목을 가져오면서 lease초 동안 다른 작업자가 가져가지 않도록 예약
+
+    Returns:
+        list: (id, link, title, keyword, published_at, summary, attempts) 튜플 리스트
+    """
+    with get_pool().transaction() as conn:
+        rows = conn.execute(SELECT_DUE_NOTION_SQL, (now, limit)).fetchall()
+        conn.executemany(LEASE_NOTION_SQL, [(now + lease, row[0]) for row in rows])
+    return rows
+
+
+def complete_notion(outbox_id, link, page_id, now):
+    """전송 완료 처리 (대기열에서 삭제, 링크별 페이지 ID 기록)"""
+    with get_pool().transaction() as conn:
+        conn.execute(DELETE_NOTION_OUTBOX_SQL, (outbox_id,))
+        conn.execute(INSERT_NOTION_SYNCED_SQL, (link, page_id, now))
+
+
+def retry_notion(outbox_id, attempts, next_attempt_at, error):
+    """전송 실패 기록 (next_attempt_at이 None이면 재시도 포기)"""
+    with get_pool().transaction() as conn:
+        conn.execute(RETRY_NOTION_SQL, (attempts, next_attempt_at, error, outbox_id))
+
+
+def next_notion_attempt_at():
+    """가장 이른 전송 예정 시각 (대기 중인 항목이 없으면 None)"""
+    with get_pool().connection() as conn:
+        return conn.execute(NEXT_NOTION_ATTEMPT_SQL).fetchone()[0]
+
+
+def notion_outbox_stats():
+    """
+    Notion 전송 현황
+
+    Returns:
+        tuple: (대기 중, 재시도 포기, 전송 완료) 건수
+    """
+    with get_pool().connection() as conn:
+        return conn.execute(NOTION_OUTBOX_STATS_SQL).fetchone()
+
+
+# ==================== 수집 위치 / 실행 기록 ====================
+SELECT_COLLECT_CURSOR_SQL = 'SELECT last_published_at, seen_links FROM collect_cursors WHERE keyword = ?'
+
+UPSERT_COLLECT_CURSOR_SQL = '''
+    INSERT INTO collect_cursors (keyword, last_published_at, seen_links, updated_at)
+    VALUES (?, ?, ?, ?)
+    ON CONFLICT(keyword) DO UPDATE SET
+        last_published_at = excluded.last_published_at,
+        seen_links = excluded.seen_links,
+        updated_at = excluded.updated_at
+'''
+
+INSERT_COLLECTION_RUN_SQL = '''
+    INSERT INTO collection_runs
+    (started_at, finished_at, keyword, fetched, skipped, new_count, duplicate_count, error)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+UPDATE_LAST_COLLECTION_SQL = '''
+    UPDATE stats_counters SET value = MAX(COALESCE(value, 0), ?)
+    WHERE name = 'last_collection_at'
+'''
+
+# 가장 최근 실행의 키워드별 기록
+SELECT_LAST_COLLECTION_RUN_SQL = '''
+    SELECT started_at, finished_at, keyword, fetched, skipped, new_count, duplicate_count, error
+    FROM collection_runs
+    WHERE started_at = (SELECT MAX(started_at) FROM collection_runs)
+    ORDER BY id
+'''
+
+
+def get_collect_cursor(keyword):
+    """
+    키워드의 수집 위치 조회
+
+    Returns:
+        tuple: (최신 발행 시각 또는 None, {최근 본 링크: 발행 시각})
+    """
+    with get_pool().connection() as conn:
+        row = conn.execute(SELECT_COLLECT_CURSOR_SQL, (keyword,)).fetchone()
+    if row is None:
+        return None, {}
+    return row[0], json.loads(row[1])
+
+
+def put_collect_cursor(keyword, last_published_at, seen_links, now):
+    """키워드의 수집 위치 저장"""
+    with get_pool().transaction() as conn:
+        conn.execute(UPSERT_COLLECT_CURSOR_SQL, (keyword, last_published_at, json.dumps(seen_links), now))
+
+
+def record_collection_run(started_at, finished_at, results):
+    """
+    수집 실행 기록 저장 (마지막 수집 시각 갱신과 함께 하나의 트랜잭션)
+
+    Args:
+        started_at: 실행 시작 시각 (같은 실행의 행을 묶는 값)
+        finished_at: 실행 종료 시각
+        results: (keyword, fetched, skipped, new_count, duplicate_count, error) 튜플 목록
+    """
+    with get_pool().transaction() as conn:
+        conn.executemany(INSERT_COLLECTION_RUN_SQL, [(started_at, finished_at, *row) for row in results])
+        conn.execute(UPDATE_LAST_COLLECTION_SQL, (finished_at,))
+
+
+def get_last_collection_run():
+    """
+    가장 최근 수집 실행의 키워드별 기록
+
+    Returns:
+        list: (started_at, finished_at, keyword, fetched, skipped, new_count, duplicate_count, error)
+    """
+    with get_pool().connection() as conn:
+        return conn.execute(SELECT_LAST_COLLECTION_RUN_SQL).fetchall()
+
+
+# ==================== 리더 잠금 ====================
+# 잠금이 없거나, 내가 가지고 있거나, 만료된 경우에만 가져감
+ACQUIRE_LEADER_SQL = '''
+    INSERT INTO leader_lock (name, owner, expires_at) VALUES (?, ?, ?)
+    ON CONFLICT(name) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at
+    WHERE leader_lock.owner = excluded.owner OR leader_lock.expires_at < ?
+'''
+
+RELEASE_LEADER_SQL = 'DELETE FROM leader_lock WHERE name = ? AND owner = ?'
+
+SELECT_LEADER_SQL = 'SELECT owner, expires_at FROM leader_lock WHERE name = ?'
+
+
+def acquire_leader(name, owner, now, ttl):
+    """
+    리더 잠금 획득 또는 연장
+
+    Args:
+        name: 잠금 이름 (작업 종류)
+        owner: 잠금을 요청한 프로세스 식별자
+        now: 현재 시각 (time.time())
+        ttl: 연장하지 않으면 잠금이 만료되는 시간(초)
+
+    Returns:
+        bool: 잠금을 가지고 있으면 True
+    """
+    with get_pool().transaction() as conn:
+        return conn.execute(ACQUIRE_LEADER_SQL, (name, owner, now + ttl, now)).rowcount == 1
+
+
+def release_leader(name, owner):
+    """리더 잠금 해제 (내가 가진 경우에만)"""
+    with get_pool().transaction() as conn:
+        conn.execute(RELEASE_LEADER_SQL, (name, owner))
+
+
+def get_leader(name):
+    """
+    현재 리더 조회
+
+    Returns:
+        tuple | None: (owner, expires_at), 잠금이 없으면 None
+    """
+    with get_pool().connection() as conn:
+        return conn.execute(SELECT_LEADER_SQL, (name,)).fetchone()
+
+
+# ==================== 쿼리 플랜 점검 ====================
+# (이름, SQL, 예시 파라미터, 전체 스캔 허용 여부)
+# 새 쿼리를 추가하면 여기에도 등록합니다. (test_query_plans.py가 확인, 플랜 상세는 `python benchmark.py plans`)
+QUERY_PLAN_CHECKS = [
+    ("save_articles", UPSERT_ARTICLE_SQL, ("t", "l", "k", "p", None, "s", "t", "s", "l", 0, None), False),
+    ("save_articles(canonical)", CANONICAL_LINK_EXISTS_SQL, ("l",), False),
+    ("save_articles(cluster)", SELECT_SIMHASH_CANDIDATES_SQL, (0, 123, "2025-01-01 00:00:00", 32), False),
+    ("get_saved_articles(keyword)", SELECT_ARTICLES_BY_KEYWORD_SQL, ("AI", 10), False),
+    ("get_saved_articles(keyword, before)", SELECT_ARTICLES_BY_KEYWORD_BEFORE_SQL,
+     ("AI", "2025-01-01 00:00:00", 100, 10), False),
+    ("get_saved_articles", SELECT_ARTICLES_SQL, (10,), False),
+    ("get_saved_articles(before)", SELECT_ARTICLES_BEFORE_SQL, ("2025-01-01 00:00:00", 100, 10), False),
+    ("articles_version", SELECT_ARTICLES_VERSION_SQL, (), False),
+    ("table_versions", SELECT_TABLE_VERSIONS_SQL, (), False),
+    ("count_articles", COUNT_ARTICLES_SQL, (), False),
+    ("get_article_stats(counters)", SELECT_STATS_COUNTERS_SQL, (), False),
+    ("get_article_stats(keywords)", SELECT_TOP_KEYWORDS_SQL, (5,), False),
+    ("get_search_history", SELECT_SEARCH_HISTORY_SQL, (5,), False),
+    ("save_search_history", INSERT_SEARCH_HISTORY_SQL, ("AI", 5), False),
+    ("delete_article", DELETE_ARTICLE_SQL, ("l",), False),
+    ("get_feed_cache", SELECT_FEED_CACHE_SQL, ("u",), False),
+    ("touch_feed_cache", TOUCH_FEED_CACHE_SQL, (1.0, None, "u"), False),
+    ("put_feed_cache(evict)", EVICT_FEED_CACHE_SQL, (200,), False),
+    ("get_summary_cache", SELECT_SUMMARY_CACHE_SQL, ("k",), False),
+    ("touch_summary_cache", TOUCH_SUMMARY_CACHE_SQL, (1.0, "k"), False),
+    ("put_summary_cache(evict)", EVICT_SUMMARY_CACHE_SQL, (500,), False),
+    ("get_query_cache", SELECT_QUERY_CACHE_SQL, ("k",), False),
+    ("put_query_cache", UPSERT_QUERY_CACHE_SQL, ("k", "{}", 1.0), False),
+    ("put_query_cache(evict)", EVICT_QUERY_CACHE_SQL, (256,), False),
+    ("add_span_totals", ADD_SPAN_TOTALS_SQL, ("n", 1, 0, 0, 1.0), False),
+    ("get_span_totals", SELECT_SPAN_TOTALS_SQL, (), False),
+    ("enqueue_notion", ENQUEUE_NOTION_SQL, ("l", "t", "k", None, "s", 1.0, 1.0, "l", "l"), False),
+    ("claim_notion_batch", SELECT_DUE_NOTION_SQL, (1.0, 10), False),
+    ("retry_notion", RETRY_NOTION_SQL, (1, 1.0, "e", 1), False),
+    ("complete_notion", INSERT_NOTION_SYNCED_SQL, ("l", "p", 1.0), False),
+    ("next_notion_attempt_at", NEXT_NOTION_ATTEMPT_SQL, (), False),
+    ("notion_outbox_stats", NOTION_OUTBOX_STATS_SQL, (), False),
+    ("get_collect_cursor", SELECT_COLLECT_CURSOR_SQL, ("AI",), False),
+    ("put_collect_cursor", UPSERT_COLLECT_CURSOR_SQL, ("AI", None, "{}", 1.0), False),
+    ("record_collection_run", INSERT_COLLECTION_RUN_SQL, (1.0, 2.0, "AI", 3, 0, 3, 0, None), False),
+    ("record_collection_run(stats)", UPDATE_LAST_COLLECTION_SQL, (2.0,), False),
+    ("get_last_collection_run", SELECT_LAST_COLLECTION_RUN_SQL, (), False),
+    ("acquire_leader", ACQUIRE_LEADER_SQL, ("n", "o", 2.0, 1.0), False),
+    ("release_leader", RELEASE_LEADER_SQL, ("n", "o"), False),
+    ("get_leader", SELECT_LEADER_SQL, ("n",), False),
+    ("search_saved_articles", SEARCH_CANDIDATES_SQL, ('"삼성 성전 전자"', 200, 0), False),
+]
+
+
+def _plan_problems(details, allow_scan):
+    """쿼리 플랜에서 전체 테이블 스캔이나 임시 정렬을 찾아 반환"""
+    problems = []
+    for detail in details:
+        if 'USE TEMP B-TREE' in detail:
+            problems.append(detail)
+        elif (detail.startswith('SCAN') and not allow_scan and 'INDEX' not in detail
+              and detail != 'SCAN CONSTANT ROW'):  # INSERT ... SELECT의 값 한 줄
+            problems.append(detail)
+    return problems
+
+
+def explain_query_plans():
+    """
+    등록된 모든 쿼리의 EXPLAIN QUERY PLAN 결과 확인
+
+    Returns:
+        list: (이름, 플랜 상세 목록, 문제 목록) 튜플 리스트
+    """
+    results = []
+    with get_pool().connection() as conn:
+        for name, sql, params, allow_scan in QUERY_PLAN_CHECKS:
+            rows = conn.execute(f'EXPLAIN QUERY PLAN {sql}', params).fetchall()
+            details = [row[-1] for row in rows]
+            results.append((name, details, _plan_problems(details, allow_scan)))
+    return results
@@ -0,0 +1,199 @@
+"""
+GPT 기사 요약 모듈
+
+- 같은 기사 묶음의 요약은 SQLite 캐시에서 바로 응답 (TTL, 최근 사용 순 LRU)
+  화제가 되는 주제는 여러 사용자가 같은 기사 묶음을 받으므로 GPT 호출을 한 번만 합니다.
+- 캐시 미스면 스트리밍으로 요청하여 도착한 토큰을 바로 화면에 표시합니다.
+- GPT 호출은 jobs.llm_slot()으로 프로세스 전체 동시 호출 수를 제한합니다.
+"""
+import hashlib
+import json
+import threading
+import time
+
+import jobs
+import metrics
+import storage
+from settings import get_settings
+
+SUMMARY_MODEL = 'gpt-5-nano'
+SUMMARY_MAX_TOKENS = 4096
+
+SUMMARY_SYSTEM_PROMPT = """당신은 뉴스 기사를 요약하고 분석하는 전문가입니다.
+사용자가 요청한 주제에 대한 기사들을 읽기 쉽고 자세하게 요약해주세요.
+
+요약 시 다음 형식을 따르세요:
+1. 전체 트렌드 및 시황 요약 (여러 줄)
+2. 각 기사별 핵심 내용 (제목과 함께 자세히)
+3. 기사 링크 제공
+4. 주요 포인트 및 통찰
+
+자세하고 정보 전달에 집중해주세요. 불릿 포인트를 활용해주세요."""
+
+# 스트리밍 중 화면 갱신 최소 간격(초) - 토큰마다 다시 그리지 않도록 묶어서 전달
+STREAM_UPDATE_INTERVAL = 0.05
+
+
+def build_articles_text(articles):
+    """기사 목록을 프롬프트용 텍스트로 변환"""
+    articles_text = ""
+    for idx, article in enumerate(articles, 1):
+        articles_text += f"\n\n[기사 {idx}]\n"
+        articles_text += f"제목: {article['title']}\n"
+        articles_text += f"링크: {article['link']}\n"
+        articles_text += f"발행: {article['published']}\n"
+    return articles_text
+
+
+def build_messages(articles, user_query, system_prompt=SUMMARY_SYSTEM_PROMPT):
+    """요약 요청 메시지 생성"""
+    return [
+        {"role": "system", "content": system_prompt},
+        {
+            "role": "user",
+            "content": f"사용자 질문: {user_query}\n\n수집된 기사 정보:\n{build_articles_text(articles)}\n\n위 기사들을 자세하고 읽기 쉽게 요약해주세요."
+        }
+    ]
+
+
+def summary_cache_key(model, system_prompt, articles):
+    """
+    요약 캐시 키 생성
+
+    사용자 질문 문구는 키에 넣지 않습니다. ('AI 뉴스', '인공지능 기사' 등
+    표현만 다른 질문이 같은 기사 묶음을 받으면 같은 요약을 재사용)
+    기사 순서가 달라도 같은 키가 되도록 링크를 정렬합니다.
+    """
+    links = sorted(article['link'] for article in articles)
+    payload = json.dumps([model, system_prompt, links], ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+# ==================== 요약 캐시 ====================
+class SummaryCache:
+    """
+    기사 묶음 단위 GPT 요약 캐시
+
+    캐시 내용은 SQLite에 저장되어 재시작 후와 다른 프로세스에서도 재사용되며,
+    ttl이 지난 요약은 사용하지 않고 최근 사용 순으로 max_entries개까지만 보관합니다.
+    ttl/max_entries를 지정하지 않으면 현재 설정(summary_cache_ttl, summary_cache_max_entries)을 따릅니다.
+    """
+
+    def __init__(self, ttl=None, max_entries=None):
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def ttl(self):
+        return get_settings().summary_cache_ttl if self._ttl is None else self._ttl
+
+    @property
+    def max_entries(self):
+        return get_settings().summary_cache_max_entries if self._max_entries is None else self._max_entries
+
+    def _count(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def stats(self):
+        """적중/미스 횟수"""
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses}
+
+    def get(self, key):
+        """유효한 캐시 요약 반환 (없거나 만료되었으면 None)"""
+        now = time.time()
+        cached = storage.get_summary_cache(key)
+        if cached is None or now - cached[1] >= self.ttl:
+            self._count('misses')
+            return None
+        self._count('hits')
+        storage.touch_summary_cache(key, now)
+        return cached[0]
+
+    def put(self, key, model, summary):
+        """요약 저장"""
+        storage.put_summary_cache(key, model, summary, time.time(), self.max_entries)
+
+
+# 프로세스 전역 캐시
+summary_cache = SummaryCache()
+
+
+# ==================== 스트리밍 요청 ====================
+def stream_completion(client, messages, model=SUMMARY_MODEL, max_tokens=SUMMARY_MAX_TOKENS,
+                      on_delta=None, update_interval=STREAM_UPDATE_INTERVAL):
+    """
+    Chat Completions 스트리밍 요청
+
+    Args:
+        client: OpenAI 호환 클라이언트
+        messages: 요청 메시지
+        model: 모델 이름
+        max_tokens: 최대 생성 토큰 수
+        on_delta: 지금까지 받은 전체 텍스트를 받는 콜백 (update_interval마다 호출)
+        update_interval: 콜백 최소 호출 간격(초)
+
+    Returns:
+        str: 전체 응답 텍스트
+    """
+    stream = client.chat.completions.create(
+        model=model,
+        messages=messages,
+        max_completion_tokens=max_tokens,
+        stream=True
+    )
+
+    parts = []
+    last_update = 0.0
+    for chunk in stream:
+        # 일부 게이트웨이는 choices가 빈 청크(사용량 정보 등)를 보냄
+        if not chunk.choices:
+            continue
+        content = chunk.choices[0].delta.content
+        if not content:
+            continue
+        parts.append(content)
+
+        now = time.monotonic()
+        if on_delta is not None and now - last_update >= update_interval:
+            on_delta("".join(parts))
+            last_update = now
+
+    return "".join(parts)
+
+
+@metrics.timed("summarize")
+def summarize(client, articles, user_query, on_delta=None, model=SUMMARY_MODEL, cache=summary_cache):
+    """
+    기사 묶음 요약 (캐시 적중 시 GPT 호출 없음)
+
+    요청 실패는 호출한 쪽에서 처리하도록 그대로 발생시킵니다.
+
+    Args:
+        client: OpenAI 호환 클라이언트
+        articles: 기사 리스트
+        user_query: 사용자 원본 질문
+        on_delta: 스트리밍 중 지금까지 받은 텍스트를 받는 콜백
+        model: 모델 이름
+        cache: 요약 캐시 (None이면 캐시 사용 안 함)
+
+    Returns:
+        str: 요약문
+    """
+    key = summary_cache_key(model, SUMMARY_SYSTEM_PROMPT, articles)
+    if cache is not None:
+        summary = cache.get(key)
+        if summary is not None:
+            return summary
+
+    with jobs.llm_slot(), metrics.span("gpt_summary", model=model):
+        summary = stream_completion(client, build_messages(articles, user_query), model=model, on_delta=on_delta)
+
+    # 빈 응답(추론에 토큰 한도를 모두 쓴 경우 등)은 저장하지 않음
+    if cache is not None and summary.strip():
+        cache.put(key, model, summary)
+    return summary
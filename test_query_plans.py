@@ -0,0 +1,48 @@
+"""
+쿼리 플랜 회귀 테스트
+
+storage.QUERY_PLAN_CHECKS에 등록된 모든 쿼리가 인덱스를 타는지 확인합니다.
+(새 쿼리가 전체 테이블 스캔을 하면 실패, 자세한 플랜은 `python benchmark.py plans`)
+    python -m pytest test_query_plans.py
+    python -m unittest test_query_plans
+"""
+import tempfile
+import unittest
+from pathlib import Path
+
+import storage
+
+# 플랜 확인 전에 넣을 기사 수 (빈 테이블이면 SQLite가 인덱스 없이도 같은 플랜을 고를 수 있음)
+SEED_ROWS = 200
+
+
+class QueryPlanTest(unittest.TestCase):
+    def setUp(self):
+        self._db_path = storage.DB_PATH
+        self._tmp = tempfile.TemporaryDirectory()
+        storage.configure(Path(self._tmp.name) / "plans.db")
+        storage.init_database()
+        storage.save_articles([
+            {
+                'title': f"AI 관련 기사 제목 {i}",
+                'link': f"https://example.com/AI/{i}",
+                'published': "Mon, 06 Jan 2025 09:00:00 GMT",
+                'summary': f"AI 기사 요약 {i}",
+            }
+            for i in range(SEED_ROWS)
+        ], "AI")
+
+    def tearDown(self):
+        storage.configure(self._db_path)
+        self._tmp.cleanup()
+
+    def test_registered_queries_use_indexes(self):
+        results = storage.explain_query_plans()
+        self.assertEqual(len(results), len(storage.QUERY_PLAN_CHECKS))
+        for name, details, problems in results:
+            with self.subTest(query=name):
+                self.assertEqual(problems, [], "\n".join(details))
+
+
+if __name__ == "__main__":
+    unittest.main()